@@ -6,15 +6,14 @@ from multiple locations and exposes the main Researcher class for RAG-based info
 Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
-import os
 from pathlib import Path
 from dotenv import load_dotenv
-import pkg_resources
+from importlib.resources import files
 
 def load_env_files():
     """
     Load environment variables from the first matching .env file found.
-    Checks pkg_resources first, then searches through predefined paths.
+    Checks the installed package data first, then searches through predefined paths.
     Only the first matching file is loaded (no merging or override).
     
     Returns:
@@ -29,11 +28,11 @@ def load_env_files():
         Path(__file__).parent.parent.parent / '.env',
     ]
     
-    # Try pkg_resources first (for installed packages)
+    # Try the package data first (for installed packages)
     try:
-        pkg_env_path = pkg_resources.resource_filename("Researcher", ".env")
-        if os.path.exists(pkg_env_path):
-            env_paths.insert(0, Path(pkg_env_path))
+        pkg_env_path = files("Researcher") / ".env"
+        if pkg_env_path.is_file():
+            env_paths.insert(0, Path(str(pkg_env_path)))
     except Exception:
         pass
     
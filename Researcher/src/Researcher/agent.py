@@ -8,13 +8,14 @@ Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
 import traceback
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 
 from langgraph.checkpoint.memory import MemorySaver
 
 import time
 
 from Researcher.graph import GraphBuilder
+from Researcher.graph.nodes import warm_up_prompt_cache
 from Researcher.retrievers import WikipediaRetriever, WebRetriever, VectorDBRetriever, BM25RetrieverWrapper, HybridRetriever, LightRAGRetriever, AdalaRetriever
 
 from Researcher.utils import logger  # Import the logger
@@ -41,6 +42,9 @@ class Researcher:
             # Build and compile the graph
             self._build_graph()
 
+            # Get the static system prompt cached by the provider before the first query
+            warm_up_prompt_cache()
+
         except Exception as e:
             logger.error("Error initializing Researcher: %s", str(e))
             logger.debug(traceback.format_exc())
@@ -140,6 +144,40 @@ class Researcher:
             logger.error("Error building the graph: %s", str(e))
             logger.debug(traceback.format_exc())
 
+    @staticmethod
+    def _input_state(query: str, instructions: Optional[str], max_num_turns: int,
+                     config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Builds the initial graph state of a search query."""
+        return {
+            "query": query,
+            "instructions": instructions,
+            "max_num_turns": max_num_turns,
+            "config": config or {}
+        }
+
+    def _batch_inputs(self, queries: List[str], instructions: Optional[str], max_num_turns: int,
+                      config: Optional[Dict[str, Any]], max_concurrency: int):
+        """Builds the initial states and the run configs (one checkpoint thread per query) of a batch."""
+        inputs = [self._input_state(query, instructions, max_num_turns, config) for query in queries]
+        batch_id = int(time.time() * 1000)
+        threads = [
+            {"configurable": {"thread_id": f"indexing_{batch_id}_{i}"}, "max_concurrency": max_concurrency}
+            for i in range(len(queries))
+        ]
+        return inputs, threads
+
+    @staticmethod
+    def _batch_results(queries: List[str], results: List[Any]) -> List[Dict[str, Any]]:
+        """Replaces the failed runs of a batch by empty results, as `search` does."""
+        batch_results = []
+        for query, result in zip(queries, results):
+            if isinstance(result, BaseException):
+                logger.error("Error executing search %s: %s", query, str(result))
+                logger.debug("".join(traceback.format_exception(result)))
+                result = {}
+            batch_results.append(result)
+        return batch_results
+
     def search(self, 
                query: str, 
                instructions: Optional[str] = "",
@@ -159,12 +197,7 @@ class Researcher:
         try:
             logger.info("Running search query: %s", query)
 
-            input_state = {
-                "query": query,
-                "instructions": instructions,
-                "max_num_turns": max_num_turns,
-                "config": config or {}
-            }
+            input_state = self._input_state(query, instructions, max_num_turns, config)
             # thread = {"configurable": {"thread_id": "indexing_" + str(hash(str(query)))}}  
             thread = {"configurable": {"thread_id": f"indexing_{int(time.time() * 1000)}"}}
 
@@ -177,4 +210,127 @@ class Researcher:
         except Exception as e:
             logger.error("Error executing search: %s", str(e))
             logger.debug(traceback.format_exc())
-            return {}
\ No newline at end of file
+            return {}
+
+    @staticmethod
+    def _message_text(message) -> str:
+        """Returns the text of a streamed message chunk (plain or made of content blocks)."""
+        content = message.content
+        if isinstance(content, str):
+            return content
+        return "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+        )
+
+    async def astream_search(self,
+                             query: str,
+                             instructions: Optional[str] = "",
+                             max_num_turns: int = 1,
+                             config: Optional[Dict[str, Any]] = None,
+                             preamble: Optional[str] = None) -> AsyncIterator[str]:
+        """Run a search query through the agent, yielding the answer while it is generated.
+
+        The answer tokens are yielded as the response generator produces them, instead of
+        once the whole answer is ready. An optional `preamble` (e.g. "Analyzing your
+        question...") is yielded right away, before the retrieval completes. Answers that
+        are not generated token by token (cached responses, `return_chunks`) are yielded whole.
+
+        Args:
+            query: The search query
+            instructions: Optional instructions to guide the search
+            max_num_turns: Maximum number of interaction turns
+            config: Optional run-specific configuration
+            preamble: Optional text yielded before the search starts
+
+        Yields:
+            The chunks of the answer
+        """
+        if preamble:
+            yield preamble
+
+        try:
+            logger.info("Streaming search query: %s", query)
+
+            input_state = self._input_state(query, instructions, max_num_turns, config)
+            thread = {"configurable": {"thread_id": f"indexing_{int(time.time() * 1000)}"}}
+            # The chunks mode calls LLMs to filter the context, only its final answer is meaningful
+            stream_tokens = not (config or {}).get("return_chunks", False)
+
+            streamed = False
+            async for mode, chunk in self.graph.astream(input_state, thread, stream_mode=["messages", "updates"]):
+                if mode == "messages":
+                    message, metadata = chunk
+                    if stream_tokens and metadata.get("langgraph_node") == "generate_response":
+                        text = self._message_text(message)
+                        if text:
+                            streamed = True
+                            yield text
+                elif not streamed and "generate_response" in chunk:
+                    response = (chunk["generate_response"] or {}).get("response")
+                    if response:
+                        yield response
+
+            logger.info("Search streamed successfully.")
+
+        except Exception as e:
+            logger.error("Error streaming search: %s", str(e))
+            logger.debug(traceback.format_exc())
+
+    def batch_search(self,
+                     queries: List[str],
+                     instructions: Optional[str] = "",
+                     max_num_turns: int = 1,
+                     config: Optional[Dict[str, Any]] = None,
+                     max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Run several search queries through the agent in one batch.
+
+        The queries run concurrently (at most `max_concurrency` at a time) instead of one
+        `invoke` after the other, so that their LLM and retriever calls overlap.
+
+        Args:
+            queries: The search queries
+            instructions: Optional instructions to guide every search
+            max_num_turns: Maximum number of interaction turns
+            config: Optional run-specific configuration
+            max_concurrency: Maximum number of queries running at the same time
+
+        Returns:
+            The results of the searches, in query order (empty for the failed ones)
+        """
+        try:
+            logger.info("Running %d search queries in batch", len(queries))
+
+            inputs, threads = self._batch_inputs(queries, instructions, max_num_turns, config, max_concurrency)
+            results = self.graph.batch(inputs, threads, return_exceptions=True)
+
+            logger.info("Batch search completed successfully.")
+
+            return self._batch_results(queries, results)
+
+        except Exception as e:
+            logger.error("Error executing batch search: %s", str(e))
+            logger.debug(traceback.format_exc())
+            return [{} for _ in queries]
+
+    async def abatch_search(self,
+                            queries: List[str],
+                            instructions: Optional[str] = "",
+                            max_num_turns: int = 1,
+                            config: Optional[Dict[str, Any]] = None,
+                            max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Async version of `batch_search`, to be awaited from a running event loop (e.g. a web server)."""
+        try:
+            logger.info("Running %d search queries in batch", len(queries))
+
+            inputs, threads = self._batch_inputs(queries, instructions, max_num_turns, config, max_concurrency)
+            results = await self.graph.abatch(inputs, threads, return_exceptions=True)
+
+            logger.info("Batch search completed successfully.")
+
+            return self._batch_results(queries, results)
+
+        except Exception as e:
+            logger.error("Error executing batch search: %s", str(e))
+            logger.debug(traceback.format_exc())
+            return [{} for _ in queries]
@@ -32,6 +32,7 @@ class GraphBuilder:
             self.graph = StateGraph(RetrievalState)
             self.retrievers = {}
             self.tools = []
+            self.tool_retrievers = {}  # Tool name -> retriever, to run the tool calls concurrently
             logger.info("GraphBuilder initialized successfully.")
 
         except Exception as e:
@@ -48,7 +49,9 @@ class GraphBuilder:
         try:
             logger.info(f"Adding retriever: {name}")
             self.retrievers[name] = retriever_func
-            self.tools.append(retriever_func.tool)
+            tool = retriever_func.tool
+            self.tools.append(tool)
+            self.tool_retrievers[tool.name] = retriever_func
             logger.info(f"Retriever {name} added successfully.")
 
         except Exception as e:
@@ -69,7 +72,7 @@ class GraphBuilder:
             self.graph.add_node("generate_response", generate_response)
             self.graph.add_node("rerank", rerank)
 
-            self.graph.add_node("tools", lambda state: ToolNode(state, self.tools))
+            self.graph.add_node("tools", lambda state: ToolNode(state, self.tools, self.tool_retrievers))
             self.graph.add_conditional_edges(
                 "extract_query",
                 tools_condition,
@@ -10,7 +10,7 @@ Date: 2025/03/10
 
 from .query_extractor import extract_query
 from .router import tools_condition
-from .response_generator import generate_response
+from .response_generator import generate_response, warm_up_prompt_cache
 from .tools import ToolNode
 from .reranking import rerank
 
@@ -18,6 +18,7 @@ __all__ = [
     "extract_query",
     "tools_condition",
     "generate_response",
+    "warm_up_prompt_cache",
     "ToolNode",
     "rerank"
 ]
\ No newline at end of file
@@ -7,15 +7,27 @@ to appropriate retrieval tools with retry logic and error handling.
 Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from Researcher.types import RetrievalState, SearchQuery
-from Researcher.models import get_default_llm
-from Researcher.utils import SEARCH_QUERY_PROMPT
-from langchain_core.messages import AIMessage
+from Researcher.models import get_default_llm, cacheable_system_message
+from Researcher.utils import SEARCH_QUERY_PROMPT_PREFIX, render_search_query_suffix
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+def search_query_messages(query: str, instructions: str, llm) -> List[BaseMessage]:
+    """
+    Builds the query refinement messages.
+
+    The static header and examples come first, as one cacheable system message that is
+    byte-identical across requests; the per-request instructions and query come last.
+    """
+    return [
+        cacheable_system_message(SEARCH_QUERY_PROMPT_PREFIX, llm),
+        HumanMessage(content=render_search_query_suffix(query, instructions))
+    ]
+
 @retry(
     stop=stop_after_attempt(10),  # Retry up to 3 times
     wait=wait_exponential(multiplier=1, min=1, max=10),  # Exponential backoff
@@ -58,7 +70,8 @@ def extract_query(state: RetrievalState, tools) -> RetrievalState:
 
     # If structured output is not supported or fails, use regular invocation
     # restructured_query = llm.invoke([SEARCH_QUERY_PROMPT.format(query=original_query)])
-    response = llm_with_tools.invoke([SEARCH_QUERY_PROMPT.format(query=original_query, instructions=instructions)])
+    # Static prefix first (cacheable by the provider), per-request instructions and query last
+    response = llm_with_tools.invoke(search_query_messages(original_query, instructions, llm))
     
     # Check if the response contains a tool call
     if response.tool_calls:
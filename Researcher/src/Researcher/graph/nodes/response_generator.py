@@ -7,22 +7,29 @@ response generation with support for structured output and content sanitization.
 Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from langchain_core.documents import Document
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage, ToolMessage
-from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from pydantic.v1 import BaseModel, Field  # Updated to use pydantic.v1 for compatibility
 
 from Researcher.types import RetrievalState
-from Researcher.models import get_default_llm
-from Researcher.utils import RAG_SYSTEM_PROMPT, RAG_HUMAN_PROMPT
+from Researcher.models import get_default_llm, get_embedding_model, cacheable_system_message
+from Researcher.retrievers.cache import SemanticCache
+from Researcher.utils import RAG_SYSTEM_PROMPT, render_rag_human_prompt
 
 from Researcher.utils import format_documents, sanitize_with_bleach, extract_texts_from_json
+from Researcher.utils.documents import document_key
 
 from Researcher.utils import logger, config  # Import the logger
+from Researcher.utils.cache_metrics import record_cache_lookup, record_prompt_cache_tokens, RESPONSE, RESPONSE_SEMANTIC
 import json5  
 import json
 import re
+import hashlib
+import traceback
+import threading
+from collections import OrderedDict
 from jsonschema import validate, ValidationError
 
 llm_filtering_config = config.get("llm_filtering", {})
@@ -43,6 +50,145 @@ if model_llm_filtering == 'command-r':
         aws_secret_key=aws_secret_access_key
     )
 
+response_cache_config = config.get("response_cache", {})
+use_response_cache = response_cache_config.get("enabled", False)
+response_cache_maxsize = response_cache_config.get("maxsize", 1024)
+use_semantic_response_cache = response_cache_config.get("semantic", False)
+
+# Answers of the standard flow, keyed by the hash of everything the LLM sees (LRU order)
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Answers of paraphrased queries, created on first use (the embedding model loads lazily)
+_semantic_response_cache: Optional[SemanticCache] = None
+_semantic_response_cache_lock = threading.Lock()
+
+# Queries whose answer may change over time are never served from the semantic cache
+_TIME_SENSITIVE_RE = re.compile(
+    r"\b(?:latest|today|now|current(?:ly)?|recent(?:ly)?|this (?:week|month|year)|"
+    r"dernier|dernière|actuel(?:le)?|aujourd'hui|récent(?:e)?|"
+    r"اليوم|الحالي|أحدث|آخر)\b",
+    re.IGNORECASE
+)
+
+def _canonical_json(value: Any) -> str:
+    """Serializes a value as compact JSON with sorted keys."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+def _deterministic_model_config() -> Optional[Dict[str, Any]]:
+    """Returns the response generator model settings, or None if it does not answer deterministically (temperature 0)."""
+    model_config = config.get("models.response_generator") or config.get("models.default", {})
+    if model_config.get("args", {}).get("temperature") != 0:
+        return None
+    return model_config
+
+def _response_cache_key(query: str, context_text: str) -> Optional[str]:
+    """
+    Returns the cache key of a response, or None when responses must not be cached.
+
+    Only deterministic models (temperature 0) are cached. The key covers the model
+    settings, the query and the formatted context, canonicalized as sorted JSON.
+    """
+    model_config = _deterministic_model_config()
+    if model_config is None:
+        return None
+
+    canonical = _canonical_json({"m": model_config, "q": " ".join(query.split()), "c": context_text})
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _semantic_response_scope(documents: List[Any]) -> str:
+    """
+    Returns the scope of a semantically cached response: the model settings and the documents it was answered from.
+
+    Paraphrased queries only share an answer when they were answered by the same model from
+    the same documents, identified by their source and content hash: the chunks of one file
+    share a source, and a question about one article must never get the answer of another.
+    """
+    keys = sorted({(str(source), digest) for source, digest in map(document_key, documents)})
+    canonical = _canonical_json({"m": _deterministic_model_config(), "d": keys})
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _get_semantic_response_cache() -> Optional[SemanticCache]:
+    """Returns the semantic response cache, creating it on first use, or None if it is disabled."""
+    global _semantic_response_cache, use_semantic_response_cache
+
+    if not use_semantic_response_cache:
+        return None
+
+    with _semantic_response_cache_lock:
+        if _semantic_response_cache is None:
+            try:
+                # Embed with the same model as the vector database unless configured otherwise
+                embeddings = get_embedding_model(response_cache_config.get("embedding", config.get("retrievers.vectordb", {})))
+                _semantic_response_cache = SemanticCache(
+                    embeddings.embed_query,
+                    threshold=response_cache_config.get("similarity_threshold", 0.95),
+                    maxsize=response_cache_maxsize,
+                    layer=RESPONSE_SEMANTIC
+                )
+            except Exception as e:
+                logger.error("Error initializing the semantic response cache, disabling it: %s", str(e))
+                logger.debug(traceback.format_exc())
+                use_semantic_response_cache = False
+        return _semantic_response_cache
+
+def clear_response_cache() -> None:
+    """Drops every cached response."""
+    global _semantic_response_cache
+
+    with _response_cache_lock:
+        _response_cache.clear()
+    with _semantic_response_cache_lock:
+        _semantic_response_cache = None
+
+def _prompt_cache_usage(response) -> Optional[tuple]:
+    """
+    Returns the input tokens of a response read from and written to the provider's prompt cache, or None if not reported.
+
+    Most clients report them in `input_token_details`; the Bedrock Converse client of
+    langchain-aws reports `cache_read_input_tokens`/`cache_write_input_tokens` instead.
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    token_details = usage.get("input_token_details") or {}
+    if token_details:
+        return token_details.get("cache_read", 0), token_details.get("cache_creation", 0)
+    if "cache_read_input_tokens" in usage or "cache_write_input_tokens" in usage:
+        return usage.get("cache_read_input_tokens", 0), usage.get("cache_write_input_tokens", 0)
+    return None
+
+def _log_prompt_cache_usage(response) -> None:
+    """Logs and counts how many input tokens of a response were read from or written to the provider's prompt cache."""
+    usage = _prompt_cache_usage(response)
+    if usage is not None:
+        cache_read, cache_creation = usage
+        logger.debug("Prompt cache usage: %s tokens read, %s tokens written", cache_read, cache_creation)
+        record_prompt_cache_tokens(cache_read, cache_creation)
+
+def warm_up_prompt_cache() -> bool:
+    """
+    Sends the static RAG system prompt once so that the provider caches its prefix before the first request.
+
+    Later responses start with the same byte-identical system message and skip its prefill.
+    Providers only cache prefixes above a minimum length (e.g. 1024 tokens for most Claude
+    models), so the warm-up is only useful when the system prompt reaches it.
+
+    Returns:
+        bool: True if the warm-up request was sent, False if it is disabled (`prompt_cache.warmup`) or failed.
+    """
+    if not config.get("prompt_cache", {}).get("warmup", False):
+        return False
+
+    try:
+        llm = get_default_llm(node_name="response_generator")
+        response = llm.invoke([cacheable_system_message(RAG_SYSTEM_PROMPT, llm), HumanMessage(content="Reply with OK.")])
+        _log_prompt_cache_usage(response)
+        logger.info("Prompt cache warmed up with the RAG system prompt")
+        return True
+    except Exception as e:
+        logger.error("Error warming up the prompt cache: %s", str(e))
+        logger.debug(traceback.format_exc())
+        return False
+
 class FilteredChunks(BaseModel):
     """Schema for filtering chunks."""
     relevant_chunks: List[str] = Field(
@@ -235,12 +381,41 @@ def generate_response(state: RetrievalState) -> Dict[str, Any]:
 
     else:
         # Standard response generation (existing flow)
+        # Identical queries over the same context get the same answer from a deterministic model
+        cache_key = _response_cache_key(query or "", context_text) if use_response_cache else None
+        if cache_key is not None:
+            with _response_cache_lock:
+                cached_response = _response_cache.get(cache_key)
+                if cached_response is not None:
+                    _response_cache.move_to_end(cache_key)
+            record_cache_lookup(RESPONSE, cached_response is not None)
+            if cached_response is not None:
+                logger.info("Returning cached response for query: %s", query)
+                return {"response": cached_response}
+
+        # Paraphrases of a previous query, answered from the same sources, get its answer
+        semantic_cache = None
+        if cache_key is not None and query and not _TIME_SENSITIVE_RE.search(query):
+            semantic_cache = _get_semantic_response_cache()
+        query_vector = None
+        if semantic_cache is not None:
+            try:
+                semantic_scope = _semantic_response_scope(documents)
+                query_vector = semantic_cache.embed_query(query)
+                cached = semantic_cache.get(query, semantic_scope, query_vector)
+                if cached:
+                    logger.info("Returning semantically cached response for query: %s", query)
+                    return {"response": cached[0].page_content}
+            except Exception as e:
+                logger.warning("Semantic response cache lookup failed: %s", str(e))
+                query_vector = None
+
         # Create the messages for response generation
-        system_message = SystemMessage(content=RAG_SYSTEM_PROMPT)
+        # The system prompt is static, mark it as a cacheable prefix
+        system_message = cacheable_system_message(RAG_SYSTEM_PROMPT, llm)
         
         # Put the context and query in the human message
-        human_prompt_template = PromptTemplate.from_template(RAG_HUMAN_PROMPT)
-        human_message_content = human_prompt_template.format(
+        human_message_content = render_rag_human_prompt(
             context=context_text,
             query=query if query else "Please provide information based on the retrieved data."
         )
@@ -250,7 +425,16 @@ def generate_response(state: RetrievalState) -> Dict[str, Any]:
         # Generate response
         input_messages = [system_message, human_message]
         response = llm.invoke(input_messages)
+        _log_prompt_cache_usage(response)
         
         logger.info("Generated response: %s", response.content)
 
+        if cache_key is not None and response.content:
+            with _response_cache_lock:
+                _response_cache[cache_key] = response.content
+                while len(_response_cache) > response_cache_maxsize:
+                    _response_cache.popitem(last=False)
+        if query_vector is not None and response.content:
+            semantic_cache.set(query, [Document(page_content=response.content)], semantic_scope, query_vector)
+
         return {"response": response.content}
\ No newline at end of file
@@ -7,16 +7,87 @@ multiple retrieval sources into the shared state.
 Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
+import asyncio
+import traceback
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
 from Researcher.types import RetrievalState
+from Researcher.retrievers.base import BaseRetriever
+from Researcher.utils import deduplicate_by_content
+from Researcher.utils import logger
+from Researcher.utils.http import aclose_async_client
+
+from langchain.tools import Tool
+
+
+async def parallel_retrieve(requests: Sequence[Tuple[BaseRetriever, str]]) -> List[Document]:
+    """
+    Runs several retrievals concurrently, so that the total latency is the one of the slowest retriever.
+
+    A failing retriever is logged and skipped without affecting the others.
+
+    Args:
+        requests: (retriever, query) pairs; each retriever must implement `aretrieve`.
+
+    Returns:
+        List[Document]: The documents of every retriever, in request order, without content duplicates.
+    """
+    results = await asyncio.gather(
+        *(retriever.aretrieve(query) for retriever, query in requests),
+        return_exceptions=True
+    )
+
+    retrievedDocuments = []
+    for (retriever, query), result in zip(requests, results):
+        if isinstance(result, BaseException):
+            logger.error("Retriever %s failed for query %s: %s", getattr(retriever, "name", retriever), query, str(result))
+            logger.debug("".join(traceback.format_exception(result)))
+            continue
+        retrievedDocuments.extend(result)
+
+    # Several retrievers often return the same passages, keep a single copy of each
+    return deduplicate_by_content(retrievedDocuments)
+
+
+async def _parallel_retrieve_and_close(requests: Sequence[Tuple[BaseRetriever, str]]) -> List[Document]:
+    """Runs `parallel_retrieve` on a private event loop, then closes that loop's pooled HTTP client."""
+    try:
+        return await parallel_retrieve(requests)
+    finally:
+        await aclose_async_client()
+
+
+def _tool_query(args) -> str:
+    """Returns the query passed in the arguments of a tool call."""
+    if isinstance(args, dict):
+        return next(iter(args.values()), "")
+    return args
+
+
+def ToolNode(state: RetrievalState, tools: list[Tool], retrievers: Optional[Dict[str, BaseRetriever]] = None):
+    """
+    Executes the tool calls of the last message and stores the retrieved documents.
+
+    When the retriever behind every called tool is known (`retrievers`, keyed by tool name),
+    the retrievals run concurrently; otherwise the tools are invoked one after the other.
+    """
+    tool_calls = state["messages"][-1].tool_calls
+    retrievers = retrievers or {}
 
-from langchain.tools import Tool    
+    if len(tool_calls) > 1 and all(tool_call["name"] in retrievers for tool_call in tool_calls):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            requests = [(retrievers[tool_call["name"]], _tool_query(tool_call["args"])) for tool_call in tool_calls]
+            return {"retrievedDocuments": asyncio.run(_parallel_retrieve_and_close(requests))}
 
-def ToolNode(state: RetrievalState, tools: list[Tool]):
     retrievedDocuments = []
     tools_by_name = {tool.name: tool for tool in tools}
-    for tool_call in state["messages"][-1].tool_calls:
+    for tool_call in tool_calls:
         tool = tools_by_name[tool_call["name"]]
         docs = tool.invoke(tool_call["args"])
         retrievedDocuments.extend(docs)
-    return {"retrievedDocuments": retrievedDocuments}
-    
\ No newline at end of file
+    # Several retrievers often return the same passages, keep a single copy of each
+    return {"retrievedDocuments": deduplicate_by_content(retrievedDocuments)}
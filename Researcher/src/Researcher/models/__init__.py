@@ -8,6 +8,7 @@ Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
 
-from .llm import get_default_llm
+from .llm import get_default_llm, cacheable_system_message
+from .embeddings import get_embedding_model
 
-__all__ = ["get_default_llm"]
\ No newline at end of file
+__all__ = ["get_default_llm", "cacheable_system_message", "get_embedding_model"]
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Description:
+Embedding model factory. Builds the text embedding model (OpenAI, Ollama or local
+HuggingFace) described by a configuration section, so that the vector database and
+the retrieval caches embed queries with the same model.
+
+Author: Raptopoulos Petros [petrosrapto@gmail.com]
+Date: 2025/03/10
+"""
+import os
+from typing import Any, Dict, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from Researcher.utils import config, logger
+
+
+def get_embedding_model(embedding_config: Optional[Dict[str, Any]] = None) -> Embeddings:
+    """
+    Returns the embedding model described by `embedding_config`.
+
+    Args:
+        embedding_config (dict, optional): Section holding the embedding settings
+            (`embedding_type`, `embedding_model`, `ollama_base_url`). Defaults to the
+            `retrievers.vectordb` section of config.yaml.
+
+    Returns:
+        Embeddings: An OllamaEmbeddings, HuggingFaceEmbeddings or OpenAIEmbeddings instance.
+
+    Raises:
+        ValueError: If the OpenAI embeddings are selected and EMBEDDINGS_API_KEY is not set.
+    """
+    if embedding_config is None:
+        embedding_config = config.get("retrievers.vectordb", {})
+
+    # Initialize embedding model (supports API, local, and Ollama)
+    embedding_type = embedding_config.get("embedding_type", "openai").lower()
+
+    if embedding_type == "ollama":
+        # Use Ollama embeddings (local server) - use langchain_ollama for correct API endpoint
+        from langchain_ollama import OllamaEmbeddings
+        embedding_model = embedding_config.get("embedding_model", "embeddinggemma:latest")
+        ollama_base_url = embedding_config.get("ollama_base_url", "http://host.docker.internal:11434")
+        logger.info(f"Using Ollama embeddings: {embedding_model} at {ollama_base_url}")
+        return OllamaEmbeddings(
+            model=embedding_model,
+            base_url=ollama_base_url
+        )
+    elif embedding_type == "local":
+        # Use local HuggingFace embeddings (no API key needed)
+        from langchain_huggingface import HuggingFaceEmbeddings
+        embedding_model = embedding_config.get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2")
+        logger.info(f"Using local embeddings: {embedding_model}")
+        return HuggingFaceEmbeddings(model_name=embedding_model)
+    else:
+        # Use OpenAI embeddings (requires API key)
+        from langchain_openai import OpenAIEmbeddings
+        embedding_model = embedding_config.get("embedding_model", "text-embedding-3-large")
+        embeddings_api_key = os.environ.get("EMBEDDINGS_API_KEY")
+        if not embeddings_api_key:
+            raise ValueError("EMBEDDINGS_API_KEY is required for OpenAI embeddings. Set embedding_type: 'ollama' or 'local' in config to use local embeddings instead.")
+        return OpenAIEmbeddings(model=embedding_model, openai_api_key=embeddings_api_key)
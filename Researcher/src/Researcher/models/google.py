@@ -118,7 +118,7 @@ class GemmaGoogleChatModel(ChatGoogleGenerativeAI):
                 }
                 
         except (json.JSONDecodeError, AttributeError):
-            logger.debug(f"Could not parse function call from content: {content}")
+            logger.debug("Could not parse function call from content: %s", content)
             
         return None
     
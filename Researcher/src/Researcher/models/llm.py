@@ -8,6 +8,7 @@ Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
 import os
+from langchain_core.messages import SystemMessage
 from Researcher.utils import config, logger
 from .bedrock import get_bedrock_llm
 from .openai import get_openai_llm
@@ -66,4 +67,36 @@ def _create_llm_from_config(models_config, config_name):
     elif api == "google":
         return get_google_llm(model_id, **args)
     else:
-        raise ValueError(f"Unsupported API '{api}'. Please choose either 'openai', 'bedrock', or 'google'.")
\ No newline at end of file
+        raise ValueError(f"Unsupported API '{api}'. Please choose either 'openai', 'bedrock', or 'google'.")
+
+def _uses_bedrock_converse(llm) -> bool:
+    """Tells whether the model is called through the Bedrock Converse API (as built by `get_bedrock_llm`)."""
+    return bool(getattr(llm, "beta_use_converse_api", False)) or type(llm).__name__ == "ChatBedrockConverse"
+
+def cacheable_system_message(content: str, llm) -> SystemMessage:
+    """
+    Builds a system message holding a static prompt prefix that providers can cache.
+
+    OpenAI caches byte-identical prompt prefixes automatically, so the content is sent as is.
+    Anthropic models only cache up to an explicit breakpoint. Through the Bedrock Converse API
+    (the repo's Claude path), it is a `cachePoint` block after the text, since the Converse
+    conversion drops `cache_control`; other Anthropic clients get `cache_control` on the text
+    block (with the `prompt_cache.ttl` lifetime if configured).
+
+    Args:
+        content (str): The static prompt prefix. It must not contain per-request values.
+        llm: The model the message is sent to (before any tool binding).
+
+    Returns:
+        SystemMessage: The system message.
+    """
+    model = str(getattr(llm, "model_id", None) or getattr(llm, "model_name", None) or "").lower()
+    if "anthropic" in model or "claude" in model:
+        if _uses_bedrock_converse(llm):
+            return SystemMessage(content=[{"type": "text", "text": content}, {"cachePoint": {"type": "default"}}])
+        cache_control = {"type": "ephemeral"}
+        ttl = config.get("prompt_cache.ttl")
+        if ttl:
+            cache_control["ttl"] = ttl
+        return SystemMessage(content=[{"type": "text", "text": content, "cache_control": cache_control}])
+    return SystemMessage(content=content)
@@ -0,0 +1,163 @@
+"""
+Description:
+Nearest neighbour indexes for the in-process vector lookups of the retrievers, such as
+the semantic cache. Large indexes use an approximate HNSW graph from the optional
+`hnswlib` package; small ones, or installs without it, use a brute-force search over
+float32 vectors, or over int8-quantized vectors to cut their memory by 4.
+
+Author: Raptopoulos Petros [petrosrapto@gmail.com]
+Date: 2025/03/10
+"""
+from typing import Tuple, Union
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # hnswlib is optional, fall back to the brute-force search
+    hnswlib = None
+
+
+class BruteForceIndex:
+    """
+    Exact cosine search over the rows of one contiguous float32 matrix.
+
+    Vectors are stored in numbered slots and must be L2-normalized, so that a search is a
+    single matrix-vector product. The capacity doubles up to `capacity` rows as slots are added.
+    """
+
+    # Every stored vector is compared, so a search may cheaply return all of them
+    exact = True
+
+    def __init__(self, dimension: int, capacity: int):
+        self.dimension = dimension
+        self.capacity = capacity
+        self._matrix = np.empty((min(16, capacity), dimension), dtype=np.float32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def set(self, slot: int, vector: np.ndarray) -> None:
+        """Stores (or replaces) the vector of a slot; slots are numbered from 0 without gaps."""
+        if slot >= self._matrix.shape[0]:
+            grown = np.empty((min(2 * self._matrix.shape[0], self.capacity), self.dimension), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[slot] = vector
+        self._size = max(self._size, slot + 1)
+
+    def search(self, vector: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the slots of the `k` most similar vectors and their cosine similarities, most similar first."""
+        return _top_k(self._matrix[:self._size] @ vector, k)
+
+
+class Int8BruteForceIndex:
+    """
+    Brute-force cosine search over int8-quantized vectors, each stored with a float32 scale.
+
+    A vector `v` is kept as `round(v / scale)` with `scale = max(|v|) / 127`, a quarter of
+    the float32 memory; similarities are `scale * (q @ vector)`, with an error well below
+    the gaps that separate cached queries. Same interface as `BruteForceIndex`.
+    """
+
+    # Rows converted to float32 at a time during a search, bounding the temporary memory
+    block_rows = 4096
+    exact = True
+
+    def __init__(self, dimension: int, capacity: int):
+        self.dimension = dimension
+        self.capacity = capacity
+        rows = min(16, capacity)
+        self._matrix = np.empty((rows, dimension), dtype=np.int8)
+        self._scales = np.empty(rows, dtype=np.float32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def set(self, slot: int, vector: np.ndarray) -> None:
+        """Stores (or replaces) the quantized vector of a slot; slots are numbered from 0 without gaps."""
+        if slot >= self._matrix.shape[0]:
+            rows = min(2 * self._matrix.shape[0], self.capacity)
+            matrix = np.empty((rows, self.dimension), dtype=np.int8)
+            scales = np.empty(rows, dtype=np.float32)
+            matrix[:self._size] = self._matrix[:self._size]
+            scales[:self._size] = self._scales[:self._size]
+            self._matrix, self._scales = matrix, scales
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        self._matrix[slot] = np.round(vector / scale)
+        self._scales[slot] = scale
+        self._size = max(self._size, slot + 1)
+
+    def search(self, vector: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the slots of the `k` most similar vectors and their cosine similarities, most similar first."""
+        vector = np.asarray(vector, dtype=np.float32)
+        similarities = np.empty(self._size, dtype=np.float32)
+        for start in range(0, self._size, self.block_rows):
+            end = min(start + self.block_rows, self._size)
+            similarities[start:end] = (self._matrix[start:end] @ vector) * self._scales[start:end]
+        return _top_k(similarities, k)
+
+
+class HNSWIndex:
+    """
+    Approximate cosine search over an HNSW graph (`hnswlib`), in O(log N) instead of O(N).
+
+    Same interface as `BruteForceIndex`. Setting a slot that is already stored replaces its vector.
+    `ef` trades recall for speed at query time (it is raised to `k` when needed).
+    """
+
+    # Only the graph neighbourhood of the query is explored, `k` must stay small
+    exact = False
+
+    def __init__(self, dimension: int, capacity: int, m: int = 32, ef_construction: int = 200, ef: int = 100):
+        self.dimension = dimension
+        self.capacity = capacity
+        self.ef = ef
+        self._index = hnswlib.Index(space="cosine", dim=dimension)
+        self._index.init_index(max_elements=capacity, ef_construction=ef_construction, M=m)
+        self._index.set_ef(ef)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def set(self, slot: int, vector: np.ndarray) -> None:
+        """Stores (or replaces) the vector of a slot; slots are numbered from 0 without gaps."""
+        self._index.add_items(vector[np.newaxis], np.asarray([slot]))
+        self._size = max(self._size, slot + 1)
+
+    def search(self, vector: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the slots of the (approximately) `k` most similar vectors and their cosine similarities."""
+        k = min(k, self._size)
+        self._index.set_ef(max(self.ef, k))
+        labels, distances = self._index.knn_query(vector, k=k)
+        return labels[0].astype(np.int64), 1.0 - distances[0]
+
+
+def _top_k(similarities: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the positions of the `k` largest similarities and their values, largest first."""
+    if k < len(similarities):
+        slots = np.argpartition(-similarities, k - 1)[:k]
+    else:
+        slots = np.arange(len(similarities))
+    slots = slots[np.argsort(-similarities[slots], kind="stable")]
+    return slots, similarities[slots]
+
+
+def make_index(dimension: int, capacity: int, ann_min_size: int = 2048,
+               quantize: bool = False) -> Union[BruteForceIndex, Int8BruteForceIndex, HNSWIndex]:
+    """
+    Returns the index to use for up to `capacity` vectors of `dimension` floats.
+
+    An HNSW index is only worth its build cost and small recall loss on large collections,
+    so it is used when `capacity` reaches `ann_min_size` and `hnswlib` is installed (it keeps
+    float32 vectors). Otherwise the vectors are searched by brute force, int8-quantized
+    when `quantize` is set.
+    """
+    if hnswlib is not None and capacity >= ann_min_size:
+        return HNSWIndex(dimension, capacity)
+    if quantize:
+        return Int8BruteForceIndex(dimension, capacity)
+    return BruteForceIndex(dimension, capacity)
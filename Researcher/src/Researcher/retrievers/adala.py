@@ -43,18 +43,64 @@ Author: Petros Raptopoulos (petrosrapto@gmail.com)
 Date: 2026/01/08
 """
 
-import asyncio
+import logging
+import re
 import traceback
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from langchain_core.documents import Document
 import httpx
 
+try:
+    # orjson decodes the Adala search responses several times faster
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 from .base import BaseRetriever
+from .cache import cached_retrieval
+from Researcher.utils.http import get_async_client, get_sync_client, aclose_async_client
 from Researcher.utils import logger  # Import the logger
+from Researcher.utils import preview_documents
 from Researcher.utils import config  # Import the Config loader
 
 from langchain.tools import Tool
 
+# Metadata fields of the Adala results that searches can be restricted to
+FILTER_FIELDS = ("type", "law_type", "date")
+
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def extract_filters(query: str) -> Dict[str, str]:
+    """
+    Extracts metadata constraints stated in a natural-language query.
+
+    Only unambiguous constraints are extracted: a single year (e.g. "decrees of 2024")
+    restricts the results to documents dated that year.
+
+    Args:
+        query (str): The search query.
+
+    Returns:
+        Dict[str, str]: The filters, empty if the query states none.
+    """
+    years = set(_YEAR_RE.findall(query))
+    if len(years) == 1:
+        return {"date": years.pop()}
+    return {}
+
+
+def matches_filters(result: Dict[str, Any], filters: Dict[str, str]) -> bool:
+    """Returns True if an Adala result matches every filter (`date` matches as a prefix, e.g. "2024" or "2024-03")."""
+    for field, value in filters.items():
+        result_value = str(result.get(field) or "")
+        if field == "date":
+            if not result_value.startswith(value):
+                return False
+        elif result_value.casefold() != value.casefold():
+            return False
+    return True
+
 
 class AdalaRetriever(BaseRetriever):
     """
@@ -94,6 +140,9 @@ class AdalaRetriever(BaseRetriever):
             self.base_url = adala_config.get("base_url", "https://adala.justice.gov.ma")
             self.build_id = adala_config.get("build_id", "THP5ZL1eNCinRAZ1hWfN0")
             self.max_results = adala_config.get("max_results", 5)
+            self.timeout = httpx.Timeout(adala_config.get("timeout", 30.0))
+            # Extract filters (e.g. a year) from the queries that do not pass any
+            self.auto_filters = adala_config.get("auto_filters", False)
 
             # Log retriever configuration
             logger.info("Initializing AdalaRetriever with config: %s", adala_config)
@@ -116,61 +165,163 @@ class AdalaRetriever(BaseRetriever):
         """
         return "adala_retriever"
 
-    async def _async_search(self, keyword: str, limit: int = 5) -> List[Dict[str, Any]]:
+    def _search_request(self, keyword: str,
+                        filters: Optional[Dict[str, str]]) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+        """Returns the API endpoint URL, the query parameters and the supported filters of a search."""
+        # Construct the API endpoint URL
+        api_url = f"{self.base_url}/_next/data/{self.build_id}/fr/search.json"
+
+        # Prepare search parameters
+        filters = {field: value for field, value in (filters or {}).items() if field in FILTER_FIELDS and value}
+        params = {
+            "term": keyword,
+            **filters
+        }
+        logger.info("Sending request to Adala API: %s with params: %s", api_url, params)
+        return api_url, params, filters
+
+    @staticmethod
+    def _search_results(response: httpx.Response, limit: int, filters: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Extracts the matching search results from an Adala API response, up to `limit`."""
+        response.raise_for_status()
+
+        # Parse the JSON response straight from its UTF-8 body
+        data = _loads(response.content)
+
+        # Extract search results from nested structure
+        search_results = (
+            data.get("pageProps", {})
+            .get("searchResult", {})
+            .get("data", [])
+        )
+
+        # Keep the matching results only, then limit them
+        if filters:
+            search_results = [result for result in search_results if matches_filters(result, filters)]
+        limited_results = search_results[:limit]
+
+        logger.info("Retrieved %d results from Adala API", len(limited_results))
+        return limited_results
+
+    @staticmethod
+    def _search_failed(error: Exception) -> List[Dict[str, Any]]:
+        """Logs a failed search (called from the `except` block) and returns no results."""
+        if isinstance(error, httpx.HTTPStatusError):
+            logger.error("HTTP error from Adala API: %s", str(error))
+        elif isinstance(error, httpx.RequestError):
+            logger.error("Request error to Adala API: %s", str(error))
+        else:
+            logger.error("Unexpected error in Adala API search: %s", str(error))
+        logger.debug(traceback.format_exc())
+        return []
+
+    async def _async_search(self, keyword: str, limit: int = 5,
+                            filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
         """
         Performs an asynchronous search to the Adala Justice API.
 
+        Requests go through the shared pooled client of the running event loop, so
+        consecutive searches reuse its keep-alive connections instead of paying a new
+        TCP+TLS handshake each time.
+
         Args:
             keyword (str): The search term (supports Arabic and French).
             limit (int): Maximum number of results to retrieve.
+            filters (Dict[str, str], optional): Metadata constraints (`type`, `law_type`, `date`).
+                They are sent with the search, and applied to the results before the limit
+                in case the API ignores them.
 
         Returns:
             List[Dict[str, Any]]: List of search result dictionaries.
         """
         try:
-            # Construct the API endpoint URL
-            api_url = f"{self.base_url}/_next/data/{self.build_id}/fr/search.json"
+            api_url, params, filters = self._search_request(keyword, filters)
+            response = await get_async_client().get(api_url, params=params, timeout=self.timeout)
+            return self._search_results(response, limit, filters)
+        except Exception as e:
+            return self._search_failed(e)
+
+    def _search(self, keyword: str, limit: int = 5,
+                filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Performs a blocking search to the Adala Justice API (see `_async_search`).
+
+        Requests go through the shared synchronous client, which keeps its connections
+        to the Adala website open across calls and threads.
+        """
+        try:
+            api_url, params, filters = self._search_request(keyword, filters)
+            response = get_sync_client().get(api_url, params=params, timeout=self.timeout)
+            return self._search_results(response, limit, filters)
+        except Exception as e:
+            return self._search_failed(e)
+
+    def _to_documents(self, search_results: List[Dict[str, Any]]) -> List[Document]:
+        """
+        Converts Adala search results into LangChain Document objects.
+
+        Args:
+            search_results (List[Dict[str, Any]]): Results returned by the Adala API.
+
+        Returns:
+            List[Document]: One document per result.
+        """
+        # Convert search results to LangChain Document format
+        documents = []
+        for result in search_results:
+            # Extract document fields
+            title = result.get("title", "")
+            document_type = result.get("type", "")
+            law_type = result.get("law_type", "")
+            date = result.get("date", "")
+            relative_path = result.get("relative_path", "")
             
-            # Prepare search parameters
-            params = {
-                "term": keyword,
-            }
+            # Construct download URL
+            download_url = ""
+            if relative_path:
+                download_url = f"{self.base_url}{relative_path}"
             
-            # Make async HTTP request with timeout
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                logger.info("Sending request to Adala API: %s with params: %s", api_url, params)
-                response = await client.get(api_url, params=params)
-                response.raise_for_status()
-                
-                # Parse JSON response
-                data = response.json()
-                
-                # Extract search results from nested structure
-                search_results = (
-                    data.get("pageProps", {})
-                    .get("searchResult", {})
-                    .get("data", [])
-                )
-                
-                # Limit results
-                limited_results = search_results[:limit]
-                
-                logger.info("Retrieved %d results from Adala API", len(limited_results))
-                return limited_results
-                
-        except httpx.HTTPStatusError as e:
-            logger.error("HTTP error from Adala API: %s", str(e))
-            logger.debug(traceback.format_exc())
-            return []
-        except httpx.RequestError as e:
-            logger.error("Request error to Adala API: %s", str(e))
-            logger.debug(traceback.format_exc())
-            return []
-        except Exception as e:
-            logger.error("Unexpected error in Adala API search: %s", str(e))
-            logger.debug(traceback.format_exc())
-            return []
+            # Create page content with structured information
+            page_content_parts = []
+            if title:
+                page_content_parts.append(f"Title: {title}")
+            if document_type:
+                page_content_parts.append(f"Document Type: {document_type}")
+            if law_type:
+                page_content_parts.append(f"Law Type: {law_type}")
+            if date:
+                page_content_parts.append(f"Date: {date}")
+            if download_url:
+                page_content_parts.append(f"Download URL: {download_url}")
+            
+            page_content = "\n".join(page_content_parts)
+            
+            # Create Document object
+            doc = Document(
+                page_content=page_content,
+                metadata={
+                    "source": download_url,
+                    "title": title,
+                    "type": document_type,
+                    "law_type": law_type,
+                    "date": date,
+                    "relative_path": relative_path,
+                    "retriever": self.name
+                }
+            )
+            documents.append(doc)
 
+        return documents
+
+    def _filters(self, query: str, filters: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """Returns the filters of a search: the given ones, or those extracted from the query with `auto_filters`."""
+        if filters is None and self.auto_filters:
+            filters = extract_filters(query)
+            if filters:
+                logger.info("Filtering Adala results with: %s", filters)
+        return filters
+
+    @cached_retrieval
     def retrieve(self, query: str, **kwargs) -> List[Document]:
         """
         Retrieves **Moroccan legal documents** from the Adala Justice website.
@@ -182,11 +333,14 @@ class AdalaRetriever(BaseRetriever):
 
         Args:
             query (str): The input search query (Arabic or French).
-            **kwargs: Additional parameters, such as `max_results` for limiting results.
+            **kwargs: Additional parameters, such as `max_results` for limiting results
+                and `filters` (e.g. `{"law_type": "Civil", "date": "2024"}`) for restricting them.
 
         Returns:
             List[Document]: A **list of retrieved legal documents**.
 
+        Repeated queries (same normalized text and parameters) are served by the retrieval cache.
+
         Logs:
             - Logs query execution and retrieval success.
             - Logs the number of documents retrieved.
@@ -197,66 +351,17 @@ class AdalaRetriever(BaseRetriever):
 
             logger.info("Retrieving Adala documents for query: %s", query)
 
-            # Handle async search in sync context
-            try:
-                # Try to get the current event loop
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                # No event loop, create a new one
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
-            # Run the async search
-            search_results = asyncio.run(self._async_search(query, max_results))
+            filters = self._filters(query, kwargs.get("filters"))
+
+            search_results = self._search(query, max_results, filters)
 
             logger.info("Successfully retrieved %d Adala documents", len(search_results))
 
-            # Convert search results to LangChain Document format
-            documents = []
-            for result in search_results:
-                # Extract document fields
-                title = result.get("title", "")
-                document_type = result.get("type", "")
-                law_type = result.get("law_type", "")
-                date = result.get("date", "")
-                relative_path = result.get("relative_path", "")
-                
-                # Construct download URL
-                download_url = ""
-                if relative_path:
-                    download_url = f"{self.base_url}{relative_path}"
-                
-                # Create page content with structured information
-                page_content_parts = []
-                if title:
-                    page_content_parts.append(f"Title: {title}")
-                if document_type:
-                    page_content_parts.append(f"Document Type: {document_type}")
-                if law_type:
-                    page_content_parts.append(f"Law Type: {law_type}")
-                if date:
-                    page_content_parts.append(f"Date: {date}")
-                if download_url:
-                    page_content_parts.append(f"Download URL: {download_url}")
-                
-                page_content = "\n".join(page_content_parts)
-                
-                # Create Document object
-                doc = Document(
-                    page_content=page_content,
-                    metadata={
-                        "source": download_url,
-                        "title": title,
-                        "type": document_type,
-                        "law_type": law_type,
-                        "date": date,
-                        "relative_path": relative_path,
-                        "retriever": self.name
-                    }
-                )
-                documents.append(doc)
-
-            logger.info("Documents retrieved: %s", str(documents))
+            documents = self._to_documents(search_results)
+
+            logger.info("Successfully retrieved %d documents from Adala", len(documents))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Documents retrieved: %s", preview_documents(documents))
             
             return documents
 
@@ -265,6 +370,41 @@ class AdalaRetriever(BaseRetriever):
             logger.debug(traceback.format_exc())
             return []
 
+    @cached_retrieval
+    async def aretrieve(self, query: str, **kwargs) -> List[Document]:
+        """
+        Asynchronously retrieves Moroccan legal documents from the Adala Justice website.
+
+        Runs on the caller's event loop through its pooled async client, so that
+        successive searches reuse warm connections.
+
+        Args:
+            query (str): The input search query (Arabic or French).
+            **kwargs: Additional parameters, such as `max_results` and `filters` (see `retrieve`).
+
+        Returns:
+            List[Document]: A list of retrieved legal documents.
+        """
+        try:
+            max_results = kwargs.get("max_results", self.max_results)
+            logger.info("Retrieving Adala documents for query: %s", query)
+
+            filters = self._filters(query, kwargs.get("filters"))
+
+            documents = self._to_documents(await self._async_search(query, max_results, filters))
+
+            logger.info("Successfully retrieved %d documents from Adala", len(documents))
+            return documents
+
+        except Exception as e:
+            logger.error("Error retrieving from Adala: %s", str(e))
+            logger.debug(traceback.format_exc())
+            return []
+
+    async def aclose(self) -> None:
+        """Closes the pooled HTTP client of the running event loop."""
+        await aclose_async_client()
+
     @property
     def tool(self) -> Tool:
         """
@@ -7,6 +7,7 @@ including name, tool properties, and retrieval methods.
 Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 from langchain_core.documents import Document
@@ -46,6 +47,59 @@ class BaseRetriever(Runnable, ABC):
         """
         pass
 
+    def invalidate(self) -> int:
+        """Drop every cached retrieval result of this retriever (e.g. after a corpus update).
+
+        Returns:
+            Number of cache entries removed
+        """
+        from .cache import get_retrieval_cache, cache_namespace
+
+        cache = get_retrieval_cache()
+        if cache is None:
+            return 0
+        return cache.invalidate(f"{cache_namespace()}:{self.name}:")
+
+    def batch_retrieve(self, queries: List[str], **kwargs) -> List[List[Document]]:
+        """Retrieve several queries, one after the other.
+        
+        Retrievers able to serve queries concurrently should override this method.
+        
+        Args:
+            queries: The search queries
+            **kwargs: Additional parameters specific to this retriever
+            
+        Returns:
+            List of retrieved documents for each query, in input order
+        """
+        return [self.retrieve(query, **kwargs) for query in queries]
+
+    async def aretrieve(self, query: str, **kwargs) -> List[Document]:
+        """Asynchronously retrieve information as LangChain Document objects.
+        
+        The default implementation runs `retrieve` in a worker thread.
+        
+        Args:
+            query: The search query
+            **kwargs: Additional parameters specific to this retriever
+            
+        Returns:
+            List of LangChain Document objects
+        """
+        return await asyncio.to_thread(self.retrieve, query, **kwargs)
+
+    async def abatch_retrieve(self, queries: List[str], **kwargs) -> List[List[Document]]:
+        """Asynchronously retrieve several queries, one after the other.
+        
+        Args:
+            queries: The search queries
+            **kwargs: Additional parameters specific to this retriever
+            
+        Returns:
+            List of retrieved documents for each query, in input order
+        """
+        return [await self.aretrieve(query, **kwargs) for query in queries]
+
     def get_relevant_documents(self, query: str, **kwargs) -> List[Document]:
         """
         This function makes the retriever compatible with LangChain's Retriever interface.
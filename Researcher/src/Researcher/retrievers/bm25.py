@@ -14,6 +14,7 @@ This module implements a retriever using the BM25 (Best Matching 25) algorithm,
 with added functionality to access the BM25 scores for each retrieved document.
 """
 
+import logging
 import traceback
 from typing import List, Optional, Tuple, Dict, Any
 from langchain_core.documents import Document
@@ -23,6 +24,7 @@ import numpy as np
 
 from .base import BaseRetriever
 from Researcher.utils import logger  # Import the logger
+from Researcher.utils import preview_documents
 from Researcher.utils import config  # Import the Config loader
 
 from langchain.tools import Tool
@@ -122,7 +124,8 @@ class BM25RetrieverWrapper(BaseRetriever):
                 documents.append(doc)
 
             logger.info("Successfully retrieved %d documents from bm25", len(documents))
-            logger.info("Documents retrieved: %s", str(documents))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Documents retrieved: %s", preview_documents(documents))
 
             return documents
         except Exception as e:
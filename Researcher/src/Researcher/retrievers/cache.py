@@ -0,0 +1,458 @@
+"""
+Description:
+Pluggable retrieval cache for the Researcher retrievers. Provides an in-process LRU
+backend and a Redis backend shared across workers and restarts, selected through the
+`retrievers.cache` section of config.yaml, plus a decorator that memoizes `retrieve`
+and a semantic cache matching near-identical queries by embedding similarity.
+
+Author: Raptopoulos Petros [petrosrapto@gmail.com]
+Date: 2025/03/10
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+import traceback
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from Researcher.utils import logger  # Import the logger
+from Researcher.utils import config  # Import the Config loader
+from Researcher.utils.cache_metrics import record_cache_lookup, observe_retrieval_latency, RETRIEVAL
+from ._ann import make_index
+
+
+def make_cache_key(namespace: str, retriever_name: str, query: str, params: Dict[str, Any]) -> str:
+    """
+    Builds the cache key of a retrieval call.
+
+    The key is `<namespace>:<retriever_name>:<sha256>` where the digest covers the retriever
+    name, the whitespace/case normalized query and the sorted call parameters. Keeping the
+    retriever name in clear text allows invalidating every entry of a single retriever.
+
+    Args:
+        namespace (str): Prefix shared by all the keys of this application.
+        retriever_name (str): Unique name of the retriever.
+        query (str): The search query.
+        params (Dict[str, Any]): Additional retrieval parameters.
+
+    Returns:
+        str: The cache key.
+    """
+    normalized_query = " ".join(query.split()).casefold()
+    serialized_params = json.dumps(params, sort_keys=True, default=str)
+    digest = hashlib.sha256(
+        "\x1f".join((retriever_name, normalized_query, serialized_params)).encode("utf-8")
+    ).hexdigest()
+    return f"{namespace}:{retriever_name}:{digest}"
+
+
+# Retrieval parameters derived from the query itself, left out of the cache key
+_KEY_EXCLUDED_PARAMS = frozenset({"query_vector"})
+
+
+def _key_params(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the retrieval parameters that make up the cache key."""
+    return {name: value for name, value in kwargs.items() if name not in _KEY_EXCLUDED_PARAMS}
+
+
+def _dump_documents(documents: List[Document]) -> List[Dict[str, Any]]:
+    """Converts documents to plain dictionaries (page_content + metadata)."""
+    return [{"page_content": doc.page_content, "metadata": dict(doc.metadata)} for doc in documents]
+
+
+def _load_documents(records: List[Dict[str, Any]]) -> List[Document]:
+    """Rebuilds fresh Document objects so callers can mutate them without touching the cache."""
+    return [Document(page_content=r["page_content"], metadata=dict(r["metadata"] or {})) for r in records]
+
+
+class RetrievalCache(ABC):
+    """Base class for the retrieval cache backends."""
+
+    def __init__(self, ttl: int = 3600):
+        self.ttl = ttl
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[List[Document]]:
+        """Return the cached documents for `key`, or None on a miss."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, documents: List[Document], ttl: Optional[int] = None) -> None:
+        """Store `documents` under `key` for `ttl` seconds."""
+        pass
+
+    @abstractmethod
+    def invalidate(self, prefix: str) -> int:
+        """Drop every entry whose key starts with `prefix` and return how many were removed."""
+        pass
+
+    async def aget(self, key: str) -> Optional[List[Document]]:
+        """Coroutine version of `get`; backends doing network I/O run it off the event loop."""
+        return self.get(key)
+
+    async def aset(self, key: str, documents: List[Document], ttl: Optional[int] = None) -> None:
+        """Coroutine version of `set`; backends doing network I/O run it off the event loop."""
+        self.set(key, documents, ttl)
+
+    def get_or_set(self, key: str, ttl: Optional[int], fn: Callable[[], List[Document]]) -> List[Document]:
+        """
+        Returns the cached documents for `key`, computing and storing them with `fn` on a miss.
+
+        Empty results are never cached, since the retrievers return an empty list on errors.
+
+        Args:
+            key (str): The cache key.
+            ttl (Optional[int]): Time to live in seconds (defaults to the backend ttl).
+            fn (Callable[[], List[Document]]): Function performing the actual retrieval.
+
+        Returns:
+            List[Document]: The retrieved documents.
+        """
+        cached = self.get(key)
+        record_cache_lookup(RETRIEVAL, cached is not None)
+        if cached is not None:
+            logger.debug("Retrieval cache hit: %s", key)
+            return cached
+
+        documents = fn()
+        if documents:
+            self.set(key, documents, ttl)
+        return documents
+
+
+class InMemoryLRU(RetrievalCache):
+    """Process-local LRU cache with per-entry expiration."""
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 3600):
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[Document]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, records = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return _load_documents(records)
+
+    def set(self, key: str, documents: List[Document], ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + (ttl or self.ttl)
+        records = _dump_documents(documents)
+        with self._lock:
+            self._entries[key] = (expires_at, records)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+
+class RedisCache(RetrievalCache):
+    """
+    Redis-backed cache shared by every worker process.
+
+    Documents are stored msgpack-serialized with `SETEX`. Redis errors are logged and
+    treated as cache misses so that retrieval keeps working when Redis is unavailable.
+    The client is synchronous, so the coroutine methods run its calls in a worker thread.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl: int = 3600):
+        super().__init__(ttl)
+        import redis
+        import msgpack
+
+        self._msgpack = msgpack
+        self._redis_error = redis.RedisError
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[List[Document]]:
+        try:
+            payload = self.client.get(key)
+        except self._redis_error as e:
+            logger.warning("Redis cache get failed: %s", str(e))
+            return None
+        if payload is None:
+            return None
+        return _load_documents(self._msgpack.unpackb(payload, raw=False))
+
+    def set(self, key: str, documents: List[Document], ttl: Optional[int] = None) -> None:
+        payload = self._msgpack.packb(_dump_documents(documents), use_bin_type=True, default=str)
+        try:
+            self.client.setex(key, ttl or self.ttl, payload)
+        except self._redis_error as e:
+            logger.warning("Redis cache set failed: %s", str(e))
+
+    async def aget(self, key: str) -> Optional[List[Document]]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, documents: List[Document], ttl: Optional[int] = None) -> None:
+        await asyncio.to_thread(self.set, key, documents, ttl)
+
+    def invalidate(self, prefix: str) -> int:
+        removed = 0
+        try:
+            for key in self.client.scan_iter(match=f"{prefix}*", count=500):
+                removed += self.client.delete(key)
+        except self._redis_error as e:
+            logger.warning("Redis cache invalidation failed: %s", str(e))
+        return removed
+
+
+class SemanticCache:
+    """
+    In-process cache returning the documents of a previous, semantically similar query.
+
+    Queries are embedded with `embed` and compared by cosine similarity against the cached
+    query embeddings, kept in a nearest neighbour index (an exact float32 matrix search, or
+    an HNSW graph when `maxsize` reaches `ann_min_size` and `hnswlib` is installed, or an
+    int8-quantized search with `quantize`); the
+    documents of the most similar cached query are returned when the similarity reaches
+    `threshold`. Entries carry a `scope` (e.g. the retrieval parameters) and only match
+    lookups of the same scope. Beyond `maxsize` entries, the least recently used entry is replaced.
+    Lookups are counted in the cache metrics under `layer`.
+    """
+
+    # Nearest cached queries looked at on an HNSW index when the closest ones belong to
+    # another scope (exact indexes look at every entry above the threshold)
+    search_k = 16
+
+    def __init__(self, embed: Callable[[str], List[float]], threshold: float = 0.85, maxsize: int = 256,
+                 ann_min_size: int = 2048, quantize: bool = False, layer: str = "semantic"):
+        self.embed = embed
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ann_min_size = ann_min_size
+        self.quantize = quantize
+        self.layer = layer
+        self._slots: Dict[tuple, int] = {}  # (normalized query, scope) -> slot
+        self._keys: List[tuple] = []
+        self._records: List[List[Dict[str, Any]]] = []
+        self._last_used: List[int] = []
+        self._clock = 0
+        # Slot embeddings, created with the dimension of the first one
+        self._index = None
+        self._lock = threading.Lock()
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """Returns the L2-normalized float32 embedding of a query."""
+        vector = np.asarray(self.embed(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _closest(self, vector: np.ndarray, scope: Any) -> tuple:
+        """Returns the slot of the most similar entry of `scope` above the threshold and its similarity, or (None, None)."""
+        if not self._keys:
+            return None, None
+
+        # Closest entries first, skipping those of another scope
+        k = len(self._index) if self._index.exact else self.search_k
+        for slot, similarity in zip(*self._index.search(vector, k)):
+            if similarity < self.threshold:
+                break
+            if self._keys[int(slot)][1] == scope:
+                return int(slot), similarity
+        return None, None
+
+    def get(self, query: str, scope: Any = None, vector: Optional[np.ndarray] = None) -> Optional[List[Document]]:
+        """
+        Returns the documents of the most similar cached query of the same scope, or None on a miss.
+
+        Args:
+            query (str): The search query.
+            scope (Any): Hashable value that must match the one the entry was stored with.
+            vector (np.ndarray, optional): The query embedding, if already computed with `embed_query`.
+        """
+        if vector is None:
+            vector = self.embed_query(query)
+
+        with self._lock:
+            slot, similarity = self._closest(vector, scope)
+            record_cache_lookup(self.layer, slot is not None)
+            if slot is None:
+                return None
+
+            self._clock += 1
+            self._last_used[slot] = self._clock
+            logger.debug("Semantic cache hit (similarity %.3f): %s", similarity, self._keys[slot][0])
+            return _load_documents(self._records[slot])
+
+    def set(self, query: str, documents: List[Document], scope: Any = None, vector: Optional[np.ndarray] = None) -> None:
+        """
+        Stores the documents retrieved for a query. Empty results are not cached.
+
+        Args:
+            query (str): The search query.
+            documents (List[Document]): The retrieved documents.
+            scope (Any): Hashable value that lookups must match.
+            vector (np.ndarray, optional): The query embedding, if already computed with `embed_query`.
+        """
+        if not documents:
+            return
+        if vector is None:
+            vector = self.embed_query(query)
+
+        key = (" ".join(query.split()).casefold(), scope)
+        records = _dump_documents(documents)
+        with self._lock:
+            self._clock += 1
+            if self._index is None:
+                self._index = make_index(vector.shape[0], self.maxsize, self.ann_min_size, self.quantize)
+            slot = self._slots.get(key)
+            if slot is None and len(self._keys) < self.maxsize:
+                # Append a new slot
+                slot = len(self._keys)
+                self._keys.append(key)
+                self._records.append(records)
+                self._last_used.append(self._clock)
+                self._slots[key] = slot
+            elif slot is None:
+                # Replace the least recently used slot
+                slot = min(range(len(self._keys)), key=self._last_used.__getitem__)
+                del self._slots[self._keys[slot]]
+                self._keys[slot] = key
+                self._slots[key] = slot
+                self._records[slot] = records
+                self._last_used[slot] = self._clock
+            else:
+                self._records[slot] = records
+                self._last_used[slot] = self._clock
+
+            self._index.set(slot, vector)
+
+
+_retrieval_cache: Optional[RetrievalCache] = None
+_retrieval_cache_loaded = False
+_retrieval_cache_lock = threading.Lock()
+
+
+def get_retrieval_cache() -> Optional[RetrievalCache]:
+    """
+    Returns the process-wide retrieval cache configured under `retrievers.cache`.
+
+    Supported backends are `memory` (InMemoryLRU) and `redis` (RedisCache). When the section
+    is missing, the backend is `none`, or the backend cannot be initialized, caching is disabled.
+
+    Returns:
+        Optional[RetrievalCache]: The cache instance, or None if caching is disabled.
+    """
+    global _retrieval_cache, _retrieval_cache_loaded
+
+    if _retrieval_cache_loaded:
+        return _retrieval_cache
+
+    with _retrieval_cache_lock:
+        if _retrieval_cache_loaded:
+            return _retrieval_cache
+
+        cache_config = config.get("retrievers.cache", {})
+        backend = str(cache_config.get("backend", "none")).lower()
+        ttl = cache_config.get("ttl", 3600)
+
+        try:
+            if backend == "memory":
+                _retrieval_cache = InMemoryLRU(maxsize=cache_config.get("maxsize", 1024), ttl=ttl)
+            elif backend == "redis":
+                _retrieval_cache = RedisCache(url=cache_config.get("redis_url", "redis://localhost:6379/0"), ttl=ttl)
+            elif backend != "none":
+                raise ValueError(f"Unsupported retrieval cache backend: {backend}")
+            logger.info("Retrieval cache backend: %s", backend)
+        except Exception as e:
+            logger.error("Error initializing retrieval cache, caching disabled: %s", str(e))
+            logger.debug(traceback.format_exc())
+            _retrieval_cache = None
+
+        _retrieval_cache_loaded = True
+        return _retrieval_cache
+
+
+def cache_namespace() -> str:
+    """Returns the key prefix shared by all the retrieval cache entries."""
+    return config.get("retrievers.cache.namespace", "researcher")
+
+
+def retriever_ttl(retriever_name: str) -> Optional[int]:
+    """
+    Returns the lifetime of the cached results of a retriever (`retrievers.cache.ttl_by_retriever`).
+
+    None means the backend default `ttl`; 0 means the retriever's results are not cached.
+    """
+    return (config.get("retrievers.cache.ttl_by_retriever", {}) or {}).get(retriever_name)
+
+
+def cached_retrieval(retrieve: Callable[..., List[Document]]) -> Callable[..., List[Document]]:
+    """
+    Decorator memoizing a retriever's `retrieve(query, **kwargs)` in the retrieval cache.
+    Coroutine methods such as `aretrieve` are supported as well.
+
+    The cache key covers the retriever name, the normalized query and the keyword arguments
+    (except the ones derived from the query, such as a precomputed `query_vector`).
+    Results live for the retriever's `retriever_ttl`. Cache hits and misses, and the
+    duration of the retrievals performed, are recorded in the cache metrics.
+    """
+
+    if inspect.iscoroutinefunction(retrieve):
+        async def timed_retrieve(self, query: str, **kwargs) -> List[Document]:
+            start = time.perf_counter()
+            try:
+                return await retrieve(self, query, **kwargs)
+            finally:
+                observe_retrieval_latency(self.name, time.perf_counter() - start)
+
+        @functools.wraps(retrieve)
+        async def async_wrapper(self, query: str, **kwargs) -> List[Document]:
+            cache = get_retrieval_cache()
+            ttl = retriever_ttl(self.name)
+            if cache is None or ttl == 0:
+                return await timed_retrieve(self, query, **kwargs)
+
+            key = make_cache_key(cache_namespace(), self.name, query, _key_params(kwargs))
+            cached = await cache.aget(key)
+            record_cache_lookup(RETRIEVAL, cached is not None)
+            if cached is not None:
+                logger.debug("Retrieval cache hit: %s", key)
+                return cached
+
+            documents = await timed_retrieve(self, query, **kwargs)
+            if documents:
+                await cache.aset(key, documents, ttl)
+            return documents
+
+        return async_wrapper
+
+    def timed_retrieve(self, query: str, **kwargs) -> List[Document]:
+        start = time.perf_counter()
+        try:
+            return retrieve(self, query, **kwargs)
+        finally:
+            observe_retrieval_latency(self.name, time.perf_counter() - start)
+
+    @functools.wraps(retrieve)
+    def wrapper(self, query: str, **kwargs) -> List[Document]:
+        cache = get_retrieval_cache()
+        ttl = retriever_ttl(self.name)
+        if cache is None or ttl == 0:
+            return timed_retrieve(self, query, **kwargs)
+
+        key = make_cache_key(cache_namespace(), self.name, query, _key_params(kwargs))
+        return cache.get_or_set(key, ttl, lambda: timed_retrieve(self, query, **kwargs))
+
+    return wrapper
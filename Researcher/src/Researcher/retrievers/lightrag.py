@@ -8,18 +8,42 @@ Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
 import os
+import asyncio
+import logging
 import traceback
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
-from typing import List, Dict, Any, Optional
+import httpx
+import orjson
+from typing import List, Dict, Any, Optional, Tuple
 from langchain_core.documents import Document
 from langchain.tools import Tool
 
 from .base import BaseRetriever
+from .cache import cached_retrieval
+from .retry import http_retry, ConcurrencyLimiter
 from Researcher.utils import logger
 from Researcher.utils import config
 from Researcher.utils.lightrag_parser import parse_lightrag_response
+from Researcher.utils.http import get_async_client, aclose_async_client
+
+# LightRAG query payload fields and the retrieval parameters they are filled from
+_PAYLOAD_PARAMS = {
+    "mode": "mode",
+    "only_need_context": "only_need_context",
+    "only_need_prompt": "only_need_prompt",
+    "response_type": "response_type",
+    "top_k": "top_k",
+    "max_token_for_text_unit": "max_token",
+    "max_token_for_global_context": "max_token",
+    "max_token_for_local_context": "max_token"
+}
+
+# Request bodies are serialized with orjson, so the content type is set explicitly
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 class LightRAGRetriever(BaseRetriever):
     """
@@ -43,6 +67,8 @@ class LightRAGRetriever(BaseRetriever):
         only_need_context (bool): Whether to only return context documents
         only_need_prompt (bool): Whether to only return the prompt
         parser_config (dict): Configuration for parsing the response
+        timeout (tuple): Connect and read timeouts (seconds) for LightRAG requests
+        max_parallel (int): Maximum number of concurrent queries during batch retrieval
     """
 
     def __init__(self):
@@ -76,9 +102,40 @@ class LightRAGRetriever(BaseRetriever):
             
             # Parser configuration
             self.parser_config = self.lightrag_config.get("parser", {})
+
+            # Default request parameters, overridable per call through retrieve kwargs
+            self._defaults = {
+                "mode": self.mode,
+                "top_k": self.top_k,
+                "response_type": self.response_type,
+                "max_token": self.max_token,
+                "only_need_context": self.only_need_context,
+                "only_need_prompt": self.only_need_prompt,
+                "parser": self.parser_config
+            }
+            self._base_payload = self._payload_fields(self._defaults)
+
+            # Connection settings: keep-alive pool reused across queries to avoid
+            # paying a TCP (+TLS) handshake on every call
+            self.timeout = (
+                self.lightrag_config.get("connect_timeout", 5),
+                self.lightrag_config.get("read_timeout", 120)
+            )
+            self._session = self._create_session(self.lightrag_config.get("pool_size", 32))
+            # Async requests go through the shared pooled client (Researcher.utils.http)
+            self._async_timeout = httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+
+            # Maximum number of concurrent queries sent by batch retrieval; keep it aligned
+            # with the server's llm_model_max_async setting
+            self.max_parallel = self.lightrag_config.get("max_parallel", 4)
+
+            # Cap on the concurrent outbound requests of this retriever across all async callers
+            self._limiter = ConcurrencyLimiter(self.lightrag_config.get("max_concurrent", 8))
             
-            # Validate the connection to the LightRAG server
-            self._check_connection()
+            # The connection to the LightRAG server is validated lazily on first use (or by `warm()`)
+            # so that constructing the retriever never blocks on the network
+            self.connection_check_timeout = self.lightrag_config.get("connection_check_timeout", 2.0)
+            self._connection_checked = False
             
             logger.info(f"Initializing LightRAGRetriever with base URL: {self.base_url}")
             logger.info(f"LightRAGRetriever configuration: mode={self.mode}, top_k={self.top_k}, response_type={self.response_type}")
@@ -89,16 +146,54 @@ class LightRAGRetriever(BaseRetriever):
             logger.debug(traceback.format_exc())
             raise
     
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        """Create a pooled HTTP session retrying rate-limited and transient gateway errors."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=3, backoff_factor=0.2, backoff_jitter=0.5, status_forcelist=[429, 502, 503, 504],
+                allowed_methods=None, respect_retry_after_header=True
+            )
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     def _check_connection(self):
-        """Check if the LightRAG server is accessible."""
+        """
+        Check once if the LightRAG server is accessible.
+
+        The probe is a single attempt outside of the pooled session, whose retries would
+        multiply `connection_check_timeout` against a server that is down.
+        """
+        self._connection_checked = True
         try:
-            response = requests.get(f"{self.base_url}/documents")
+            response = requests.get(f"{self.base_url}/documents", timeout=self.connection_check_timeout)
             response.raise_for_status()
             logger.info("Successfully connected to LightRAG server")
         except requests.exceptions.RequestException as e:
             logger.warning(f"Unable to connect to LightRAG server: {e}")
             # Not raising an exception here to allow for graceful degradation
 
+    async def warm(self):
+        """
+        Check once, asynchronously, if the LightRAG server is accessible.
+
+        Applications can await it at startup so that several workers warm up in parallel
+        instead of checking the connection on their first query.
+        """
+        self._connection_checked = True
+        try:
+            response = await get_async_client().get(f"{self.base_url}/documents", timeout=self.connection_check_timeout)
+            response.raise_for_status()
+            logger.info("Successfully connected to LightRAG server")
+        except httpx.HTTPError as e:
+            logger.warning(f"Unable to connect to LightRAG server: {e}")
+            # Not raising an exception here to allow for graceful degradation
+
     @property
     def name(self) -> str:
         """
@@ -109,6 +204,56 @@ class LightRAGRetriever(BaseRetriever):
         """
         return "lightrag_retriever"
 
+    @staticmethod
+    def _payload_fields(params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill the LightRAG query payload fields (all but the query) from the retrieval parameters."""
+        payload = {field: params[param] for field, param in _PAYLOAD_PARAMS.items()}
+        payload["history_turns"] = 0
+        return payload
+
+    def _build_request(self, query: str, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Builds the LightRAG query payload and the parser configuration for a query.
+
+        Args:
+            query (str): The search query
+            kwargs (Dict[str, Any]): Parameters overriding the default settings
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Any]]: The request payload and the parser configuration
+        """
+        if not kwargs:
+            # No overrides: only the query varies, reuse the precomputed payload skeleton
+            params = self._defaults
+            payload = {"query": query, **self._base_payload}
+        else:
+            # Merge the settings once with priority:
+            # 1. lightrag_retriever specific config
+            # 2. general kwargs
+            # 3. default config values
+            params = {**self._defaults, **kwargs, **kwargs.get("lightrag_retriever", {})}
+            payload = {"query": query, **self._payload_fields(params)}
+        parser_config = params["parser"]
+
+        logger.debug("Sending LightRAG query with parameters: mode=%s, top_k=%s, response_type=%s",
+                     params["mode"], params["top_k"], params["response_type"])
+        logger.debug("Context parameters: only_need_context=%s, only_need_prompt=%s",
+                     params["only_need_context"], params["only_need_prompt"])
+
+        return payload, parser_config
+
+    def _parse_results(self, results: Dict[str, Any], parser_config: Dict[str, Any]) -> List[Document]:
+        """Parse a LightRAG JSON response into Document objects."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LightRAG response: %s", results)
+        
+        # Parse the response into Document objects using the parser
+        documents = parse_lightrag_response(results, parser_config)
+        
+        logger.info("Retrieved %d documents from LightRAG", len(documents))
+        return documents
+
+    @cached_retrieval
     def retrieve(self, query: str, **kwargs) -> List[Document]:
         """
         Retrieves information from LightRAG using the specified query.
@@ -121,60 +266,118 @@ class LightRAGRetriever(BaseRetriever):
             List[Document]: Retrieved documents with metadata
         """
         try:
-            logger.info(f"Retrieving from LightRAG for query: {query}")
-            
-            # Check for specific LightRAG configuration in kwargs
-            lightrag_specific_config = kwargs.get("lightrag_retriever", {})
-            
-            # Override settings with priority: 
-            # 1. lightrag_retriever specific config
-            # 2. general kwargs
-            # 3. default config values
-            mode = lightrag_specific_config.get("mode", kwargs.get("mode", self.mode))
-            top_k = lightrag_specific_config.get("top_k", kwargs.get("top_k", self.top_k))
-            response_type = lightrag_specific_config.get("response_type", kwargs.get("response_type", self.response_type))
-            max_token = lightrag_specific_config.get("max_token", kwargs.get("max_token", self.max_token))
-            only_need_context = lightrag_specific_config.get("only_need_context", kwargs.get("only_need_context", self.only_need_context))
-            only_need_prompt = lightrag_specific_config.get("only_need_prompt", kwargs.get("only_need_prompt", self.only_need_prompt))
-            
-            # Get parser config (merging kwargs and defaults)
-            parser_config = lightrag_specific_config.get("parser", kwargs.get("parser", self.parser_config))
-            
-            # Prepare the query payload
-            payload = {
-                "query": query,
-                "mode": mode,
-                "only_need_context": only_need_context,
-                "only_need_prompt": only_need_prompt,
-                "response_type": response_type,
-                "top_k": top_k,
-                "max_token_for_text_unit": max_token,
-                "max_token_for_global_context": max_token,
-                "max_token_for_local_context": max_token,
-                "history_turns": 0
-            }
+            logger.info("Retrieving from LightRAG for query: %s", query)
+
+            if not self._connection_checked:
+                self._check_connection()
             
-            logger.debug(f"Sending LightRG query with parameters: mode={mode}, top_k={top_k}, response_type={response_type}")
-            logger.debug(f"Context parameters: only_need_context={only_need_context}, only_need_prompt={only_need_prompt}")
+            payload, parser_config = self._build_request(query, kwargs)
             
             # Send the query to LightRAG
-            response = requests.post(f"{self.base_url}/query", json=payload)
+            response = self._session.post(
+                f"{self.base_url}/query", data=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=self.timeout
+            )
             response.raise_for_status()
-            results = response.json()
 
-            logger.debug(f"LightRAG response: {results}")
-            
-            # Parse the response into Document objects using the parser
-            documents = parse_lightrag_response(results, parser_config)
-            
-            logger.info(f"Retrieved {len(documents)} documents from LightRAG")
-            return documents
+            return self._parse_results(orjson.loads(response.content), parser_config)
+
+        except Exception as e:
+            logger.error(f"Error retrieving from LightRAG: {str(e)}")
+            logger.debug(traceback.format_exc())
+            return []
+
+    async def _aretrieve(self, query: str, **kwargs) -> List[Document]:
+        """Retrieves information from LightRAG asynchronously through the shared HTTP client."""
+        try:
+            logger.info("Retrieving from LightRAG (async) for query: %s", query)
+
+            if not self._connection_checked:
+                await self.warm()
+
+            payload, parser_config = self._build_request(query, kwargs)
+
+            response = await self._apost_query(payload)
+
+            return self._parse_results(orjson.loads(response.content), parser_config)
 
         except Exception as e:
             logger.error(f"Error retrieving from LightRAG: {str(e)}")
             logger.debug(traceback.format_exc())
             return []
 
+    @http_retry("lightrag_retriever")
+    async def _apost_query(self, payload: Dict[str, Any]) -> httpx.Response:
+        """Send a query to LightRAG, retrying rate-limited and transient failures with backoff."""
+        async with self._limiter:
+            response = await get_async_client().post(
+                f"{self.base_url}/query", content=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=self._async_timeout
+            )
+        response.raise_for_status()
+        return response
+
+    @cached_retrieval
+    async def aretrieve(self, query: str, **kwargs) -> List[Document]:
+        """
+        Asynchronously retrieves information from LightRAG using the specified query.
+        
+        Args:
+            query (str): The search query
+            **kwargs: Additional parameters that can override default settings
+            
+        Returns:
+            List[Document]: Retrieved documents with metadata
+        """
+        return await self._aretrieve(query, **kwargs)
+
+    async def abatch_retrieve(self, queries: List[str], **kwargs) -> List[List[Document]]:
+        """
+        Retrieves several queries from LightRAG concurrently.
+
+        All the queries share the pooled HTTP client and at most `max_parallel` requests
+        are in flight at once, matching the server's `llm_model_max_async` capacity.
+        Each query goes through `aretrieve`, so it reads and fills the retrieval cache.
+
+        Args:
+            queries (List[str]): The search queries
+            **kwargs: Additional parameters that can override default settings
+
+        Returns:
+            List[List[Document]]: Retrieved documents for each query, in input order
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        async def retrieve_one(query: str) -> List[Document]:
+            async with semaphore:
+                return await self.aretrieve(query, **kwargs)
+
+        return list(await asyncio.gather(*(retrieve_one(query) for query in queries)))
+
+    async def _abatch_retrieve_and_close(self, queries: List[str], **kwargs) -> List[List[Document]]:
+        """Runs a batch on a short-lived event loop, closing the loop's shared HTTP client afterwards."""
+        try:
+            return await self.abatch_retrieve(queries, **kwargs)
+        finally:
+            await aclose_async_client()
+
+    def batch_retrieve(self, queries: List[str], **kwargs) -> List[List[Document]]:
+        """
+        Retrieves several queries from LightRAG concurrently from synchronous code.
+
+        Falls back to sequential retrieval when called from within a running event loop.
+
+        Args:
+            queries (List[str]): The search queries
+            **kwargs: Additional parameters that can override default settings
+
+        Returns:
+            List[List[Document]]: Retrieved documents for each query, in input order
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._abatch_retrieve_and_close(queries, **kwargs))
+        return super().batch_retrieve(queries, **kwargs)
+
     @property
     def tool(self) -> Tool:
         """
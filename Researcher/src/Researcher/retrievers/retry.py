@@ -0,0 +1,146 @@
+"""
+Description:
+Rate-limit handling for the retrievers calling remote services (LightRAG, Tavily).
+Provides a retry decorator with exponential backoff and jitter that honors the
+`Retry-After` header of HTTP 429 responses, and a per-event-loop concurrency limiter
+capping the outbound calls of a retriever.
+
+Author: Raptopoulos Petros [petrosrapto@gmail.com]
+Date: 2025/03/10
+"""
+import asyncio
+import weakref
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+import requests
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, RetryCallState
+
+from Researcher.utils import logger  # Import the logger
+from Researcher.utils import config  # Import the Config loader
+from Researcher.utils.cache_metrics import record_retry
+
+# HTTP statuses worth retrying: rate limiting and transient server/gateway errors
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Transport-level errors worth retrying (timeouts and dropped connections)
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.TransportError, requests.Timeout, requests.ConnectionError)
+
+
+def _status_code(exception: BaseException) -> Optional[int]:
+    """Returns the HTTP status of an httpx/requests status error, or None."""
+    response = getattr(exception, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_retryable_error(exception: BaseException) -> bool:
+    """
+    Tells whether a failed call should be retried.
+
+    Both httpx and requests errors are supported: status errors are retried on 429 and
+    5xx gateway statuses, transport errors (timeouts, connection failures) always.
+    """
+    if isinstance(exception, RETRYABLE_ERRORS):
+        return True
+    return _status_code(exception) in RETRYABLE_STATUSES
+
+
+def retry_after_seconds(exception: BaseException) -> Optional[float]:
+    """
+    Returns the delay requested by the `Retry-After` header of a 429 response, if any.
+
+    The header may hold a number of seconds or an HTTP date.
+    """
+    if _status_code(exception) != 429:
+        return None
+
+    value = exception.response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class _WaitRetryAfter:
+    """
+    Tenacity wait strategy: the server's `Retry-After` delay when given, exponential jitter otherwise.
+
+    Both are capped at `max_wait`, so that a long `Retry-After` (e.g. an hour) never stalls a user request.
+    """
+
+    def __init__(self, initial: float, max_wait: float):
+        self.max_wait = max_wait
+        self.backoff = wait_exponential_jitter(initial=initial, max=max_wait)
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        exception = retry_state.outcome.exception() if retry_state.outcome else None
+        delay = retry_after_seconds(exception) if exception is not None else None
+        if delay is not None:
+            return min(delay, self.max_wait)
+        return self.backoff(retry_state)
+
+
+def http_retry(name: str):
+    """
+    Builds the retry decorator used around a retriever's outbound HTTP call.
+
+    Works on both sync and async functions. Settings are read from `retrievers.retry`
+    (`max_attempts`, `initial_wait`, `max_wait`); the last error is re-raised once the
+    attempts are exhausted so the retriever's own error handling still applies.
+    Every retry is logged and counted per retriever (`retry_stats`).
+
+    Args:
+        name (str): Name of the retriever, used in the retry logs.
+    """
+    retry_config = config.get("retrievers.retry", {})
+
+    def log_retry(retry_state: RetryCallState) -> None:
+        record_retry(name)
+        logger.warning(
+            "Retrying %s call (attempt %d) in %.2fs after error: %s",
+            name, retry_state.attempt_number, retry_state.next_action.sleep, retry_state.outcome.exception()
+        )
+
+    return retry(
+        wait=_WaitRetryAfter(retry_config.get("initial_wait", 0.2), retry_config.get("max_wait", 5)),
+        stop=stop_after_attempt(retry_config.get("max_attempts", 4)),
+        retry=lambda retry_state: retry_state.outcome.failed and is_retryable_error(retry_state.outcome.exception()),
+        before_sleep=log_retry,
+        reraise=True
+    )
+
+
+class ConcurrencyLimiter:
+    """
+    Async context manager capping the concurrent outbound calls of a retriever.
+
+    An `asyncio.Semaphore` is bound to the event loop it is first awaited on, while the
+    retrievers are shared across loops (e.g. successive `asyncio.run` calls), so one
+    semaphore is kept per running loop.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+        return semaphore
+
+    async def __aenter__(self):
+        await self._semaphore().acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore().release()
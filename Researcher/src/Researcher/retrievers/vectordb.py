@@ -9,14 +9,15 @@ Date: 2025/03/10
 """
 import os
 import traceback
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from langchain_core.documents import Document
 
 from .base import BaseRetriever
+from .cache import cached_retrieval
 from Researcher.utils import logger  # Import the logger
 from Researcher.utils import config  # Import the Config loader
 
-from langchain_openai import OpenAIEmbeddings
+from Researcher.models import get_embedding_model
 
 from langchain.tools import Tool
 
@@ -58,34 +59,19 @@ class VectorDBRetriever(BaseRetriever):
             logger.info("Initializing VectorDBRetriever with vector store: %s", self.vector_store_type)
 
             # Initialize embedding model (supports API, local, and Ollama)
-            embedding_type = self.vectordb_config.get("embedding_type", "openai").lower()
-            
-            if embedding_type == "ollama":
-                # Use Ollama embeddings (local server) - use langchain_ollama for correct API endpoint
-                from langchain_ollama import OllamaEmbeddings
-                embedding_model = self.vectordb_config.get("embedding_model", "embeddinggemma:latest")
-                ollama_base_url = self.vectordb_config.get("ollama_base_url", "http://host.docker.internal:11434")
-                logger.info(f"Using Ollama embeddings: {embedding_model} at {ollama_base_url}")
-                self.embeddings = OllamaEmbeddings(
-                    model=embedding_model,
-                    base_url=ollama_base_url
-                )
-            elif embedding_type == "local":
-                # Use local HuggingFace embeddings (no API key needed)
-                from langchain_huggingface import HuggingFaceEmbeddings
-                embedding_model = self.vectordb_config.get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2")
-                logger.info(f"Using local embeddings: {embedding_model}")
-                self.embeddings = HuggingFaceEmbeddings(model_name=embedding_model)
-            else:
-                # Use OpenAI embeddings (requires API key)
-                embedding_model = self.vectordb_config.get("embedding_model", "text-embedding-3-large")
-                embeddings_api_key = os.environ.get("EMBEDDINGS_API_KEY")
-                if not embeddings_api_key:
-                    raise ValueError("EMBEDDINGS_API_KEY is required for OpenAI embeddings. Set embedding_type: 'ollama' or 'local' in config to use local embeddings instead.")
-                self.embeddings = OpenAIEmbeddings(model=embedding_model, openai_api_key=embeddings_api_key)
+            self.embeddings = get_embedding_model(self.vectordb_config)
 
             self.top_k = self.vectordb_config.get("top_k", 5)
             self.similarity_threshold = self.vectordb_config.get("similarity_threshold", 0)
+            self.over_fetch = self.vectordb_config.get("over_fetch", 1)
+            self.page_size = self.vectordb_config.get("page_size", 1000)
+
+            # Default search parameters, overridable per call through retrieve kwargs
+            self._defaults = {
+                "k": self.top_k,
+                "similarity_threshold": self.similarity_threshold,
+                "over_fetch": self.over_fetch
+            }
 
             # Initialize the selected vector store
             if self.vector_store_type == "pinecone":
@@ -106,6 +92,7 @@ class VectorDBRetriever(BaseRetriever):
     def _init_pinecone(self):
         """Initialize Pinecone retriever using API credentials and index settings."""
         from langchain_pinecone import PineconeVectorStore
+        from pinecone import Pinecone
         
         self.api_key = os.environ.get("PINECONE_API_KEY")
         self.index_name = self.vectordb_config.get("pinecone", {}).get("INDEX_NAME")
@@ -120,6 +107,10 @@ class VectorDBRetriever(BaseRetriever):
             embedding=self.embeddings
         )
 
+        # Raw index handle used to enumerate the stored vectors (list/fetch operations)
+        self.index = Pinecone(api_key=self.api_key).Index(self.index_name, host=self.host)
+        self.text_key = self.vectordb_config.get("pinecone", {}).get("text_key", "text")
+
         logger.info("Pinecone retriever initialized with index: %s", self.index_name)
 
     def _init_chroma_db(self):
@@ -152,6 +143,58 @@ class VectorDBRetriever(BaseRetriever):
         """Returns the unique name of this retriever."""
         return "vectordb_retriever"
 
+    def iter_retrieve(self, query: str, **kwargs) -> Iterator[Document]:
+        """
+        Lazily yields the documents matching the query, most similar first.
+
+        Same search as `retrieve`, but the documents are scored and yielded one at a time, so
+        streaming consumers (e.g. a reranker) can stop early without materializing the whole
+        result list. Errors are raised to the caller and results are not cached.
+
+        Args:
+            query (str): The input search query.
+            **kwargs: The same parameters as `retrieve`.
+
+        Yields:
+            Document: The retrieved documents with their `vectordb_similarity_score`.
+        """
+        # Override the defaults (top_k, threshold, over-fetch) with the provided kwargs
+        params = {**self._defaults, **kwargs}
+        top_k = params["k"]
+        similarity_threshold = params["similarity_threshold"]
+        over_fetch = params["over_fetch"]
+
+        # Return top_k documents, or top_k * over_fetch candidates (e.g. for reranking) when
+        # the caller asks for over-fetching along with a threshold
+        fetch_k = top_k * over_fetch if similarity_threshold else top_k
+
+        # Retrieve relevant documents, reusing the caller's query embedding when provided
+        query_vector = kwargs.get("query_vector")
+        retrieved_results = None
+        if query_vector is not None:
+            retrieved_results = self._search_by_vector(query_vector, fetch_k)
+        if retrieved_results is None:
+            retrieved_results = self.vectorstore.similarity_search_with_relevance_scores(query, k=fetch_k)
+
+        for doc, score in retrieved_results[:fetch_k]:
+            # Normalize relevance scores to [0, 1] if needed.
+            # Some backends (e.g., cosine similarity) can return in [-1, 1].
+            normalized_score = score
+            if normalized_score < 0 or normalized_score > 1:
+                # Map cosine similarity [-1,1] -> [0,1]
+                normalized_score = (normalized_score + 1) / 2
+                # Clip to [0,1] to satisfy downstream consumers
+                normalized_score = max(0.0, min(1.0, normalized_score))
+
+            # Apply threshold on normalized score
+            if normalized_score < similarity_threshold:
+                continue
+
+            doc.metadata["retriever"] = self.name
+            doc.metadata["vectordb_similarity_score"] = normalized_score
+            yield doc
+
+    @cached_retrieval
     def retrieve(self, query: str, **kwargs) -> List[Document]:
         """
         Retrieves documents from the selected vector database (Pinecone or ChromaDB) 
@@ -159,10 +202,16 @@ class VectorDBRetriever(BaseRetriever):
 
         This method encodes the query as a vector and performs a **nearest neighbor search**
         in the vector database to retrieve the most relevant documents.
+        Use `iter_retrieve` to consume the documents lazily.
 
         Args:
             query (str): The input search query.
-            **kwargs: Additional parameters, such as `k` to specify the number of top results.
+            **kwargs: Additional parameters, such as `k` to specify the number of top results,
+                `similarity_threshold` to drop weak matches and `over_fetch` to retrieve
+                `k * over_fetch` candidates when a threshold is set (useful before reranking).
+                Callers that already embedded the query (e.g. for hybrid search or reranking)
+                can pass it as `query_vector` to skip the embedding call; it is excluded from
+                the cache key.
 
         Returns:
             List[Document]: A ranked list of retrieved documents.
@@ -174,30 +223,7 @@ class VectorDBRetriever(BaseRetriever):
         try:
             logger.info("Retrieving vector DB documents for query: %s", query)
 
-            # Override top_k if provided
-            top_k = kwargs.get("k", self.top_k)
-            similarity_threshold = kwargs.get("similarity_threshold", self.similarity_threshold)
-                
-            # Retrieve relevant documents
-            retrieved_results = self.vectorstore.similarity_search_with_relevance_scores(query, k=top_k)
-            documents = []
-            for doc, score in retrieved_results:
-                # Normalize relevance scores to [0, 1] if needed.
-                # Some backends (e.g., cosine similarity) can return in [-1, 1].
-                normalized_score = score
-                if normalized_score < 0 or normalized_score > 1:
-                    # Map cosine similarity [-1,1] -> [0,1]
-                    normalized_score = (normalized_score + 1) / 2
-                    # Clip to [0,1] to satisfy downstream consumers
-                    normalized_score = max(0.0, min(1.0, normalized_score))
-
-                # Apply threshold on normalized score
-                if normalized_score < similarity_threshold:
-                    continue
-
-                doc.metadata["retriever"] = self.name
-                doc.metadata["vectordb_similarity_score"] = normalized_score
-                documents.append(doc)
+            documents = list(self.iter_retrieve(query, **kwargs))
 
             logger.info("Successfully retrieved %d documents from %s", len(documents), self.vector_store_type)
             return documents
@@ -207,6 +233,98 @@ class VectorDBRetriever(BaseRetriever):
             logger.debug(traceback.format_exc())
             return []
 
+    @staticmethod
+    def _to_documents(texts: List[Optional[str]], metadatas: List[Optional[Dict[str, Any]]]) -> List[Document]:
+        """Builds the Documents of a page of stored texts/metadata, skipping the entries with None content."""
+        return [
+            Document(page_content=text, metadata=meta or {})
+            for text, meta in zip(texts, metadatas, strict=True)
+            if text is not None
+        ]
+
+    def _search_by_vector(self, query_vector: List[float], k: int) -> Optional[List[tuple]]:
+        """
+        Searches the vector store with a precomputed query embedding.
+
+        The backend scores (distances for Chroma, despite the name of its by-vector method) are
+        converted to relevance scores with the store's own relevance function, matching
+        `similarity_search_with_relevance_scores`.
+        LangChain only exposes that function privately; when the installed store does not
+        provide it, None is returned and the caller falls back to the query search.
+        """
+        try:
+            relevance_score_fn = self.vectorstore._select_relevance_score_fn()
+        except (AttributeError, NotImplementedError) as e:
+            logger.warning("No relevance function for %s, searching by query instead: %s", self.vector_store_type, str(e))
+            return None
+
+        if self.vector_store_type == "chroma":
+            results = self.vectorstore.similarity_search_by_vector_with_relevance_scores(query_vector, k=k)
+        else:
+            results = self.vectorstore.similarity_search_by_vector_with_score(query_vector, k=k)
+
+        return [(doc, relevance_score_fn(score)) for doc, score in results]
+
+    def iter_all_documents(self) -> Iterator[Document]:
+        """
+        Lazily yields **all stored documents** from the selected vector database (Pinecone or ChromaDB).
+
+        Both stores are read in pages of `page_size` documents (at most 100 for Pinecone's list
+        operation), so peak memory is bounded by a single page instead of the whole corpus.
+
+        Yields:
+            Document: The stored documents, one at a time.
+
+        Raises:
+            Exception: A failure of the vector store, possibly after some pages were yielded.
+
+        Logs:
+            - Logs the number of documents retrieved.
+        """
+        logger.info("Fetching all documents from %s index: %s", self.vector_store_type, self.index_name)
+
+        count = 0
+        skipped = 0
+        if self.vector_store_type == "pinecone":
+            # Enumerate the vector IDs natively and fetch their metadata page by page
+            pagination_token = None
+            while True:
+                page = self.index.list_paginated(limit=min(self.page_size, 100), pagination_token=pagination_token)
+                ids = [vector.id for vector in page.vectors]
+                if ids:
+                    fetched = self.index.fetch(ids=ids).vectors
+                    metadatas = [dict(getattr(fetched.get(vector_id), "metadata", None) or {}) for vector_id in ids]
+                    texts = [meta.pop(self.text_key, None) for meta in metadatas]
+                    page_documents = self._to_documents(texts, metadatas)
+                    count += len(page_documents)
+                    skipped += len(ids) - len(page_documents)
+                    yield from page_documents
+
+                pagination_token = page.pagination.next if page.pagination else None
+                if not pagination_token:
+                    break
+        elif self.vector_store_type == "chroma":
+            offset = 0
+            while True:
+                batch = self.vectorstore.get(limit=self.page_size, offset=offset, include=["documents", "metadatas"])
+                documents = batch["documents"]  # List of document texts
+                if not documents:
+                    break
+                metadata = batch["metadatas"]   # List of metadata dictionaries
+
+                page_documents = self._to_documents(documents, metadata)
+                count += len(page_documents)
+                skipped += len(documents) - len(page_documents)
+                yield from page_documents
+
+                offset += len(documents)
+        else:
+            raise ValueError(f"Unsupported vector store type: {self.vector_store_type}")
+
+        if skipped:
+            logger.warning("Skipped %d documents with None content", skipped)
+        logger.info("Fetched %d documents from %s", count, self.vector_store_type)
+
     def fetch_all_documents(self) -> List[Document]:
         """
         Fetches **all stored documents** from the selected vector database (Pinecone or ChromaDB).
@@ -216,35 +334,14 @@ class VectorDBRetriever(BaseRetriever):
         - **Retrieval debugging** (checking what documents are indexed).
         - **Refreshing document metadata**.
 
-        Returns:
-            List[Document]: A list of all stored documents.
+        Prefer `iter_all_documents` when the documents can be consumed one at a time.
 
-        Logs:
-            - Logs the number of documents retrieved.
+        Returns:
+            List[Document]: A list of all stored documents, or an empty list if any page
+            fails to load (never a truncated corpus).
         """
         try:
-            logger.info("Fetching all documents from %s index: %s", self.vector_store_type, self.index_name)
-
-            if self.vector_store_type == "pinecone":
-                all_docs = self.invoke(" ", k=10000)
-            elif self.vector_store_type == "chroma":
-                all_docs = self.vectorstore.get()
-                documents = all_docs["documents"]  # List of document texts
-                metadata = all_docs["metadatas"]   # List of metadata dictionaries
-                all_docs = []
-                
-                # Filter out None or empty document texts
-                for text, meta in zip(documents, metadata):
-                    if text is not None:  # Skip documents with None content
-                        all_docs.append(Document(page_content=text, metadata=meta or {}))
-                    else:
-                        logger.warning("Skipping document with None content")
-            else:
-                raise ValueError(f"Unsupported vector store type: {self.vector_store_type}")
-
-            logger.info("Fetched %d documents from %s", len(all_docs), self.vector_store_type)
-            return all_docs
-
+            return list(self.iter_all_documents())
         except Exception as e:
             logger.error("Error fetching documents from %s: %s", self.vector_store_type, str(e))
             logger.debug(traceback.format_exc())
@@ -42,17 +42,35 @@ Date: 7.3.2025
 """
 
 import os
+import logging
 import traceback
-from typing import List
+from operator import itemgetter
+from typing import List, Tuple
 from langchain_core.documents import Document
 from langchain_community.tools.tavily_search import TavilySearchResults
+from langchain_community.utilities.tavily_search import TAVILY_API_URL
 
 from .base import BaseRetriever
+from .cache import cached_retrieval
+from .retry import http_retry, ConcurrencyLimiter
 from Researcher.utils import logger  # Import the logger
+from Researcher.utils import preview_documents
 from Researcher.utils import config  # Import the Config loader
+from Researcher.utils.http import get_async_client
 
 from langchain.tools import Tool    
 
+_result_getter = itemgetter("content", "url", "title")
+
+
+def _result_fields(result: dict) -> Tuple[str, str, str]:
+    """Returns the (content, url, title) of a search result, tolerating missing keys."""
+    try:
+        return _result_getter(result)
+    except KeyError:
+        return result.get("content", ""), result.get("url", ""), result.get("title", "")
+
+
 class WebRetriever(BaseRetriever):
     """
     A retriever that searches the web for information **in real-time** using Tavily or another search API.
@@ -92,6 +110,9 @@ class WebRetriever(BaseRetriever):
             self.max_results = web_config.get("max_results", 5)
             self.tavily_api_key = os.environ.get("TAVILY_API_KEY")
 
+            # Cap on the concurrent outbound searches across all async callers
+            self._limiter = ConcurrencyLimiter(web_config.get("max_concurrent", 8))
+
             # Log retriever configuration
             logger.info("Initializing WebRetriever with config: %s", web_config)
 
@@ -117,6 +138,7 @@ class WebRetriever(BaseRetriever):
         """
         return "web_retriever"
 
+    @cached_retrieval
     def retrieve(self, query: str, **kwargs) -> List[Document]:
         """
         Retrieves **real-time web documents** using a search engine API.
@@ -144,24 +166,15 @@ class WebRetriever(BaseRetriever):
             logger.info("Retrieving web documents for query: %s", query)
 
             # Perform web search
-            search_results = self.search_client.invoke({"query": query, "max_results": max_results})
+            search_results = self._search(query, max_results)
 
             logger.info("Successfully retrieved %d web documents", len(search_results))
 
             # Convert search results to LangChain Document format
-            documents = [
-                Document(
-                    page_content=doc.get("content", ""),
-                    metadata={
-                        "source": doc.get("url", ""),
-                        "title": doc.get("title", ""),
-                        "retriever": self.name
-                    }
-                )
-                for doc in search_results
-            ]
-
-            logger.info("Documents retrieved: %s", str(documents))
+            documents = self._to_documents(search_results)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Documents retrieved: %s", preview_documents(documents))
             
             return documents
 
@@ -170,6 +183,72 @@ class WebRetriever(BaseRetriever):
             logger.debug(traceback.format_exc())
             return []
 
+    def _to_documents(self, search_results: List[dict]) -> List[Document]:
+        """Converts Tavily search results (content, url, title) to LangChain Documents."""
+        name = self.name
+        return [
+            Document(page_content=content or "", metadata={"source": url or "", "title": title or "", "retriever": name})
+            for content, url, title in map(_result_fields, search_results)
+        ]
+
+    @http_retry("web_retriever")
+    def _search(self, query: str, max_results: int) -> List[dict]:
+        """
+        Runs the search through the Tavily API wrapper, retrying rate-limited and transient failures.
+
+        The wrapper is called directly because the Tavily tool turns API errors into a string result.
+        """
+        api_wrapper = self.search_client.api_wrapper
+        raw_results = api_wrapper.raw_results(query, max_results=max_results, search_depth=self.search_client.search_depth)
+        return api_wrapper.clean_results(raw_results["results"])
+
+    @http_retry("web_retriever")
+    async def _asearch(self, query: str, max_results: int) -> List[dict]:
+        """
+        Runs the search against the Tavily REST API through the shared async HTTP client,
+        retrying rate-limited and transient failures.
+        """
+        api_wrapper = self.search_client.api_wrapper
+        async with self._limiter:
+            response = await get_async_client().post(
+                f"{TAVILY_API_URL}/search",
+                json={
+                    "api_key": api_wrapper.tavily_api_key.get_secret_value(),
+                    "query": query,
+                    "max_results": max_results,
+                    "search_depth": self.search_client.search_depth
+                }
+            )
+        response.raise_for_status()
+        return api_wrapper.clean_results(response.json()["results"])
+
+    @cached_retrieval
+    async def aretrieve(self, query: str, **kwargs) -> List[Document]:
+        """
+        Asynchronously retrieves web documents, with at most `max_concurrent` searches in flight.
+
+        Args:
+            query (str): The input search query.
+            **kwargs: Additional parameters, such as `max_results` for limiting results.
+
+        Returns:
+            List[Document]: A **list of retrieved web documents**.
+        """
+        try:
+            max_results = kwargs.get("max_results", self.max_results)
+
+            logger.info("Retrieving web documents (async) for query: %s", query)
+
+            documents = self._to_documents(await self._asearch(query, max_results))
+
+            logger.info("Successfully retrieved %d web documents", len(documents))
+            return documents
+
+        except Exception as e:
+            logger.error("Error retrieving from the web: %s", str(e))
+            logger.debug(traceback.format_exc())
+            return []
+
     @property
     def tool(self) -> Tool:
         """
@@ -7,17 +7,96 @@ WikipediaRetriever with configurable document limits and search parameters.
 Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
+import functools
+import logging
+import threading
 import traceback
-from typing import List
+import requests
+from concurrent.futures import ThreadPoolExecutor
+import wikipedia
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Optional
 from langchain_core.documents import Document
 from langchain_community.retrievers import WikipediaRetriever as LangChainWikipediaRetriever
+from langchain_community.utilities.wikipedia import WIKIPEDIA_MAX_QUERY_LENGTH
 
 from .base import BaseRetriever
+from .cache import cached_retrieval, SemanticCache
+from Researcher.models import get_embedding_model
 from Researcher.utils import logger  # Import the logger
+from Researcher.utils import preview_documents
 from Researcher.utils import config  # Import the Config loader
+from Researcher.utils.cache_metrics import RETRIEVAL_SEMANTIC
 
 from langchain.tools import Tool    
 
+DEFAULT_USER_AGENT = "LegalAIResearcher/1.0 (https://github.com/medmac01/legal_ai_backend)"
+
+_session_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+
+class _MediaWikiSession(requests.Session):
+    """
+    Session sending the `wikipedia` package's requests over HTTPS.
+
+    The package targets `http://{lang}.wikipedia.org/w/api.php` (and `set_lang` resets it
+    to http), which Wikipedia redirects to https, an extra round trip for every call.
+    """
+
+    def request(self, method, url, *args, **kwargs):
+        if isinstance(url, str) and url.startswith("http://"):
+            url = "https://" + url[len("http://"):]
+        return super().request(method, url, *args, **kwargs)
+
+
+def _install_shared_session(user_agent: str) -> requests.Session:
+    """
+    Routes the MediaWiki API calls of the `wikipedia` package through one pooled keep-alive session.
+
+    The package calls `requests.get` for every request (a new TCP+TLS connection each time),
+    so its module-level `requests` reference is replaced by a shared `requests.Session`,
+    retrying rate-limited and transient failures and upgrading the package's http URLs to https.
+    A descriptive User-Agent is set as required by the Wikimedia API policy.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            session = _MediaWikiSession()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = user_agent
+            wikipedia.set_user_agent(user_agent)  # The package sends its own User-Agent header per request
+            wikipedia.wikipedia.requests = session
+            _session = session
+        return _session
+
+
+@functools.lru_cache(maxsize=8)
+def _get_langchain_retriever(
+    top_k_results: int, lang: str, load_all_available_meta: bool, doc_content_chars_max: int
+) -> LangChainWikipediaRetriever:
+    """
+    Returns a shared LangChain WikipediaRetriever for the given settings.
+
+    Queries overriding the number of documents get their own instance instead of
+    mutating `top_k_results` on a retriever that concurrent queries are using.
+    """
+    return LangChainWikipediaRetriever(
+        top_k_results=top_k_results,
+        lang=lang,
+        load_all_available_meta=load_all_available_meta,
+        doc_content_chars_max=doc_content_chars_max
+    )
+
+
 class WikipediaRetriever(BaseRetriever):
     """Retriever that searches Wikipedia for information using LangChain's WikipediaRetriever."""
     
@@ -31,17 +110,29 @@ class WikipediaRetriever(BaseRetriever):
             self.load_all_available_meta = wiki_config.get("load_all_available_meta", True)
             self.doc_content_chars_max = wiki_config.get("doc_content_chars_max", 100000)
 
+            # Semantic cache tier (exact repeats are served by the shared retrieval cache);
+            # the embedding model is loaded on first use
+            self.cache_config = wiki_config.get("cache", {})
+            self._semantic_cache: Optional[SemanticCache] = None
+            self._semantic_cache_enabled = self.cache_config.get("semantic", False)
+
             # Log configuration loading
             logger.info("Initializing WikipediaRetriever with config: %s", wiki_config)
 
-            # Initialize the LangChain WikipediaRetriever
-            self.retriever = LangChainWikipediaRetriever(
-                top_k_results=self.load_max_docs,
-                lang=self.lang,
-                load_all_available_meta=self.load_all_available_meta,
-                doc_content_chars_max=self.doc_content_chars_max
+            # Reuse pooled connections to the MediaWiki API across queries
+            _install_shared_session(wiki_config.get("user_agent", DEFAULT_USER_AGENT))
+
+            # Pool fetching the pages of a query concurrently (the wikipedia client is blocking)
+            self._executor = ThreadPoolExecutor(
+                max_workers=wiki_config.get("max_parallel", 4), thread_name_prefix="wikipedia"
             )
 
+            # Keep the fetched pages (and the metadata they load lazily) across queries
+            self._fetch_page = functools.lru_cache(maxsize=wiki_config.get("page_cache_size", 128))(self._fetch_page)
+
+            # Initialize the LangChain WikipediaRetriever
+            self.retriever = self._get_retriever(self.load_max_docs)
+
         except Exception as e:
             logger.error("Error initializing WikipediaRetriever: %s", str(e))
             logger.debug(traceback.format_exc())
@@ -51,8 +142,61 @@ class WikipediaRetriever(BaseRetriever):
         """Return the unique name of this retriever."""
         return "wikipedia_retriever"
 
+    def _get_semantic_cache(self) -> Optional[SemanticCache]:
+        """Returns the semantic cache, creating it on first use, or None if it is disabled."""
+        if self._semantic_cache is None and self._semantic_cache_enabled:
+            try:
+                # Embed with the same model as the vector database unless configured otherwise
+                embeddings = get_embedding_model(self.cache_config.get("embedding", config.get("retrievers.vectordb", {})))
+                self._semantic_cache = SemanticCache(
+                    embeddings.embed_query,
+                    threshold=self.cache_config.get("similarity_threshold", 0.85),
+                    maxsize=self.cache_config.get("maxsize", 256),
+                    ann_min_size=self.cache_config.get("ann_min_size", 2048),
+                    quantize=self.cache_config.get("quantize", False),
+                    layer=RETRIEVAL_SEMANTIC
+                )
+            except Exception as e:
+                logger.error("Error initializing the Wikipedia semantic cache, disabling it: %s", str(e))
+                logger.debug(traceback.format_exc())
+                self._semantic_cache_enabled = False
+        return self._semantic_cache
+
+    def _get_retriever(self, load_max_docs: int) -> LangChainWikipediaRetriever:
+        """Returns the LangChain retriever loading `load_max_docs` documents with this retriever's settings."""
+        return _get_langchain_retriever(load_max_docs, self.lang, self.load_all_available_meta, self.doc_content_chars_max)
+
+    def _fetch_page(self, page_title: str):
+        """Fetches one Wikipedia page, or None if it is missing or ambiguous (cached per retriever)."""
+        return self.retriever._fetch_page(page_title)
+
+    def _load_page(self, page_title: str) -> Optional[Document]:
+        """Fetches one Wikipedia page (content and metadata) as a Document, or None if it is unavailable."""
+        wiki_page = self._fetch_page(page_title)
+        if not wiki_page:
+            return None
+        return self.retriever._page_to_document(page_title, wiki_page)
+
+    def _load_documents(self, query: str, retriever: LangChainWikipediaRetriever) -> List[Document]:
+        """
+        Searches Wikipedia and loads the matching pages concurrently.
+
+        Same documents as LangChain's WikipediaRetriever, but the pages (and, with
+        `load_all_available_meta`, their metadata requests) are fetched in parallel
+        instead of one after the other.
+        """
+        top_k_results = retriever.top_k_results
+        page_titles = retriever.wiki_client.search(query[:WIKIPEDIA_MAX_QUERY_LENGTH], results=top_k_results)
+        documents = self._executor.map(self._load_page, page_titles[:top_k_results])
+        return [doc for doc in documents if doc is not None]
+
+    @cached_retrieval
     def retrieve(self, query: str, **kwargs) -> List[Document]:
         """Retrieve information as LangChain Document objects.
+
+        Exact repeats of a query are served by the retrieval cache; when the semantic cache
+        is enabled (`retrievers.wikipedia.cache`), near-identical queries reuse the documents
+        of the most similar previous query.
         
         Args:
             query: The search query
@@ -64,22 +208,36 @@ class WikipediaRetriever(BaseRetriever):
         try:
             # Override with any provided parameters
             load_max_docs = kwargs.get("load_max_docs", self.load_max_docs)
-
-            # Update retriever config if needed
-            if load_max_docs != self.retriever.top_k_results:
-                self.retriever.top_k_results = load_max_docs
-                logger.info("Updated top_k_results to: %d", load_max_docs)
+            retriever = self.retriever if load_max_docs == self.load_max_docs else self._get_retriever(load_max_docs)
 
             logger.info("Retrieving Wikipedia documents for query: %s", query)
 
+            # Look for a semantically similar previous query with the same parameters
+            semantic_cache = self._get_semantic_cache()
+            scope = (load_max_docs, self.lang)
+            query_vector = None
+            if semantic_cache is not None:
+                try:
+                    query_vector = semantic_cache.embed_query(query)
+                    cached = semantic_cache.get(query, scope, query_vector)
+                    if cached is not None:
+                        logger.info("Returning %d Wikipedia documents from the semantic cache", len(cached))
+                        return cached
+                except Exception as e:
+                    logger.warning("Wikipedia semantic cache lookup failed: %s", str(e))
+
             # Perform search
-            documents = self.retriever.invoke(query)
+            documents = self._load_documents(query, retriever)
 
             for doc in documents:
                 doc.metadata["retriever"] = self.name
 
+            if query_vector is not None:
+                semantic_cache.set(query, documents, scope, query_vector)
+
             logger.info("Successfully retrieved %d documents", len(documents))
-            logger.info("Documents retrieved: %s", str(documents))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Documents retrieved: %s", preview_documents(documents))
 
             return documents
 
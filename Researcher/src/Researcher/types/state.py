@@ -9,10 +9,11 @@ Date: 2025/03/10
 """
 from typing import TypedDict, List, Dict, Any, Optional
 from typing import Annotated
-import operator
 from langchain_core.documents import Document
 from langgraph.graph import MessagesState
 
+from Researcher.utils.documents import merge_documents
+
 class RetrievalState(MessagesState):
     """State type for the Researcher agent.
     
@@ -27,8 +28,8 @@ class RetrievalState(MessagesState):
     instructions: Optional[str]
     
     # Documents retrieved from multiple sources
-    # Will be combined when updated by parallel nodes
-    retrievedDocuments: Annotated[Optional[List[Document]], operator.add]
+    # Will be combined (without duplicates) when updated by parallel nodes
+    retrievedDocuments: Annotated[Optional[List[Document]], merge_documents]
     responseContext: List[Document] # the list of documents feeded to the response generator
     # Response information
     response: Optional[str]
@@ -8,25 +8,64 @@ Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
 
-from .formatters import format_documents, sanitize_with_bleach, extract_texts_from_json
-from .prompts import (
-    RAG_SYSTEM_PROMPT,
-    RAG_HUMAN_PROMPT,
-    SEARCH_QUERY_PROMPT
-)
-from .lightrag_parser import parse_lightrag_response
+import importlib
 
 from .logging import logger
 from .config import config
 
+# Helpers imported on first access (PEP 562), so that importing the logger or the
+# config does not load the formatters, prompts and parsers
+_LAZY_ATTRIBUTES = {
+    "format_documents": "formatters",
+    "sanitize_with_bleach": "formatters",
+    "extract_texts_from_json": "formatters",
+    "RAG_SYSTEM_PROMPT": "prompts",
+    "RAG_HUMAN_PROMPT": "prompts",
+    "SEARCH_QUERY_PROMPT": "prompts",
+    "SEARCH_QUERY_HEADER": "prompts",
+    "SEARCH_QUERY_EXAMPLES": "prompts",
+    "SEARCH_QUERY_PROMPT_PREFIX": "prompts",
+    "SEARCH_QUERY_PROMPT_SUFFIX": "prompts",
+    "render_search_query": "prompts",
+    "render_search_query_suffix": "prompts",
+    "render_rag_human_prompt": "prompts",
+    "parse_lightrag_response": "lightrag_parser",
+    "deduplicate_by_content": "documents",
+    "merge_documents": "documents",
+    "preview_documents": "documents",
+}
+
+def __getattr__(name):
+    """Import a lazy helper from its submodule on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later accesses skip __getattr__
+    return value
+
+def __dir__():
+    """List the lazy helpers along with the loaded attributes."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 __all__ = [
     "format_documents",
     "RAG_SYSTEM_PROMPT",
     "RAG_HUMAN_PROMPT",
     "SEARCH_QUERY_PROMPT",
+    "SEARCH_QUERY_HEADER",
+    "SEARCH_QUERY_EXAMPLES",
+    "SEARCH_QUERY_PROMPT_PREFIX",
+    "SEARCH_QUERY_PROMPT_SUFFIX",
+    "render_search_query",
+    "render_search_query_suffix",
+    "render_rag_human_prompt",
     "logger",
     "config",
     "sanitize_with_bleach",
     "extract_texts_from_json",
-    "parse_lightrag_response"
+    "parse_lightrag_response",
+    "deduplicate_by_content",
+    "merge_documents",
+    "preview_documents"
 ]
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Description:
+Hit/miss counters for the caching layers of the Researcher agent (retrieval cache,
+semantic caches, response cache, provider prompt cache), retrieval latencies and the
+retries of rate-limited or failing remote calls. The counts are always kept in-process
+(see `cache_stats` and `retry_stats`) and are also exported as Prometheus metrics when
+the optional `prometheus_client` package is installed.
+
+Author: Raptopoulos Petros [petrosrapto@gmail.com]
+Date: 2025/03/10
+"""
+import threading
+from collections import defaultdict
+from typing import Dict
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:  # prometheus_client is optional, only the in-process counts are kept
+    Counter = Histogram = None
+
+# Cache layers reported by the agent
+RETRIEVAL = "retrieval"
+RETRIEVAL_SEMANTIC = "retrieval_semantic"
+RESPONSE = "response"
+RESPONSE_SEMANTIC = "response_semantic"
+PROMPT = "prompt"
+
+if Counter is not None:
+    _CACHE_HITS = Counter("researcher_cache_hits_total", "Lookups served from a cache layer", ["layer"])
+    _CACHE_MISSES = Counter("researcher_cache_misses_total", "Lookups missing a cache layer", ["layer"])
+    _PROMPT_CACHE_TOKENS = Counter(
+        "researcher_prompt_cache_tokens_total", "Input tokens read from or written to the provider prompt cache", ["kind"]
+    )
+    _RETRIES = Counter("researcher_retries_total", "Retried outbound calls of a retriever", ["retriever"])
+    _RETRIEVAL_LATENCY = Histogram(
+        "researcher_retrieval_latency_seconds", "Duration of the retrievals not served from the cache", ["retriever"],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    )
+
+_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+_retries: Dict[str, int] = defaultdict(int)
+_counts_lock = threading.Lock()
+
+
+def record_cache_lookup(layer: str, hit: bool) -> None:
+    """Counts one lookup of a cache layer, served from the cache (`hit`) or not."""
+    with _counts_lock:
+        _counts[layer]["hits" if hit else "misses"] += 1
+    if Counter is not None:
+        (_CACHE_HITS if hit else _CACHE_MISSES).labels(layer=layer).inc()
+
+
+def record_prompt_cache_tokens(read: int, written: int) -> None:
+    """Counts the input tokens of one LLM call read from (`read`) or written to (`written`) the prompt cache."""
+    record_cache_lookup(PROMPT, read > 0)
+    if Counter is not None:
+        _PROMPT_CACHE_TOKENS.labels(kind="read").inc(read)
+        _PROMPT_CACHE_TOKENS.labels(kind="write").inc(written)
+
+
+def record_retry(retriever: str) -> None:
+    """Counts one retry of an outbound call made by `retriever` (e.g. after a 429)."""
+    with _counts_lock:
+        _retries[retriever] += 1
+    if Counter is not None:
+        _RETRIES.labels(retriever=retriever).inc()
+
+
+def observe_retrieval_latency(retriever: str, seconds: float) -> None:
+    """Records the duration of a retrieval performed by `retriever`."""
+    if Histogram is not None:
+        _RETRIEVAL_LATENCY.labels(retriever=retriever).observe(seconds)
+
+
+def cache_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Returns the in-process counts of every cache layer looked up so far.
+
+    Returns:
+        Dict[str, Dict[str, float]]: `{layer: {"hits": ..., "misses": ..., "hit_rate": ...}}`.
+    """
+    with _counts_lock:
+        return {
+            layer: dict(counts, hit_rate=counts["hits"] / ((counts["hits"] + counts["misses"]) or 1))
+            for layer, counts in _counts.items()
+        }
+
+
+def retry_stats() -> Dict[str, int]:
+    """Returns the in-process number of retries of each retriever so far."""
+    with _counts_lock:
+        return dict(_retries)
+
+
+def reset_cache_stats() -> None:
+    """Drops the in-process counts (the Prometheus counters are cumulative and are kept)."""
+    with _counts_lock:
+        _counts.clear()
+        _retries.clear()
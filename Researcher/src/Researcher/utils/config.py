@@ -7,10 +7,19 @@ environments (development, installed package, etc.).
 Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
+import functools
 import yaml
-import os
 from pathlib import Path
-import pkg_resources  # Import to locate installed package data
+from importlib.resources import files  # Locate installed package data without scanning every distribution
+
+try:
+    # libyaml bindings parse several times faster than the pure-Python loader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Marks a key that is missing from the configuration (or set to an empty value)
+_MISSING = object()
 
 class Config:
     _instance = None  # Singleton instance
@@ -23,6 +32,9 @@ class Config:
 
     def _load_config(self):
         """Load configuration from config.yaml, handling different execution environments."""
+        # Resolved values are only valid for the configuration they were read from
+        self._get_raw.cache_clear()
+
         # Define config file paths in order of precedence
         config_paths = [
             Path.cwd() / "config.researcher.yaml",           # CWD alternative naming
@@ -31,16 +43,17 @@ class Config:
             Path("/app/API/config.researcher.yaml"),         # API directory with specific name
         ]
         
-        # Try pkg_resources first (for installed packages)
+        # Try the package data first (for installed packages)
         try:
-            pkg_config_path = pkg_resources.resource_filename("Researcher", "config.yaml")
-            if os.path.exists(pkg_config_path):
-                config_paths.insert(0, Path(pkg_config_path))
+            pkg_config_path = files("Researcher") / "config.yaml"
+            if pkg_config_path.is_file():
+                config_paths.insert(0, Path(str(pkg_config_path)))
         except Exception:
             pass
         
         # Try each path until we find one that exists
         config_path = None
+        self.config_path = None
         for path in config_paths:
             if path.exists():
                 config_path = path
@@ -56,24 +69,34 @@ class Config:
         
         try:
             with open(config_path, "r") as file:
-                self.config = yaml.safe_load(file)
-            print(f"[INFO] Successfully loaded config from {config_path}")
+                self.config = yaml.load(file.read(), Loader=_YamlLoader)
+            # Reported by the logger once it is set up from this configuration
+            self.config_path = config_path
         except Exception as e:
             print(f"[ERROR] Failed to load config from {config_path}: {e}")
             self.config = {}
 
-    def get(self, key, default=None):
-        """Retrieve nested configuration values using dot notation."""
-        keys = key.split(".")
+    @functools.lru_cache(maxsize=None)
+    def _get_raw(self, key):
+        """
+        Resolve a dotted key once; the configuration is never mutated after loading.
+
+        Returns `_MISSING` instead of a default so that callers passing different
+        (often mutable) defaults share the same cache entry.
+        """
         current = self.config
 
-        for k in keys:
+        for k in key.split("."):
             if not isinstance(current, dict):
-                return default
+                return _MISSING
             current = current.get(k, {})
 
-        return current if current else default
+        return current if current else _MISSING
+
+    def get(self, key, default=None):
+        """Retrieve nested configuration values using dot notation."""
+        value = self._get_raw(key)
+        return default if value is _MISSING else value
 
 # Global instance
-config = Config()
-print("[DEBUG] Full config:", config.config)
\ No newline at end of file
+config = Config()
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Description:
+Helpers operating on lists of LangChain Documents, such as removing the duplicates
+returned by several retrievers for the same query.
+
+Author: Raptopoulos Petros [petrosrapto@gmail.com]
+Date: 2025/03/10
+"""
+import hashlib
+from typing import Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional, fall back to hashlib
+    xxhash = None
+
+
+def content_hash(text: str) -> int:
+    """
+    Returns a 128-bit hash of a document content.
+
+    Uses xxh3_128 when `xxhash` is installed, and a 16-byte blake2b digest otherwise.
+    The width makes a collision (which would silently drop a distinct document) negligible.
+    """
+    data = text.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_128_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), "big")
+
+
+def deduplicate_by_content(documents: Iterable[Document]) -> List[Document]:
+    """
+    Removes the documents whose content was already seen, keeping the first occurrence.
+
+    Args:
+        documents (Iterable[Document]): Documents merged from one or more retrievers.
+
+    Returns:
+        List[Document]: The documents with exact content duplicates removed, in input order.
+    """
+    seen = set()
+    unique = []
+    for doc in documents:
+        key = content_hash(doc.page_content)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(doc)
+    return unique
+
+
+def document_key(doc: Document) -> Tuple[str, int]:
+    """Returns the identity of a document across retrievers: its source and content hash."""
+    return doc.metadata.get("source", ""), content_hash(doc.page_content)
+
+
+def merge_documents(existing: Optional[List[Document]], new: Optional[List[Document]]) -> List[Document]:
+    """
+    State reducer merging the documents returned by parallel retriever nodes.
+
+    Unlike a plain list concatenation, a document whose source and content were already
+    merged is not added again. Neither input list is modified.
+
+    Args:
+        existing (Optional[List[Document]]): The documents already in the state.
+        new (Optional[List[Document]]): The documents returned by a node.
+
+    Returns:
+        List[Document]: The existing documents followed by the new, unseen ones.
+    """
+    if not new:
+        return existing or []
+    if not existing:
+        existing = []
+
+    seen = {document_key(doc) for doc in existing}
+    merged = list(existing)
+    for doc in new:
+        key = document_key(doc)
+        if key not in seen:
+            seen.add(key)
+            merged.append(doc)
+    return merged
+
+
+def preview_documents(documents: List[Document], limit: int = 3, max_chars: int = 200) -> str:
+    """
+    Returns a short, log-friendly preview of a list of documents.
+
+    Only the first `limit` documents are shown, each truncated to `max_chars` characters,
+    so that logging a retrieval never stringifies whole corpora.
+
+    Args:
+        documents (List[Document]): The documents to preview.
+        limit (int): Maximum number of documents shown.
+        max_chars (int): Maximum number of content characters shown per document.
+
+    Returns:
+        str: The preview.
+    """
+    previews = [
+        f"[{doc.metadata.get('source', '')}] {doc.page_content[:max_chars]!r}"
+        for doc in documents[:limit]
+    ]
+    if len(documents) > limit:
+        previews.append(f"... (+{len(documents) - limit} more)")
+    return "; ".join(previews)
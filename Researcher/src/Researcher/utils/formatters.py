@@ -10,27 +10,107 @@ Date: 2025/03/10
 from typing import Dict, Any, List, Optional, Union
 
 from langchain_core.documents import Document
+from collections import OrderedDict
+import html
 import re
-import bleach
+import threading
+
+try:
+    from orjson import loads as _loads, JSONDecodeError
+except ImportError:
+    from json import loads as _loads, JSONDecodeError
+
+# Value of the "text" fields of a (possibly invalid) JSON string, compiled once at import
+_TEXT_FIELD_RE = re.compile(r'"text":\s*"(.*?)(?="\s*})', re.DOTALL)
+
+# HTML/XML tags and comments (a "<" not followed by a tag name, as in "a < b", is kept)
+_TAG_RE = re.compile(r'<!--.*?-->|</?[A-Za-z][^<>]*>', re.DOTALL)
+
+# Formatted context of the most recent document sets (the same documents are formatted again
+# across generation retries), keyed by every document field that appears in the output
+_FORMAT_CACHE_SIZE = 128
+_format_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_format_cache_lock = threading.Lock()
 
 def sanitize_with_bleach(s):
     """
-    Use bleach library to clean HTML/XML-like content from strings.
+    Clean HTML/XML-like content from strings.
+
+    Strips the tags (keeping their text) with a compiled pattern and decodes HTML entities,
+    instead of building a full html5lib tree with bleach for each string.
     """
     # Strip all HTML tags
-    return bleach.clean(s, tags=[], strip=True)
+    return html.unescape(_TAG_RE.sub('', s))
+
+def _repair_json_strings(raw_json_string):
+    """
+    Escape the unescaped quotes and raw line breaks found inside JSON strings.
+
+    A quote inside a string is taken as its closing quote only when the next
+    non-blank character can follow a JSON string (`,` `:` `}` `]` or the end).
+    """
+    repaired = []
+    in_string = escaped = False
+    length = len(raw_json_string)
+
+    for i, char in enumerate(raw_json_string):
+        if not in_string:
+            in_string = char == '"'
+        elif escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '"':
+            j = i + 1
+            while j < length and raw_json_string[j] in ' \t\r\n':
+                j += 1
+            if j == length or raw_json_string[j] in ',:}]':
+                in_string = False
+            else:
+                char = '\\"'
+        elif char in '\r\n\t':
+            char = ' '
+        repaired.append(char)
+
+    return ''.join(repaired)
+
+def _collect_texts(data):
+    """Collect the string "text" values of every object of a parsed JSON value, in document order."""
+    texts = []
+    stack = [data]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            text = node.get("text")
+            if isinstance(text, str):
+                texts.append(text)
+            stack.extend(reversed(node.values()))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+    return texts
 
 def extract_texts_from_json(raw_json_string):
     """Extract text fields from JSON with potentially invalid quote escaping."""
     
-    # Method 1: Using regex directly (most robust for this specific case)
+    # Method 1: Parse the JSON, repairing the quote escaping and line breaks of its strings if needed
+    texts = None
+    for candidate in (raw_json_string, _repair_json_strings(raw_json_string)):
+        try:
+            texts = _collect_texts(_loads(candidate))
+            break
+        except JSONDecodeError:
+            continue
+
+    # Method 2: Using regex directly when the JSON cannot be repaired
     # This finds all text fields regardless of JSON validity
-    text_pattern = re.compile(r'"text":\s*"(.*?)(?="\s*})', re.DOTALL)
-    matches = text_pattern.findall(raw_json_string)
+    if texts is None:
+        texts = _TEXT_FIELD_RE.findall(raw_json_string)
     
-    if matches:
-        # Clean up any potential issues from the regex extraction
-        texts = [m.replace('\n', ' ').strip() for m in matches]
+    if texts:
+        # Clean up any potential issues from the extraction
+        texts = [text.replace('\n', ' ').strip() for text in texts]
         
         # Create a properly structured JSON object
         structured_data = {
@@ -51,11 +131,21 @@ def format_documents(documents: List[Document]) -> str:
     """
     if not documents:
         return "No documents were retrieved."
+
+    key = tuple(
+        (doc.page_content, doc.metadata.get("source", ""), doc.metadata.get("title", ""), doc.metadata.get("retriever", "unknown"))
+        for doc in documents
+    )
+    with _format_cache_lock:
+        formatted = _format_cache.get(key)
+        if formatted is not None:
+            _format_cache.move_to_end(key)
+            return formatted
     
     # Format each document with <Document> tags
     formatted_docs = []
     
-    for i, doc in enumerate(documents):
+    for i, doc in enumerate(documents, 1):
         # Extract metadata
         metadata = doc.metadata
         source = metadata.get("source", "")
@@ -66,21 +156,24 @@ def format_documents(documents: List[Document]) -> str:
         title = metadata.get("title", "")
         retriever = metadata.get("retriever", "unknown")
         
-        # Build opening tag with metadata as attributes
-        opening_tag = f'<Document index="{i+1}"'
+        # Collect the opening tag, with metadata as attributes, and the content, then join once
+        parts = [f'<Document index="{i}"']
         
         if source:
-            opening_tag += f' href="{href}"'
+            parts.append(f' href="{href}"')
         if title:
-            opening_tag += f' title="{title}"'
+            parts.append(f' title="{title}"')
         if retriever:
-            opening_tag += f' retriever="{retriever}"'
+            parts.append(f' retriever="{retriever}"')
             
-        opening_tag += "/>"
-        
-        # Format the complete document
-        formatted_docs.append(f"{opening_tag}\n{doc.page_content}\n</Document>")
+        parts.append(f"/>\n{doc.page_content}\n</Document>")
+        formatted_docs.append("".join(parts))
     
     # Wrap all documents between a Documents tag
-    all_docs = "\n\n".join(formatted_docs)
-    return f"<Documents>\n{all_docs}\n</Documents>"
\ No newline at end of file
+    formatted = "<Documents>\n" + "\n\n".join(formatted_docs) + "\n</Documents>"
+
+    with _format_cache_lock:
+        _format_cache[key] = formatted
+        while len(_format_cache) > _FORMAT_CACHE_SIZE:
+            _format_cache.popitem(last=False)
+    return formatted
@@ -0,0 +1,123 @@
+"""
+Description:
+Shared HTTP clients for the Researcher retrievers. Keeps a single pooled
+`httpx.AsyncClient` per event loop, and one `httpx.Client` for the synchronous code
+paths, so that the retrievers reuse warm keep-alive connections instead of opening
+a new pool for every query.
+
+Author: Raptopoulos Petros [petrosrapto@gmail.com]
+Date: 2025/03/10
+"""
+import asyncio
+import atexit
+import importlib.util
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .logging import logger
+from .config import config
+
+# httpx connections are bound to the event loop they were opened on, so one client is kept per loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+# httpx.Client is thread-safe, a single one serves every thread
+_sync_client: Optional[httpx.Client] = None
+
+
+def _client_settings() -> Dict[str, Any]:
+    """Returns the pooled client settings from the `retrievers.http` section of config.yaml."""
+    http_config = config.get("retrievers.http", {})
+
+    # HTTP/2 requires the optional `h2` package
+    http2 = http_config.get("http2", True) and importlib.util.find_spec("h2") is not None
+    logger.debug("Creating shared HTTP client (http2=%s)", http2)
+
+    return {
+        "http2": http2,
+        "timeout": httpx.Timeout(http_config.get("timeout", 10.0)),
+        "limits": httpx.Limits(
+            max_keepalive_connections=http_config.get("max_keepalive_connections", 64),
+            max_connections=http_config.get("max_connections", 128)
+        )
+    }
+
+
+def _create_async_client() -> httpx.AsyncClient:
+    """Creates the pooled async client from the `retrievers.http` settings of config.yaml."""
+    return httpx.AsyncClient(**_client_settings())
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the shared `httpx.AsyncClient` of the running event loop, creating it on first use.
+
+    Requests can override the client's default timeout with the `timeout` argument.
+
+    Returns:
+        httpx.AsyncClient: The pooled client.
+
+    Raises:
+        RuntimeError: If called outside of a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = _clients[loop] = _create_async_client()
+        return client
+
+
+def get_sync_client() -> httpx.Client:
+    """
+    Returns the shared synchronous `httpx.Client`, creating it on first use.
+
+    For the code paths that cannot await; it has the same settings as the async clients
+    and, unlike them, can be used from any thread or event loop.
+
+    Returns:
+        httpx.Client: The pooled client.
+    """
+    global _sync_client
+
+    with _clients_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(**_client_settings())
+        return _sync_client
+
+
+def close_sync_client() -> None:
+    """Closes the shared synchronous client (it is recreated on the next use)."""
+    global _sync_client
+
+    with _clients_lock:
+        client, _sync_client = _sync_client, None
+    if client is not None:
+        client.close()
+
+
+async def aclose_async_client() -> None:
+    """Closes the shared client of the running event loop (e.g. from an application lifespan hook)."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+@atexit.register
+def _close_async_clients() -> None:
+    """Closes the synchronous client, and the async clients whose event loop is still usable at interpreter shutdown."""
+    close_sync_client()
+    with _clients_lock:
+        clients = list(_clients.items())
+        _clients.clear()
+    for loop, client in clients:
+        if not loop.is_closed() and not loop.is_running():
+            try:
+                loop.run_until_complete(client.aclose())
+            except Exception:
+                pass
@@ -10,12 +10,22 @@ Date: 2025/03/10
 
 import json
 import re
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 from langchain_core.documents import Document
 
+try:
+    # orjson decodes the JSON blocks of LightRAG responses several times faster
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 # Import directly from logging module to avoid circular imports
 from Researcher.utils.logging import logger
 
+# Patterns compiled once at import
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(.*?)```', re.DOTALL)
+_ORIG_SPAN_RE = re.compile(r'---\s*ORIGINAL SPAN OF THE DOCUMENT\s*---')
+
 
 def extract_json_from_text(text: str) -> Optional[List[Dict[str, Any]]]:
     """
@@ -29,20 +39,74 @@ def extract_json_from_text(text: str) -> Optional[List[Dict[str, Any]]]:
     """
     try:
         # Try to extract JSON between markdown json code blocks
-        json_match = re.search(r'```(?:json)?\s*(.*?)```', text, re.DOTALL)
-        if json_match:
-            json_content = json_match.group(1).strip()
-        else:
-            # Assume the entire text might be JSON
-            json_content = text.strip()
+        json_match = _JSON_BLOCK_RE.search(text)
+        # Assume the entire text might be JSON otherwise
+        json_content = json_match.group(1) if json_match else text
         
-        # Try to parse the extracted content
-        return json.loads(json_content)
+        # Try to parse the extracted content (both decoders ignore surrounding whitespace)
+        return _loads(json_content)
     except (json.JSONDecodeError, AttributeError) as e:
         logger.warning(f"Failed to parse JSON from text: {e}")
         return None
 
 
+# Section headers of a LightRAG context response, in the order LightRAG emits them
+SECTION_HEADERS = ("-----Entities-----", "-----Relationships-----", "-----Sources-----", "-----Vector Context-----")
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """
+    Split a LightRAG context response into its sections in a single pass.
+
+    The headers are looked up in order with a moving cursor, and each section runs until
+    the next header found (or the end of the text).
+
+    Args:
+        text (str): The LightRAG response text
+
+    Returns:
+        Dict[str, str]: The stripped content of each header present in the text
+    """
+    positions = []
+    cursor = 0
+    for header in SECTION_HEADERS:
+        start = text.find(header, cursor)
+        if start != -1:
+            cursor = start + len(header)
+            positions.append((header, start, cursor))
+
+    sections = {}
+    for i, (header, _, content_start) in enumerate(positions):
+        content_end = positions[i + 1][1] if i + 1 < len(positions) else len(text)
+        sections[header] = text[content_start:content_end].strip()
+    return sections
+
+
+def _cut_field(text: str, prefix: str, terminator: str) -> Tuple[Optional[str], str]:
+    """
+    Remove every `<prefix><value><terminator>` field from a text.
+
+    Returns:
+        Tuple[Optional[str], str]: The first field value (or None) and the text without the fields
+    """
+    value = None
+    parts = []
+    cursor = 0
+    while True:
+        start = text.find(prefix, cursor)
+        if start == -1:
+            break
+        end = text.find(terminator, start + len(prefix))
+        if end == -1:
+            break
+        if value is None:
+            value = text[start + len(prefix):end]
+        parts.append(text[cursor:start])
+        cursor = end + len(terminator)
+    parts.append(text[cursor:])
+    return value, "".join(parts)
+
+
 def parse_lightrag_response(
     response: Dict[str, Any], 
     config: Optional[Dict[str, Any]] = None
@@ -84,13 +148,12 @@ def parse_lightrag_response(
         return []
     
     response_text = response["response"]
+    sections = split_sections(response_text)
     
     # Process entities if included
-    if include_entities and "-----Entities-----" in response_text:
-        entities_section = re.search(r'-----Entities-----\s*\n(.*?)(?=-----Relationships-----|$)', 
-                                    response_text, re.DOTALL)
-        if entities_section:
-            entities_text = entities_section.group(1).strip()
+    if include_entities and "-----Entities-----" in sections:
+        entities_text = sections["-----Entities-----"]
+        if entities_text:
             entities_data = extract_json_from_text(entities_text)
             
             if entities_data:
@@ -118,11 +181,9 @@ def parse_lightrag_response(
                     documents.append(doc)
     
     # Process relationships if included
-    if include_relationships and "-----Relationships-----" in response_text:
-        relationships_section = re.search(r'-----Relationships-----\s*\n(.*?)(?=-----Sources-----|$)', 
-                                         response_text, re.DOTALL)
-        if relationships_section:
-            relationships_text = relationships_section.group(1).strip()
+    if include_relationships and "-----Relationships-----" in sections:
+        relationships_text = sections["-----Relationships-----"]
+        if relationships_text:
             relationships_data = extract_json_from_text(relationships_text)
             
             if relationships_data:
@@ -149,11 +210,9 @@ def parse_lightrag_response(
                     documents.append(doc)
     
     # Process sources if included
-    if include_sources and "-----Sources-----" in response_text:
-        sources_section = re.search(r'-----Sources-----\s*\n(.*?)(?=-----Vector Context-----|$)', 
-                                   response_text, re.DOTALL)
-        if sources_section:
-            sources_text = sources_section.group(1).strip()
+    if include_sources and "-----Sources-----" in sections:
+        sources_text = sections["-----Sources-----"]
+        if sources_text:
             sources_data = extract_json_from_text(sources_text)
             
             if sources_data:
@@ -162,8 +221,9 @@ def parse_lightrag_response(
                     # Extract content and clean up formatting
                     content = source.get("content", "")
                     # Remove "--- ORIGINAL SPAN OF THE DOCUMENT ---" and "------" markers
-                    content = re.sub(r'---\s*ORIGINAL SPAN OF THE DOCUMENT\s*---', '', content)
-                    content = re.sub(r'------', '', content)
+                    if "ORIGINAL SPAN OF THE DOCUMENT" in content:
+                        content = _ORIG_SPAN_RE.sub('', content)
+                    content = content.replace('------', '')
                     content = content.strip()
                     
                     doc = Document(
@@ -178,28 +238,23 @@ def parse_lightrag_response(
                     documents.append(doc)
     
     # Process vector context if included
-    if include_vector_context and "-----Vector Context-----" in response_text:
-        vector_context_section = re.search(r'-----Vector Context-----\s*\n(.*?)(?=$)', 
-                                          response_text, re.DOTALL)
-        if vector_context_section:
-            vector_context = vector_context_section.group(1).strip()
+    if include_vector_context and "-----Vector Context-----" in sections:
+        vector_context = sections["-----Vector Context-----"]
+        if vector_context:
             
             # Split by "--New Chunk--" marker
             chunks = vector_context.split("--New Chunk--")
             
             for i, chunk in enumerate(chunks):
-                # Extract file path and creation time
-                file_path_match = re.search(r'File path: (.*?)\n', chunk)
-                created_at_match = re.search(r'\[Created at: (.*?)\]', chunk)
-                
-                file_path = file_path_match.group(1) if file_path_match else "Unknown"
-                created_at = created_at_match.group(1) if created_at_match else "Unknown"
-                
                 # Clean up content
-                content = re.sub(r'--- ORIGINAL SPAN OF THE DOCUMENT ---', '', chunk)
-                content = re.sub(r'------', '', content)
-                content = re.sub(r'\[Created at: .*?\]', '', content)
-                content = re.sub(r'File path: .*?\n', '', content)
+                content = chunk.replace('--- ORIGINAL SPAN OF THE DOCUMENT ---', '').replace('------', '')
+
+                # Extract (and remove) the creation time and file path
+                created_at, content = _cut_field(content, '[Created at: ', ']')
+                file_path, content = _cut_field(content, 'File path: ', '\n')
+                
+                file_path = file_path if file_path is not None else "Unknown"
+                created_at = created_at if created_at is not None else "Unknown"
                 content = content.strip()
                 
                 if content:
@@ -232,5 +287,5 @@ def parse_lightrag_response(
             )
             documents.append(doc)
     
-    logger.info(f"Parsed LightRAG response into {len(documents)} documents")
+    logger.info("Parsed LightRAG response into %d documents", len(documents))
     return documents
\ No newline at end of file
@@ -7,6 +7,7 @@ YAML configuration settings using singleton pattern.
 Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
+import os
 import logging
 from logging.handlers import RotatingFileHandler
 from .config import config  # Import our config loader
@@ -51,6 +52,12 @@ class Logger:
 
         self.logger.propagate = False  # Prevent duplicate logging
 
+        # The config is loaded before the logger exists, so its outcome is reported here
+        if config.config_path is not None:
+            self.logger.info("Successfully loaded config from %s", config.config_path)
+        if os.environ.get("RESEARCHER_DEBUG_CONFIG"):
+            self.logger.debug("Full config: %s", config.config)
+
     def get_logger(self):
         """Return the configured logger."""
         return self.logger
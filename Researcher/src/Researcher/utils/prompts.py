@@ -7,8 +7,13 @@ and tool selection to guide LLM behavior throughout the retrieval workflow.
 Author: Raptopoulos Petros [petrosrapto@gmail.com]
 Date: 2025/03/10
 """
+from string import Formatter
+from typing import Callable
 
-SEARCH_QUERY_PROMPT = """
+# The prompts below keep their static text first and every placeholder at the end, so that
+# provider-side prompt caching (which matches byte-identical prefixes) covers the static part
+
+SEARCH_QUERY_HEADER = """
 You are an expert query refiner specialized in summarizing natural language questions into comprehensive and effective queries for retrieval operations.
 
 ### **Your Task:**  
@@ -27,17 +32,16 @@ Given a user query in natural language, your task is to:
    - Pay attention to the tool descriptions and arguments to make an informed choice.
    - Ensure that the refined query aligns with the expected input format of the selected tool.
 
-Take into account the following instructions as well:
-<instructions>
-{instructions}
-</instructions>
-
 ### **Guidelines for Refinement & Tool Selection:**  
     **Extract the core intent** from the user query.  
     **Summarize** the user query.  
     **Use precise terminology** for effective retrieval.  
     **Identify if a tool is required**, and if so, call it with the refined query.  
+    **Take into account the instructions** given along with the user query.  
+"""
 
+# Worked examples, shared by the query refinement prompt variants
+SEARCH_QUERY_EXAMPLES = """
 ### **Examples:**  
 
 **Example 1:**  
@@ -47,6 +51,16 @@ Take into account the following instructions as well:
 **Example 2:**  
 **User Query:** *Could you give me information about the specific NDA contract's purpose and scope as it relates to the handling of confidential information?*
 **Refined Query:** `What is the purpose and scope of the NDA contract regarding the handling of confidential information?`
+"""
+
+# Static part of the query refinement prompt, sent as one cacheable system message
+SEARCH_QUERY_PROMPT_PREFIX = SEARCH_QUERY_HEADER + SEARCH_QUERY_EXAMPLES
+
+SEARCH_QUERY_PROMPT_SUFFIX = """
+Take into account the following instructions as well:
+<instructions>
+{instructions}
+</instructions>
 
 Now, refine the following query according to these guidelines:
 **User Query:** 
@@ -55,6 +69,9 @@ Now, refine the following query according to these guidelines:
 </query>  
 """
 
+# Single-message form of the query refinement prompt
+SEARCH_QUERY_PROMPT = SEARCH_QUERY_PROMPT_PREFIX + SEARCH_QUERY_PROMPT_SUFFIX
+
 RAG_SYSTEM_PROMPT = """
 You are a **legal researcher**, responsible for providing **accurate, well-supported legal information** based strictly on the retrieved context.
 
@@ -79,6 +96,14 @@ You are a **legal researcher**, responsible for providing **accurate, well-suppo
 RAG_HUMAN_PROMPT = """
 You have been asked to assist in answering a legal question by providing research-based information.
 
+### **Instructions for Your Response:**
+- Use **only** the provided context to formulate your answer.
+- Provide a **well-structured legal response**, including reasoning, legal principles, and relevant citations.
+- If the context includes legal sources, **cite them using [1], [2], etc.**, and include a source list at the end.
+- **Whenever possible, quote exact spans from the original context** in your references to justify your claim. Enclose these quotes in quotation marks ("") for clarity.
+- **For each reference, specify how to locate the relevant information** in the original text.
+- If the context lacks sufficient detail to answer conclusively, **state this and suggest areas for further inquiry**.
+
 ### **Legal Question:**
 <question>
 {query}
@@ -92,12 +117,44 @@ Below is the relevant legal context retrieved from authoritative sources to assi
 {context}
 </context>
 
-### **Instructions for Your Response:**
-- Use **only** the provided context to formulate your answer.
-- Provide a **well-structured legal response**, including reasoning, legal principles, and relevant citations.
-- If the context includes legal sources, **cite them using [1], [2], etc.**, and include a source list at the end.
-- **Whenever possible, quote exact spans from the original context** in your references to justify your claim. Enclose these quotes in quotation marks ("") for clarity.
-- **For each reference, specify how to locate the relevant information** in the original text.
-- If the context lacks sufficient detail to answer conclusively, **state this and suggest areas for further inquiry**.
+Now, please provide your response based on the available context and the instructions above."""
+
+
+def _compile_template(template: str) -> Callable[..., str]:
+    """
+    Splits a `str.format` template into its literal parts and field names once, at import time.
+
+    The returned function fills the fields by keyword with a single join, instead of
+    parsing the template again on every request.
+    """
+    parts = [(literal, field_name) for literal, field_name, _, _ in Formatter().parse(template)]
+
+    def render(**fields) -> str:
+        pieces = []
+        for literal, field_name in parts:
+            pieces.append(literal)
+            if field_name is not None:
+                pieces.append(str(fields[field_name]))
+        return "".join(pieces)
+
+    return render
+
+
+_render_search_query = _compile_template(SEARCH_QUERY_PROMPT)
+_render_search_query_suffix = _compile_template(SEARCH_QUERY_PROMPT_SUFFIX)
+_render_rag_human_prompt = _compile_template(RAG_HUMAN_PROMPT)
+
+
+def render_search_query(query: str, instructions: str = "") -> str:
+    """Returns the single-message query refinement prompt for a query."""
+    return _render_search_query(query=query, instructions=instructions)
+
+
+def render_search_query_suffix(query: str, instructions: str = "") -> str:
+    """Returns the per-request part of the query refinement prompt (sent after the static prefix)."""
+    return _render_search_query_suffix(query=query, instructions=instructions)
+
 
-Now, please provide your response based on the available context."""
\ No newline at end of file
+def render_rag_human_prompt(query: str, context: str) -> str:
+    """Returns the response generation prompt for a question and its retrieved context."""
+    return _render_rag_human_prompt(query=query, context=context)
@@ -1,150 +1,178 @@
 """
 Tests for the AdalaRetriever implementation.
 """
-import unittest
 from unittest.mock import MagicMock, patch, AsyncMock
-import asyncio
+import json
 import sys
 import os
 
+import pytest
+
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from Researcher.retrievers.adala import AdalaRetriever
+from Researcher.retrievers.adala import AdalaRetriever, extract_filters
+from Researcher.retrievers.cache import InMemoryLRU
+
+TEST_RESULT = {
+    "title": "Test Law",
+    "type": "Law",
+    "law_type": "Civil",
+    "date": "2024-01-01",
+    "relative_path": "/documents/test.pdf"
+}
 
 
-class TestAdalaRetriever(unittest.TestCase):
-    """Test cases for the Adala retriever."""
+# The async tests share one event loop per module (loop_scope="module") instead of creating one each
 
-    def setUp(self):
-        """Set up test environment."""
-        # Mock the config to provide test values
-        self.config_patch = patch('Researcher.retrievers.adala.config')
-        self.mock_config = self.config_patch.start()
-        self.mock_config.get.return_value = {
+@pytest.fixture(scope="module", autouse=True)
+def mock_config():
+    """Provide the test Adala settings to every test of the module."""
+    with patch('Researcher.retrievers.adala.config') as config:
+        config.get.return_value = {
             'base_url': 'https://adala.justice.gov.ma',
             'build_id': 'THP5ZL1eNCinRAZ1hWfN0',
             'max_results': 5
         }
+        yield config
+
+
+@pytest.fixture(scope="module")
+def retriever(mock_config):
+    """A retriever shared by the tests of the module (it holds no per-query state)."""
+    return AdalaRetriever()
+
+
+@pytest.fixture(autouse=True)
+def mock_get_cache():
+    """Disable the retrieval cache unless a test provides one."""
+    with patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=None) as get_cache:
+        yield get_cache
+
+
+@pytest.fixture
+def mock_client():
+    """
+    Patch the shared HTTP clients to answer every search with the given results.
+
+    The sync and async clients record their requests on the same `get` mock.
+    """
+    with patch('Researcher.retrievers.adala.get_sync_client') as get_client, \
+            patch('Researcher.retrievers.adala.get_async_client') as get_async_client:
+        def answer(results):
+            response = MagicMock()
+            response.content = json.dumps({"pageProps": {"searchResult": {"data": results}}}).encode("utf-8")
+            client = MagicMock()
+            client.get.return_value = response
+            get_client.return_value = client
+            get_async_client.return_value.get = AsyncMock(side_effect=client.get)
+            return client
+
+        yield answer
+
+
+def test_initialization(retriever):
+    """Test that AdalaRetriever initializes correctly."""
+    assert retriever.name == "adala_retriever"
+    assert retriever.base_url == "https://adala.justice.gov.ma"
+    assert retriever.build_id == "THP5ZL1eNCinRAZ1hWfN0"
+    assert retriever.max_results == 5
+
+
+def test_name_property(retriever):
+    """Test the name property returns the correct identifier."""
+    assert retriever.name == "adala_retriever"
+
+
+def test_tool_property(retriever):
+    """Test that the tool property returns a Tool object."""
+    tool = retriever.tool
+    assert tool is not None
+    assert tool.name == "AdalaSearch"
+    assert "Adala Justice" in tool.description
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_async_search_success(retriever, mock_client):
+    """Test successful async search."""
+    client = mock_client([TEST_RESULT])
+
+    results = await retriever._async_search("test", 5)
+
+    assert len(results) == 1
+    assert results[0]["title"] == "Test Law"
+    assert client.get.call_args.kwargs["params"] == {"term": "test"}
 
-    def tearDown(self):
-        """Clean up after tests."""
-        self.config_patch.stop()
-
-    def test_initialization(self):
-        """Test that AdalaRetriever initializes correctly."""
-        retriever = AdalaRetriever()
-        self.assertEqual(retriever.name, "adala_retriever")
-        self.assertEqual(retriever.base_url, "https://adala.justice.gov.ma")
-        self.assertEqual(retriever.build_id, "THP5ZL1eNCinRAZ1hWfN0")
-        self.assertEqual(retriever.max_results, 5)
-
-    def test_name_property(self):
-        """Test the name property returns the correct identifier."""
-        retriever = AdalaRetriever()
-        self.assertEqual(retriever.name, "adala_retriever")
-
-    def test_tool_property(self):
-        """Test that the tool property returns a Tool object."""
-        retriever = AdalaRetriever()
-        tool = retriever.tool
-        self.assertIsNotNone(tool)
-        self.assertEqual(tool.name, "AdalaSearch")
-        self.assertIn("Adala Justice", tool.description)
-
-    @patch('Researcher.retrievers.adala.httpx.AsyncClient')
-    def test_async_search_success(self, mock_async_client):
-        """Test successful async search."""
-        # Mock the API response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "pageProps": {
-                "searchResult": {
-                    "data": [
-                        {
-                            "title": "Test Law",
-                            "type": "Law",
-                            "law_type": "Civil",
-                            "date": "2024-01-01",
-                            "relative_path": "/documents/test.pdf"
-                        }
-                    ]
-                }
-            }
-        }
-        mock_response.raise_for_status = MagicMock()
-
-        # Setup async context manager mock
-        mock_client_instance = MagicMock()
-        mock_client_instance.get = AsyncMock(return_value=mock_response)
-        mock_async_client.return_value.__aenter__.return_value = mock_client_instance
-
-        retriever = AdalaRetriever()
-        
-        # Run async search using asyncio.run()
-        results = asyncio.run(retriever._async_search("test", 5))
-        
-        self.assertEqual(len(results), 1)
-        self.assertEqual(results[0]["title"], "Test Law")
-
-    @patch('Researcher.retrievers.adala.httpx.AsyncClient')
-    def test_retrieve_with_results(self, mock_async_client):
-        """Test retrieve method with successful results."""
-        # Mock the API response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "pageProps": {
-                "searchResult": {
-                    "data": [
-                        {
-                            "title": "Test Law",
-                            "type": "Law",
-                            "law_type": "Civil",
-                            "date": "2024-01-01",
-                            "relative_path": "/documents/test.pdf"
-                        }
-                    ]
-                }
-            }
-        }
-        mock_response.raise_for_status = MagicMock()
 
-        # Setup async context manager mock
-        mock_client_instance = MagicMock()
-        mock_client_instance.get = AsyncMock(return_value=mock_response)
-        mock_async_client.return_value.__aenter__.return_value = mock_client_instance
+def test_sync_retrieve(retriever, mock_client):
+    """Test that retrieve searches through the shared synchronous client."""
+    client = mock_client([TEST_RESULT])
 
-        retriever = AdalaRetriever()
+    with patch('Researcher.retrievers.adala.get_async_client') as get_async_client:
         documents = retriever.retrieve("test query")
 
-        self.assertEqual(len(documents), 1)
-        self.assertIn("Test Law", documents[0].page_content)
-        self.assertEqual(documents[0].metadata["title"], "Test Law")
-        self.assertEqual(documents[0].metadata["retriever"], "adala_retriever")
-
-    def test_retrieve_with_empty_results(self):
-        """Test retrieve method with no results."""
-        with patch('Researcher.retrievers.adala.httpx.AsyncClient') as mock_async_client:
-            # Mock empty response
-            mock_response = MagicMock()
-            mock_response.json.return_value = {
-                "pageProps": {
-                    "searchResult": {
-                        "data": []
-                    }
-                }
-            }
-            mock_response.raise_for_status = MagicMock()
-
-            mock_client_instance = MagicMock()
-            mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_async_client.return_value.__aenter__.return_value = mock_client_instance
-
-            retriever = AdalaRetriever()
-            documents = retriever.retrieve("test query")
-
-            self.assertEqual(len(documents), 0)
-
-
-if __name__ == '__main__':
-    unittest.main()
+    get_async_client.assert_not_called()
+    assert client.get.call_args.kwargs["params"] == {"term": "test query"}
+    assert len(documents) == 1
+
+
+def test_retrieve_with_results(retriever, mock_client):
+    """Test retrieve method with successful results."""
+    mock_client([TEST_RESULT])
+
+    documents = retriever.retrieve("test query")
+
+    assert len(documents) == 1
+    assert "Test Law" in documents[0].page_content
+    assert documents[0].metadata["title"] == "Test Law"
+    assert documents[0].metadata["retriever"] == "adala_retriever"
+
+
+def test_retrieve_with_empty_results(retriever, mock_client):
+    """Test retrieve method with no results."""
+    mock_client([])
+
+    assert retriever.retrieve("test query") == []
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_aretrieve_reuses_shared_client(retriever, mock_client):
+    """Test that async searches on one event loop go through the same pooled client."""
+    client = mock_client([TEST_RESULT])
+
+    first = await retriever.aretrieve("first")
+    second = await retriever.aretrieve("second")
+
+    assert client.get.call_count == 2
+    assert first[0].metadata["source"] == "https://adala.justice.gov.ma/documents/test.pdf"
+    assert len(second) == 1
+
+
+def test_repeated_query_served_from_cache(retriever, mock_client, mock_get_cache):
+    """Test that the Adala API is called once for two identical queries."""
+    client = mock_client([TEST_RESULT])
+    mock_get_cache.return_value = InMemoryLRU()
+
+    first = retriever.retrieve("قانون الأسرة")
+    second = retriever.retrieve("  قانون   الأسرة ")
+
+    assert client.get.call_count == 1
+    assert second[0].page_content == first[0].page_content
+
+
+def test_retrieve_with_filters(retriever, mock_client):
+    """Test that filters are sent with the search and applied to the results before the limit."""
+    other = dict(TEST_RESULT, title="Penal Law", law_type="Penal", date="2023-05-02")
+    client = mock_client([other] * 5 + [TEST_RESULT])
+
+    documents = retriever.retrieve("test query", filters={"law_type": "Civil", "date": "2024", "unknown": "x"})
+
+    assert client.get.call_args.kwargs["params"] == {"term": "test query", "law_type": "Civil", "date": "2024"}
+    assert [doc.metadata["title"] for doc in documents] == ["Test Law"]
+
+
+def test_extract_filters():
+    """Test that a single year stated in the query becomes a date filter."""
+    assert extract_filters("مراسيم سنة 2024 المتعلقة بالشغل") == {"date": "2024"}
+    assert extract_filters("loi n° 31-08 de 2011 et 2014") == {}
+    assert extract_filters("family law") == {}
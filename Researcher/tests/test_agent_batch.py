@@ -0,0 +1,99 @@
+"""
+Tests for the batch and streaming searches of the Researcher agent.
+"""
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+import asyncio
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langchain_core.messages import AIMessageChunk
+
+from Researcher.agent import Researcher
+
+
+def make_researcher():
+    """Build a Researcher around a mocked graph, bypassing the retriever setup."""
+    researcher = Researcher.__new__(Researcher)
+    researcher.config = {}
+    researcher.graph = MagicMock()
+    return researcher
+
+
+class TestBatchSearch(unittest.TestCase):
+    """Test cases for running several queries in one batch."""
+
+    queries = ["What is a non-compete clause?", "What is force majeure?", "What is an NDA?", "What is GDPR?"]
+
+    def test_batch_search(self):
+        """Test that the queries go through a single graph batch, each in its own thread."""
+        researcher = make_researcher()
+        researcher.graph.batch.return_value = [{"response": query} for query in self.queries]
+
+        results = researcher.batch_search(self.queries, max_concurrency=2)
+
+        researcher.graph.batch.assert_called_once()
+        researcher.graph.invoke.assert_not_called()
+        inputs, threads = researcher.graph.batch.call_args.args
+        self.assertEqual([state["query"] for state in inputs], self.queries)
+        self.assertEqual(len({thread["configurable"]["thread_id"] for thread in threads}), 4)
+        self.assertEqual(threads[0]["max_concurrency"], 2)
+        self.assertEqual([result["response"] for result in results], self.queries)
+
+    def test_abatch_search_failed_query(self):
+        """Test that a failed query gives an empty result without failing the batch."""
+        researcher = make_researcher()
+        researcher.graph.abatch = AsyncMock(return_value=[{"response": "ok"}, ValueError("LLM error")])
+
+        results = asyncio.run(researcher.abatch_search(self.queries[:2]))
+
+        self.assertEqual(results, [{"response": "ok"}, {}])
+
+
+class TestStreamSearch(unittest.TestCase):
+    """Test cases for streaming the answer of a search."""
+
+    def test_stream_search(self):
+        """Test that the preamble comes before the retrieval completes, then the answer tokens."""
+        researcher = make_researcher()
+        retrieval_done = asyncio.Event()
+
+        async def astream(input_state, thread, stream_mode):
+            await retrieval_done.wait()
+            yield "messages", (AIMessageChunk(content="refined query"), {"langgraph_node": "extract_query"})
+            yield "messages", (AIMessageChunk(content="Article 5"), {"langgraph_node": "generate_response"})
+            yield "messages", (AIMessageChunk(content=[{"type": "text", "text": " applies."}]), {"langgraph_node": "generate_response"})
+            yield "updates", {"generate_response": {"response": "Article 5 applies."}}
+
+        researcher.graph.astream = astream
+
+        async def run():
+            chunks = researcher.astream_search("What applies?", preamble="Analyzing your question...")
+            first = await anext(chunks)
+            self.assertFalse(retrieval_done.is_set())
+            retrieval_done.set()
+            return [first] + [chunk async for chunk in chunks]
+
+        self.assertEqual(asyncio.run(run()), ["Analyzing your question...", "Article 5", " applies."])
+
+    def test_stream_search_cached_response(self):
+        """Test that an answer produced without streaming (e.g. from the response cache) is yielded whole."""
+        researcher = make_researcher()
+
+        async def astream(input_state, thread, stream_mode):
+            yield "updates", {"rerank": {"responseContext": []}}
+            yield "updates", {"generate_response": {"response": "Cached answer"}}
+
+        researcher.graph.astream = astream
+
+        async def run():
+            return [chunk async for chunk in researcher.astream_search("What applies?")]
+
+        self.assertEqual(asyncio.run(run()), ["Cached answer"])
+
+
+if __name__ == '__main__':
+    unittest.main()
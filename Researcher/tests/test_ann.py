@@ -0,0 +1,90 @@
+"""
+Tests for the nearest neighbour indexes.
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Researcher.retrievers import _ann
+from Researcher.retrievers._ann import BruteForceIndex, Int8BruteForceIndex, make_index
+
+
+def random_unit_vectors(count, dimension, seed=0):
+    """Random L2-normalized float32 vectors."""
+    vectors = np.random.default_rng(seed).standard_normal((count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def fill(index, vectors):
+    """Store the vectors in the index, one slot each."""
+    for slot, vector in enumerate(vectors):
+        index.set(slot, vector)
+    return index
+
+
+class TestANN(unittest.TestCase):
+    """Test cases for the brute-force and HNSW indexes."""
+
+    def test_brute_force_exact(self):
+        """Test that the brute-force index returns the exact top k, most similar first."""
+        vectors = random_unit_vectors(100, 16)
+        index = fill(BruteForceIndex(16, 100), vectors)
+        query = vectors[42]
+
+        slots, similarities = index.search(query, 5)
+
+        expected = np.argsort(-(vectors @ query))[:5]
+        self.assertEqual(slots.tolist(), expected.tolist())
+        self.assertAlmostEqual(float(similarities[0]), 1.0, places=5)
+        self.assertTrue(np.all(np.diff(similarities) <= 0))
+
+    def test_brute_force_replaces_slot(self):
+        """Test that setting a stored slot replaces its vector."""
+        index = fill(BruteForceIndex(2, 4), np.eye(2, dtype=np.float32))
+        index.set(0, np.array([0.0, 1.0], dtype=np.float32))
+
+        self.assertEqual(len(index), 2)
+        self.assertAlmostEqual(float(index.search(np.array([1.0, 0.0], dtype=np.float32), 1)[1][0]), 0.0)
+
+    def test_int8_recall(self):
+        """Test that the int8 index finds over 99% of the float32 top 10 with close similarities."""
+        vectors = random_unit_vectors(10000, 64)
+        queries = random_unit_vectors(50, 64, seed=1)
+        exact = fill(BruteForceIndex(64, 10000), vectors)
+        quantized = fill(Int8BruteForceIndex(64, 10000), vectors)
+
+        found = 0
+        for query in queries:
+            exact_slots, exact_similarities = exact.search(query, 10)
+            slots, similarities = quantized.search(query, 10)
+            found += len(set(slots.tolist()) & set(exact_slots.tolist()))
+            np.testing.assert_allclose(similarities[0], exact_similarities[0], atol=0.01)
+
+        self.assertEqual(quantized._matrix.dtype, np.int8)
+        self.assertGreater(found / (10 * len(queries)), 0.99)
+
+    @unittest.skipIf(_ann.hnswlib is None, "hnswlib is not installed")
+    def test_ann_recall(self):
+        """Test that the HNSW index finds over 95% of the exact top 10."""
+        vectors = random_unit_vectors(10000, 64)
+        queries = random_unit_vectors(50, 64, seed=1)
+        index = fill(make_index(64, 10000, ann_min_size=1000), vectors)
+        exact = BruteForceIndex(64, 10000)
+        exact._matrix, exact._size = vectors, len(vectors)
+
+        found = sum(
+            len(set(index.search(query, 10)[0].tolist()) & set(exact.search(query, 10)[0].tolist()))
+            for query in queries
+        )
+
+        self.assertIsInstance(index, _ann.HNSWIndex)
+        self.assertGreater(found / (10 * len(queries)), 0.95)
+
+
+if __name__ == '__main__':
+    unittest.main()
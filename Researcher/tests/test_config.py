@@ -0,0 +1,45 @@
+"""
+Tests for the Config singleton.
+"""
+import unittest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Researcher.utils.config import Config
+
+
+class TestConfig(unittest.TestCase):
+    """Test cases for the configuration lookups."""
+
+    def setUp(self):
+        """Set up a config instance around a known dictionary."""
+        self.config = Config.__new__(Config)
+        self.config.config = {"retrievers": {"web": {"max_results": 5, "enabled": False}}}
+        Config._get_raw.cache_clear()
+
+    def tearDown(self):
+        """Drop the lookups cached for the test dictionary."""
+        Config._get_raw.cache_clear()
+
+    def test_get_nested_values(self):
+        """Test dotted lookups, defaults and the empty-value fallback."""
+        self.assertEqual(self.config.get("retrievers.web.max_results"), 5)
+        self.assertEqual(self.config.get("retrievers.web"), {"max_results": 5, "enabled": False})
+        self.assertEqual(self.config.get("retrievers.wikipedia", {}), {})
+        self.assertEqual(self.config.get("retrievers.web.max_results.value", 1), 1)
+        self.assertTrue(self.config.get("retrievers.web.enabled", True))
+
+    def test_get_caches_lookups(self):
+        """Test that repeated lookups are served from the cache whatever the default."""
+        self.config.get("retrievers.web", {})
+        self.config.get("retrievers.web", None)
+
+        info = Config._get_raw.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
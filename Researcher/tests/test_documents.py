@@ -0,0 +1,69 @@
+"""
+Tests for the document helpers.
+"""
+import unittest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langchain_core.documents import Document
+
+from Researcher.utils.documents import deduplicate_by_content, merge_documents, preview_documents
+
+
+class TestDocuments(unittest.TestCase):
+    """Test cases for the document helpers."""
+
+    def test_merge_documents_skips_seen(self):
+        """Test that the state reducer appends only documents with a new source and content."""
+        existing = [Document(page_content="Article 1", metadata={"source": "gdpr.pdf"})]
+        new = [
+            Document(page_content="Article 1", metadata={"source": "gdpr.pdf"}),
+            Document(page_content="Article 1", metadata={"source": "https://eur-lex.europa.eu"}),
+            Document(page_content="Article 2", metadata={"source": "gdpr.pdf"}),
+        ]
+
+        merged = merge_documents(existing, new)
+
+        self.assertEqual([doc.metadata["source"] for doc in merged], ["gdpr.pdf", "https://eur-lex.europa.eu", "gdpr.pdf"])
+        self.assertEqual(len(existing), 1)
+        self.assertEqual(merge_documents(None, new[:1]), new[:1])
+        self.assertIs(merge_documents(existing, None), existing)
+
+    def test_deduplicate_by_content_keeps_first(self):
+        """Test that exact content duplicates are dropped, keeping the first occurrence in order."""
+        documents = [
+            Document(page_content="Article 1", metadata={"retriever": "lightrag_retriever"}),
+            Document(page_content="Article 2", metadata={"retriever": "web_retriever"}),
+            Document(page_content="Article 1", metadata={"retriever": "vectordb_retriever"}),
+        ]
+
+        unique = deduplicate_by_content(documents)
+
+        self.assertEqual([doc.page_content for doc in unique], ["Article 1", "Article 2"])
+        self.assertEqual(unique[0].metadata["retriever"], "lightrag_retriever")
+
+    def test_deduplicate_by_content_many_copies(self):
+        """Test that many copies of one passage from a retriever fan-out collapse to one document."""
+        documents = [Document(page_content="Article 5 " * 300, metadata={"rank": i}) for i in range(100)]
+
+        unique = deduplicate_by_content(documents)
+
+        self.assertEqual(len(unique), 1)
+        self.assertEqual(unique[0].metadata["rank"], 0)
+
+    def test_preview_documents_truncates(self):
+        """Test that the preview only shows the first documents, truncated."""
+        documents = [Document(page_content="x" * 500, metadata={"source": f"doc{i}"}) for i in range(5)]
+
+        preview = preview_documents(documents, limit=2, max_chars=10)
+
+        self.assertIn("[doc0] 'xxxxxxxxxx'", preview)
+        self.assertNotIn("doc2", preview)
+        self.assertTrue(preview.endswith("(+3 more)"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Tests for the formatting and sanitization utilities.
+"""
+import unittest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langchain_core.documents import Document
+
+from Researcher.utils.formatters import sanitize_with_bleach, extract_texts_from_json, format_documents
+
+
+class TestFormatters(unittest.TestCase):
+    """Test cases for the formatters."""
+
+    def test_sanitize_strips_tags(self):
+        """Test that tags and comments are removed while their text and comparisons are kept."""
+        text = '{"text": "<b>Article 5</b> &amp; <i class="x">6</i><!-- note --> if a < b"}'
+
+        self.assertEqual(sanitize_with_bleach(text), '{"text": "Article 5 & 6 if a < b"}')
+
+    def test_extract_texts_from_json(self):
+        """Test that text fields are extracted despite invalid quote escaping."""
+        raw = '{"spans": [{"text": "the "Data" controller\nshall"}, {"text": "second"}]}'
+
+        self.assertEqual(
+            extract_texts_from_json(raw),
+            {"spans": [{"text": 'the "Data" controller shall'}, {"text": "second"}]}
+        )
+
+    def test_extract_texts_with_braces_in_strings(self):
+        """Test that valid JSON is parsed rather than matched, so braces inside texts are kept."""
+        raw = '{"spans": [{"text": "Article {5} applies", "id": 1}, {"other": {"text": "nested"}}]}'
+
+        self.assertEqual(
+            extract_texts_from_json(raw),
+            {"spans": [{"text": "Article {5} applies"}, {"text": "nested"}]}
+        )
+
+    def test_format_documents(self):
+        """Test the document tags and that equal document sets share a cached result."""
+        documents = [
+            Document(page_content="GDPR text", metadata={"source": "gdpr.pdf", "title": "GDPR", "retriever": "vectordb"}),
+            Document(page_content="Other text", metadata={"url": "https://example.com"}),
+        ]
+
+        formatted = format_documents(documents)
+
+        self.assertEqual(
+            formatted,
+            '<Documents>\n<Document index="1" href="gdpr.pdf" title="GDPR" retriever="vectordb"/>\nGDPR text\n</Document>'
+            '\n\n<Document index="2" retriever="unknown"/>\nOther text\n</Document>\n</Documents>'
+        )
+        self.assertIs(format_documents([Document(page_content=d.page_content, metadata=dict(d.metadata)) for d in documents]), formatted)
+        documents[1].metadata["title"] = "Changed"
+        self.assertIn('title="Changed"', format_documents(documents))
+
+
+if __name__ == '__main__':
+    unittest.main()
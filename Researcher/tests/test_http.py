@@ -0,0 +1,61 @@
+"""
+Tests for the shared HTTP clients.
+"""
+import unittest
+import asyncio
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Researcher.utils.http import get_async_client, aclose_async_client, get_sync_client, close_sync_client
+
+
+class TestSharedHttpClient(unittest.TestCase):
+    """Test cases for the shared HTTP clients."""
+
+    def test_client_shared_within_loop(self):
+        """Test that a loop reuses one client, and a closed client is replaced."""
+        async def run():
+            first = get_async_client()
+            same = get_async_client()
+            await aclose_async_client()
+            replaced = get_async_client()
+            await aclose_async_client()
+            return first, same, replaced
+
+        first, same, replaced = asyncio.run(run())
+
+        self.assertIs(first, same)
+        self.assertTrue(first.is_closed)
+        self.assertIsNot(first, replaced)
+
+    def test_client_per_event_loop(self):
+        """Test that each event loop gets its own client."""
+        async def run():
+            client = get_async_client()
+            await aclose_async_client()
+            return client
+
+        self.assertIsNot(asyncio.run(run()), asyncio.run(run()))
+
+    def test_requires_running_loop(self):
+        """Test that the client can only be requested from a running event loop."""
+        with self.assertRaises(RuntimeError):
+            get_async_client()
+
+    def test_sync_client_shared(self):
+        """Test that the synchronous client is shared, and replaced once closed."""
+        first = get_sync_client()
+        same = get_sync_client()
+        close_sync_client()
+
+        self.assertIs(first, same)
+        self.assertTrue(first.is_closed)
+        self.assertIsNot(get_sync_client(), first)
+        close_sync_client()
+
+
+if __name__ == '__main__':
+    unittest.main()
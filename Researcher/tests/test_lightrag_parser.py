@@ -0,0 +1,65 @@
+"""
+Tests for the LightRAG response parser.
+"""
+import unittest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Researcher.utils.lightrag_parser import split_sections, parse_lightrag_response, extract_json_from_text
+
+RESPONSE = """-----Entities-----
+```json
+[{"id": 1, "entity": "GDPR", "type": "LAW", "description": "Data protection regulation", "rank": 3}]
+```
+-----Relationships-----
+```json
+[]
+```
+-----Sources-----
+```json
+[{"id": 7, "content": "--- ORIGINAL SPAN OF THE DOCUMENT ---Article 5------", "file_path": "gdpr.pdf"}]
+```
+-----Vector Context-----
+File path: gdpr.pdf
+[Created at: 2025-03-10] Personal data shall be processed lawfully.
+--New Chunk--
+No metadata here.
+"""
+
+
+class TestLightRAGParser(unittest.TestCase):
+    """Test cases for the LightRAG response parser."""
+
+    def test_split_sections(self):
+        """Test that each section runs until the next header present."""
+        sections = split_sections("-----Entities-----\nents\n-----Sources-----\nsrcs")
+
+        self.assertEqual(sections, {"-----Entities-----": "ents", "-----Sources-----": "srcs"})
+
+    def test_extract_json_from_text(self):
+        """Test that fenced and bare JSON blocks are decoded and invalid ones rejected."""
+        self.assertEqual(extract_json_from_text('```json\n[{"id": 1}]\n```'), [{"id": 1}])
+        self.assertEqual(extract_json_from_text('  [{"id": 2}]\n'), [{"id": 2}])
+        self.assertIsNone(extract_json_from_text("```json\n[{broken\n```"))
+
+    def test_parse_response(self):
+        """Test that every section is turned into cleaned documents."""
+        documents = parse_lightrag_response({"response": RESPONSE}, {"include_vector_context": True})
+        by_type = {}
+        for doc in documents:
+            by_type.setdefault(doc.metadata["content_type"], []).append(doc)
+
+        self.assertEqual(by_type["entity"][0].metadata["entity_name"], "GDPR")
+        self.assertEqual(by_type["source"][0].page_content, "Article 5")
+        first_chunk, second_chunk = by_type["vector_context"]
+        self.assertEqual(first_chunk.page_content, "Personal data shall be processed lawfully.")
+        self.assertEqual(first_chunk.metadata["file_path"], "gdpr.pdf")
+        self.assertEqual(first_chunk.metadata["created_at"], "2025-03-10")
+        self.assertEqual(second_chunk.metadata["file_path"], "Unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
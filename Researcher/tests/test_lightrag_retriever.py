@@ -0,0 +1,154 @@
+"""
+Tests for the LightRAGRetriever implementation.
+"""
+import unittest
+from unittest.mock import MagicMock, patch, AsyncMock
+import asyncio
+import orjson
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Researcher.retrievers.lightrag import LightRAGRetriever
+from Researcher.retrievers.cache import InMemoryLRU
+
+
+def make_response(query):
+    """Build a mocked LightRAG response carrying a direct context entry for the query."""
+    response = MagicMock()
+    response.content = orjson.dumps({
+        "response": "",
+        "context": [{"content": f"Context for {query}", "source": "test.pdf"}]
+    })
+    response.raise_for_status = MagicMock()
+    return response
+
+
+class TestLightRAGRetriever(unittest.TestCase):
+    """Test cases for the LightRAG retriever."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.config_patch = patch('Researcher.retrievers.lightrag.config')
+        self.mock_config = self.config_patch.start()
+        self.mock_config.get.return_value = {
+            'base_url': 'http://lightrag.test',
+            'max_parallel': 2
+        }
+        self.cache_patch = patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=None)
+        self.cache_patch.start()
+
+        self.retriever = LightRAGRetriever()
+        self.retriever._connection_checked = True
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.cache_patch.stop()
+        self.config_patch.stop()
+
+    def test_initialization(self):
+        """Test that LightRAGRetriever initializes correctly."""
+        self.assertEqual(self.retriever.name, "lightrag_retriever")
+        self.assertEqual(self.retriever.base_url, "http://lightrag.test")
+        self.assertEqual(self.retriever.max_parallel, 2)
+
+    def test_connection_checked_lazily_once(self):
+        """Test that the server is not contacted on construction, only on the first retrieve."""
+        with patch('requests.Session.get') as mock_get:
+            retriever = LightRAGRetriever()
+        mock_get.assert_not_called()
+
+        retriever._session = MagicMock()
+        retriever._session.post.return_value = make_response("test")
+        with patch('Researcher.retrievers.lightrag.requests.get') as mock_probe:
+            retriever.retrieve("first")
+            retriever.retrieve("second")
+
+        mock_probe.assert_called_once_with("http://lightrag.test/documents", timeout=2.0)
+        retriever._session.get.assert_not_called()
+
+    def test_connection_check_single_attempt(self):
+        """Test that the connection probe makes exactly one attempt against a server that is down."""
+        self.retriever._connection_checked = False
+
+        with patch('urllib3.connection.HTTPConnection.connect', side_effect=ConnectionRefusedError) as connect:
+            self.retriever._check_connection()
+
+        connect.assert_called_once()
+
+    def test_retrieve_uses_session(self):
+        """Test that retrieve posts through the pooled session."""
+        self.retriever._session = MagicMock()
+        self.retriever._session.post.return_value = make_response("test")
+
+        documents = self.retriever.retrieve("test")
+
+        self.retriever._session.post.assert_called_once()
+        self.assertEqual(orjson.loads(self.retriever._session.post.call_args.kwargs["data"])["query"], "test")
+        self.assertEqual(documents[0].page_content, "Context for test")
+
+    def test_build_request_override_priority(self):
+        """Test that retriever-specific overrides win over general kwargs and defaults."""
+        payload, parser_config = self.retriever._build_request(
+            "test", {"mode": "local", "top_k": 3, "lightrag_retriever": {"top_k": 7, "max_token": 100}}
+        )
+
+        self.assertEqual(payload["query"], "test")
+        self.assertEqual(payload["mode"], "local")
+        self.assertEqual(payload["top_k"], 7)
+        self.assertEqual(payload["max_token_for_global_context"], 100)
+        self.assertEqual(payload["response_type"], "Single Paragraph")
+        self.assertEqual(payload["history_turns"], 0)
+        self.assertEqual(parser_config, {})
+
+    def test_build_request_reuses_base_payload(self):
+        """Test that calls without overrides copy the precomputed payload."""
+        payload, _ = self.retriever._build_request("first", {})
+        payload["top_k"] = 1
+        second, _ = self.retriever._build_request("second", {})
+
+        self.assertEqual(second["query"], "second")
+        self.assertEqual(second["top_k"], 10)
+        self.assertEqual(list(second)[0], "query")
+
+    def test_batch_retrieve_keeps_order_and_caps_concurrency(self):
+        """Test that batch retrieval returns one result per query with bounded concurrency."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def post(url, content, headers, timeout):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return make_response(orjson.loads(content)["query"])
+
+        client = MagicMock()
+        client.post = AsyncMock(side_effect=post)
+
+        with patch('Researcher.retrievers.lightrag.get_async_client', return_value=client):
+            results = self.retriever.batch_retrieve(["q1", "q2", "q3", "q4"])
+
+        self.assertEqual([docs[0].page_content for docs in results],
+                         ["Context for q1", "Context for q2", "Context for q3", "Context for q4"])
+        self.assertLessEqual(max_in_flight, 2)
+
+    def test_batch_retrieve_uses_cache(self):
+        """Test that a query already retrieved is served from the retrieval cache in a batch."""
+        client = MagicMock()
+        client.post = AsyncMock(side_effect=lambda url, content, headers, timeout: make_response(orjson.loads(content)["query"]))
+
+        with patch('Researcher.retrievers.lightrag.get_async_client', return_value=client), \
+                patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=InMemoryLRU()):
+            self.retriever.batch_retrieve(["q1"])
+            results = self.retriever.batch_retrieve(["q1", "q2"])
+
+        self.assertEqual(client.post.call_count, 2)
+        self.assertEqual([docs[0].page_content for docs in results], ["Context for q1", "Context for q2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
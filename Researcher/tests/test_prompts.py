@@ -0,0 +1,114 @@
+"""
+Tests for the prompt templates and their cacheable prefixes.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langchain_core.messages import HumanMessage
+
+from Researcher.models import cacheable_system_message
+from Researcher.models.bedrock import get_bedrock_llm
+from Researcher.graph.nodes.query_extractor import search_query_messages
+from Researcher.utils.prompts import (
+    SEARCH_QUERY_PROMPT, SEARCH_QUERY_PROMPT_PREFIX, SEARCH_QUERY_HEADER, SEARCH_QUERY_EXAMPLES, SEARCH_QUERY_PROMPT_SUFFIX, RAG_SYSTEM_PROMPT, RAG_HUMAN_PROMPT,
+    render_search_query, render_search_query_suffix, render_rag_human_prompt
+)
+
+
+def converse_response(**request):
+    """A minimal Converse API answer (a new one per call, the client consumes it)."""
+    return {
+        "output": {"message": {"role": "assistant", "content": [{"text": "OK"}]}},
+        "stopReason": "end_turn",
+        "usage": {"inputTokens": 10, "outputTokens": 1, "totalTokens": 11},
+        "metrics": {"latencyMs": 1},
+    }
+
+
+def bedrock_llm():
+    """Build Claude on Bedrock as the repo does, recording the Converse requests instead of sending them."""
+    credentials = {"AWS_ACCESS_KEY_ID": "test", "AWS_SECRET_ACCESS_KEY": "test", "AWS_REGION_NAME": "us-east-1"}
+    with patch.dict(os.environ, credentials):
+        llm = get_bedrock_llm("anthropic.claude-3-5-sonnet-20240620-v1:0", temperature=0)
+    llm.client.converse = MagicMock(side_effect=converse_response)
+    return llm
+
+
+class TestPrompts(unittest.TestCase):
+    """Test cases for the prompt prefixes."""
+
+    def test_prefixes_are_static(self):
+        """Test that every placeholder is kept out of the cacheable prefixes."""
+        self.assertNotIn("{", SEARCH_QUERY_PROMPT_PREFIX)
+        self.assertNotIn("{", RAG_SYSTEM_PROMPT)
+        self.assertIn("{query}", SEARCH_QUERY_PROMPT_SUFFIX)
+        self.assertIn("{instructions}", SEARCH_QUERY_PROMPT_SUFFIX)
+
+    def test_cacheable_system_message(self):
+        """Test that the cache point of Claude on Bedrock survives the Converse conversion, other models get plain text."""
+        llm = bedrock_llm()
+        llm.invoke([cacheable_system_message("prefix", llm), HumanMessage(content="question")])
+        gpt = cacheable_system_message("prefix", SimpleNamespace(model_name="gpt-4o"))
+
+        self.assertEqual(llm.client.converse.call_args.kwargs["system"], [{"text": "prefix"}, {"cachePoint": {"type": "default"}}])
+        self.assertEqual(gpt.content, "prefix")
+
+    def test_cacheable_system_message_anthropic_api(self):
+        """Test that Claude outside of the Converse API gets a cache_control breakpoint."""
+        claude = cacheable_system_message("prefix", SimpleNamespace(model_name="claude-3-5-sonnet-latest"))
+
+        self.assertEqual(claude.content, [{"type": "text", "text": "prefix", "cache_control": {"type": "ephemeral"}}])
+
+    def test_render_matches_format(self):
+        """Test that the precompiled templates render exactly like str.format."""
+        query, instructions, context = "Quelle est la durée {du} préavis ?", "Réponds en français", "[1] Article 43"
+
+        self.assertEqual(render_search_query(query, instructions),
+                         SEARCH_QUERY_PROMPT.format(query=query, instructions=instructions))
+        self.assertEqual(render_search_query_suffix(query, instructions),
+                         SEARCH_QUERY_PROMPT_SUFFIX.format(query=query, instructions=instructions))
+        self.assertEqual(render_rag_human_prompt(query, context),
+                         RAG_HUMAN_PROMPT.format(query=query, context=context))
+
+    def test_prompt_blocks_ordering(self):
+        """Test that the header and examples lead the query prompt, identical whatever the instructions."""
+        llm = SimpleNamespace(model_id="anthropic.claude-3-5-sonnet-20240620-v1:0")
+        first = search_query_messages("GDPR fines", "Answer in French", llm)
+        second = search_query_messages("GDPR fines", "Cite the articles", llm)
+
+        self.assertEqual(first[0].content, second[0].content)
+        self.assertEqual(first[0].content[0]["text"], SEARCH_QUERY_HEADER + SEARCH_QUERY_EXAMPLES)
+        self.assertNotIn("{", SEARCH_QUERY_EXAMPLES)
+        self.assertNotEqual(first[1].content, second[1].content)
+
+    def test_search_query_prefix_cached_on_bedrock(self):
+        """Test that the header and examples reach Bedrock followed by a cache point, with the tools bound."""
+        llm = bedrock_llm()
+        tool = {"name": "WebSearch", "description": "Searches the web.",
+                "parameters": {"type": "object", "properties": {"query": {"type": "string"}}, "required": ["query"]}}
+        llm.bind_tools([tool]).invoke(search_query_messages("GDPR fines", "Answer in French", llm))
+
+        request = llm.client.converse.call_args.kwargs
+        self.assertEqual(request["system"], [{"text": SEARCH_QUERY_PROMPT_PREFIX}, {"cachePoint": {"type": "default"}}])
+        self.assertIn("GDPR fines", request["messages"][0]["content"][0]["text"])
+
+    def test_prompt_prefix_stability(self):
+        """Test that prompts rendered for different queries share the whole static prefix, byte for byte."""
+        first = render_search_query("GDPR fines", "Answer in French").encode("utf-8")
+        second = render_search_query("Code de la famille, article 49", "Cite the articles").encode("utf-8")
+        shared = os.path.commonprefix([first, second])
+
+        # Providers only cache prefixes above a minimum length (e.g. 1024 tokens), which
+        # requires at least as many bytes to stay identical from one query to the next
+        self.assertEqual(shared[:len(SEARCH_QUERY_PROMPT_PREFIX.encode("utf-8"))], SEARCH_QUERY_PROMPT_PREFIX.encode("utf-8"))
+        self.assertGreaterEqual(len(shared), 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Tests for the response generator node.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from Researcher.graph.nodes import response_generator
+from Researcher.models.bedrock import get_bedrock_llm
+from Researcher.utils.cache_metrics import cache_stats, reset_cache_stats
+from Researcher.retrievers.cache import SemanticCache
+
+
+class TestResponseGenerator(unittest.TestCase):
+    """Test cases for the response generation node."""
+
+    def setUp(self):
+        """Set up a deterministic mocked LLM."""
+        response_generator.clear_response_cache()
+        self.llm = MagicMock()
+        self.llm.invoke.return_value = AIMessage(content="Article 5 requires lawful processing [1].")
+        self.patches = [
+            patch.object(response_generator, "get_default_llm", return_value=self.llm),
+            patch.object(response_generator, "use_response_cache", True),
+            patch.object(response_generator.config, "get", side_effect=self.config_get),
+        ]
+        for p in self.patches:
+            p.start()
+        self.temperature = 0
+        self.prompt_cache = {}
+        self.state = {
+            "query": "What does Article 5 GDPR require?",
+            "responseContext": [Document(page_content="Personal data shall be processed lawfully.", metadata={"source": "gdpr.pdf"})],
+        }
+
+    def tearDown(self):
+        """Clean up after tests."""
+        for p in reversed(self.patches):
+            p.stop()
+        response_generator.clear_response_cache()
+
+    def config_get(self, key, default=None):
+        """Model configuration with the temperature of the test."""
+        if key == "models.response_generator":
+            return {"API": "openai", "model_id": "gpt-4o", "args": {"temperature": self.temperature}}
+        if key == "prompt_cache":
+            return self.prompt_cache
+        if key == "prompt_cache.ttl":
+            return self.prompt_cache.get("ttl")
+        return default
+
+    def test_identical_request_served_from_cache(self):
+        """Test that the LLM is called once for two identical requests."""
+        first = response_generator.generate_response(self.state)
+        second = response_generator.generate_response(dict(self.state, query=" What does  Article 5 GDPR require? "))
+
+        self.llm.invoke.assert_called_once()
+        self.assertEqual(first, second)
+
+    def test_other_context_not_served_from_cache(self):
+        """Test that a different context calls the LLM again."""
+        response_generator.generate_response(self.state)
+        response_generator.generate_response(dict(self.state, responseContext=[Document(page_content="Other")]))
+
+        self.assertEqual(self.llm.invoke.call_count, 2)
+
+    def test_sampling_models_not_cached(self):
+        """Test that responses are not cached when the temperature is not 0."""
+        self.temperature = 0.7
+
+        response_generator.generate_response(self.state)
+        response_generator.generate_response(self.state)
+
+        self.assertEqual(self.llm.invoke.call_count, 2)
+
+    def test_system_prompt_is_cached(self):
+        """Test that the warm-up and later requests send the system prompt to Bedrock with a cache point."""
+        credentials = {"AWS_ACCESS_KEY_ID": "test", "AWS_SECRET_ACCESS_KEY": "test", "AWS_REGION_NAME": "us-east-1"}
+        with patch.dict(os.environ, credentials):
+            llm = get_bedrock_llm("anthropic.claude-3-5-sonnet-20241022-v2:0", temperature=0)
+        llm.client.converse = MagicMock(side_effect=lambda **request: {
+            "output": {"message": {"role": "assistant", "content": [{"text": "OK"}]}},
+            "stopReason": "end_turn",
+            "usage": {"inputTokens": 10, "outputTokens": 1, "totalTokens": 11, "cacheReadInputTokens": 2048},
+            "metrics": {"latencyMs": 1},
+        })
+        self.prompt_cache = {"warmup": True}
+        reset_cache_stats()
+
+        with patch.object(response_generator, "get_default_llm", return_value=llm):
+            self.assertTrue(response_generator.warm_up_prompt_cache())
+            response_generator.generate_response(self.state)
+
+        warmup_system, request_system = (call.kwargs["system"] for call in llm.client.converse.call_args_list)
+        self.assertEqual(warmup_system, [{"text": response_generator.RAG_SYSTEM_PROMPT}, {"cachePoint": {"type": "default"}}])
+        self.assertEqual(request_system, warmup_system)
+        self.assertEqual(cache_stats()["prompt"]["hits"], 2)
+
+    def test_warm_up_disabled(self):
+        """Test that no request is sent when the warm-up is disabled."""
+        self.assertFalse(response_generator.warm_up_prompt_cache())
+        self.llm.invoke.assert_not_called()
+
+    def use_semantic_cache(self):
+        """Enable the semantic response cache with fixed query embeddings."""
+        vectors = {
+            "What does Article 5 GDPR require?": [1.0, 0.0],
+            "Which requirements does GDPR Article 5 set?": [0.99, 0.14],
+            "What are the latest GDPR fines?": [0.99, 0.14],
+        }
+        cache = SemanticCache(lambda query: vectors[query], threshold=0.95)
+        for p in (patch.object(response_generator, "use_semantic_response_cache", True),
+                  patch.object(response_generator, "_semantic_response_cache", cache)):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_semantic_cache_hit(self):
+        """Test that a paraphrased query answered from the same sources reuses the answer."""
+        self.use_semantic_cache()
+
+        first = response_generator.generate_response(self.state)
+        second = response_generator.generate_response(dict(self.state, query="Which requirements does GDPR Article 5 set?"))
+
+        self.llm.invoke.assert_called_once()
+        self.assertEqual(first, second)
+
+    def test_semantic_cache_scoped_to_sources(self):
+        """Test that paraphrases answered from other sources, or time-sensitive ones, call the LLM."""
+        self.use_semantic_cache()
+
+        response_generator.generate_response(self.state)
+        response_generator.generate_response(dict(
+            self.state, query="Which requirements does GDPR Article 5 set?",
+            responseContext=[Document(page_content="Personal data shall be processed lawfully.", metadata={"source": "nda.pdf"})]
+        ))
+        response_generator.generate_response(dict(self.state, query="What are the latest GDPR fines?"))
+
+        self.assertEqual(self.llm.invoke.call_count, 3)
+
+    def test_semantic_cache_scoped_to_content(self):
+        """Test that a paraphrase answered from another chunk of the same source calls the LLM."""
+        self.use_semantic_cache()
+
+        response_generator.generate_response(self.state)
+        other_chunk = [Document(page_content=doc.page_content + " Article 6 sets the lawful bases.", metadata=dict(doc.metadata))
+                       for doc in self.state["responseContext"]]
+        response_generator.generate_response(dict(
+            self.state, query="Which requirements does GDPR Article 5 set?", responseContext=other_chunk
+        ))
+
+        self.assertEqual(self.llm.invoke.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
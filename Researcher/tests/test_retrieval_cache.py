@@ -0,0 +1,223 @@
+"""
+Tests for the retrieval cache backends.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import asyncio
+import threading
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langchain_core.documents import Document
+
+from Researcher.retrievers.cache import InMemoryLRU, RedisCache, SemanticCache, make_cache_key, cached_retrieval
+from Researcher.utils.cache_metrics import cache_stats, reset_cache_stats
+
+
+class TestRetrievalCache(unittest.TestCase):
+    """Test cases for the retrieval cache."""
+
+    def test_cache_key_normalizes_query(self):
+        """Test that whitespace and case differences map to the same key."""
+        key_a = make_cache_key("researcher", "web_retriever", "GDPR  obligations ", {"max_results": 5})
+        key_b = make_cache_key("researcher", "web_retriever", "gdpr obligations", {"max_results": 5})
+        key_c = make_cache_key("researcher", "web_retriever", "gdpr obligations", {"max_results": 3})
+
+        self.assertEqual(key_a, key_b)
+        self.assertNotEqual(key_a, key_c)
+        self.assertTrue(key_a.startswith("researcher:web_retriever:"))
+
+    def test_in_memory_lru_eviction_and_invalidation(self):
+        """Test LRU eviction and prefix invalidation."""
+        cache = InMemoryLRU(maxsize=2, ttl=60)
+        cache.set("ns:a:1", [Document(page_content="a")])
+        cache.set("ns:b:1", [Document(page_content="b")])
+        cache.set("ns:b:2", [Document(page_content="c")])
+
+        self.assertIsNone(cache.get("ns:a:1"))
+        self.assertEqual(cache.get("ns:b:1")[0].page_content, "b")
+        self.assertEqual(cache.invalidate("ns:b:"), 2)
+        self.assertIsNone(cache.get("ns:b:2"))
+
+    def test_cached_retrieval_hits_cache(self):
+        """Test that the decorator skips the retrieval on a cache hit."""
+        backend = MagicMock(return_value=[Document(page_content="result", metadata={"source": "x"})])
+
+        class FakeRetriever:
+            name = "fake_retriever"
+
+            @cached_retrieval
+            def retrieve(self, query, **kwargs):
+                return backend(query, **kwargs)
+
+        with patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=InMemoryLRU()):
+            retriever = FakeRetriever()
+            first = retriever.retrieve("test query")
+            first[0].metadata["reranker_score"] = 0.5
+            second = retriever.retrieve("test query")
+
+        backend.assert_called_once()
+        self.assertEqual(second[0].page_content, "result")
+        self.assertNotIn("reranker_score", second[0].metadata)
+
+    def test_cached_retrieval_ignores_query_vector(self):
+        """Test that a precomputed query vector does not change the cache key."""
+        backend = MagicMock(return_value=[Document(page_content="result")])
+
+        class FakeRetriever:
+            name = "fake_retriever"
+
+            @cached_retrieval
+            def retrieve(self, query, **kwargs):
+                return backend(query, **kwargs)
+
+        with patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=InMemoryLRU()):
+            retriever = FakeRetriever()
+            retriever.retrieve("test query", query_vector=[0.1, 0.2])
+            retriever.retrieve("test query", query_vector=[0.1, 0.2])
+            retriever.retrieve("test query")
+
+        backend.assert_called_once()
+
+    def test_async_redis_calls_run_off_event_loop(self):
+        """Test that the async decorator runs the blocking Redis calls in a worker thread."""
+        cache = RedisCache.__new__(RedisCache)
+        cache.ttl = 60
+        cache._redis_error = ConnectionError
+        cache._msgpack = MagicMock()
+        cache._msgpack.packb.return_value = b"payload"
+        threads = []
+        cache.client = MagicMock()
+        cache.client.get.side_effect = lambda key: threads.append(threading.get_ident())
+        cache.client.setex.side_effect = lambda key, ttl, payload: threads.append(threading.get_ident())
+
+        class FakeRetriever:
+            name = "fake_retriever"
+
+            @cached_retrieval
+            async def aretrieve(self, query, **kwargs):
+                return [Document(page_content=query)]
+
+        async def run():
+            await FakeRetriever().aretrieve("test query")
+            return threading.get_ident()
+
+        with patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=cache):
+            loop_thread = asyncio.run(run())
+
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_retriever_ttl_override(self):
+        """Test that a retriever's results use its own ttl, and are not cached with a ttl of 0."""
+        backend = MagicMock(return_value=[Document(page_content="result")])
+
+        class FakeRetriever:
+            name = "fake_retriever"
+
+            @cached_retrieval
+            def retrieve(self, query, **kwargs):
+                return backend(query, **kwargs)
+
+        cache = InMemoryLRU()
+        ttls = {"fake_retriever": 5}
+        with patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=cache), \
+                patch('Researcher.retrievers.cache.config.get',
+                      side_effect=lambda key, default=None: ttls if key == "retrievers.cache.ttl_by_retriever" else default), \
+                patch.object(cache, "set", wraps=cache.set) as cache_set:
+            FakeRetriever().retrieve("first")
+            ttls["fake_retriever"] = 0
+            FakeRetriever().retrieve("second")
+            FakeRetriever().retrieve("second")
+
+        cache_set.assert_called_once()
+        self.assertEqual(cache_set.call_args.args[2], 5)
+        self.assertEqual(backend.call_count, 3)
+
+    def test_cache_lookups_are_counted(self):
+        """Test that the hits and misses of the retrieval and semantic caches are counted per layer."""
+        reset_cache_stats()
+
+        class FakeRetriever:
+            name = "fake_retriever"
+
+            @cached_retrieval
+            def retrieve(self, query, **kwargs):
+                return [Document(page_content=query)]
+
+        with patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=InMemoryLRU()):
+            retriever = FakeRetriever()
+            retriever.retrieve("test query")
+            retriever.retrieve("test query")
+
+        vectors = {"gdpr fines": [1.0, 0.0], "tax law": [0.0, 1.0]}
+        cache = SemanticCache(lambda query: vectors[query], threshold=0.9, layer="test_semantic")
+        cache.get("gdpr fines")
+        cache.set("gdpr fines", [Document(page_content="fines")])
+        cache.get("gdpr fines")
+        cache.get("tax law")
+
+        stats = cache_stats()
+        self.assertEqual(stats["retrieval"], {"hits": 1, "misses": 1, "hit_rate": 0.5})
+        self.assertEqual((stats["test_semantic"]["hits"], stats["test_semantic"]["misses"]), (1, 2))
+
+    def test_semantic_cache_matches_similar_queries(self):
+        """Test that similar queries of the same scope hit, dissimilar ones or other scopes miss."""
+        vectors = {"gdpr fines": [1.0, 0.0], "gdpr penalties": [0.95, 0.31], "tax law": [0.0, 1.0]}
+        cache = SemanticCache(lambda query: vectors[query], threshold=0.9)
+        cache.set("gdpr fines", [Document(page_content="fines")], scope=2)
+
+        self.assertEqual(cache.get("gdpr penalties", scope=2)[0].page_content, "fines")
+        self.assertIsNone(cache.get("gdpr penalties", scope=3))
+        self.assertIsNone(cache.get("tax law", scope=2))
+
+    def test_semantic_cache_scans_every_scope(self):
+        """Test that a same-scope match is found behind more than `search_k` closer entries of other scopes."""
+        vectors = {f"gdpr fines {i}": [1.0, 0.0] for i in range(SemanticCache.search_k + 4)}
+        vectors.update({"gdpr penalties": [0.95, 0.31], "gdpr fines": [1.0, 0.0]})
+        cache = SemanticCache(lambda query: vectors[query], threshold=0.9, maxsize=64)
+        cache.set("gdpr penalties", [Document(page_content="penalties")], scope="mine")
+        for i in range(SemanticCache.search_k + 4):
+            cache.set(f"gdpr fines {i}", [Document(page_content=str(i))], scope=f"other {i}")
+
+        self.assertEqual(cache.get("gdpr fines", scope="mine")[0].page_content, "penalties")
+
+    def test_semantic_cache_replaces_least_recently_used(self):
+        """Test that the least recently used entry is replaced when the cache is full."""
+        vectors = {"a": [1.0, 0.0, 0.0], "b": [0.0, 1.0, 0.0], "c": [0.0, 0.0, 1.0]}
+        cache = SemanticCache(lambda query: vectors[query], threshold=0.9, maxsize=2)
+        cache.set("a", [Document(page_content="a")])
+        cache.set("b", [Document(page_content="b")])
+        cache.get("a")
+        cache.set("c", [Document(page_content="c")])
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c")[0].page_content, "c")
+
+    def test_semantic_cache_grows_matrix(self):
+        """Test that embeddings stay searchable when the matrix grows past its initial capacity."""
+        vectors = {str(i): [float(j == i) for j in range(40)] for i in range(40)}
+        cache = SemanticCache(lambda query: vectors[query], threshold=0.9, maxsize=40)
+        for i in range(40):
+            cache.set(str(i), [Document(page_content=str(i))], scope="even" if i % 2 == 0 else "odd")
+
+        self.assertEqual(cache._index._matrix.shape, (40, 40))
+        self.assertEqual(cache.get("37", scope="odd")[0].page_content, "37")
+        self.assertIsNone(cache.get("37", scope="even"))
+
+    def test_semantic_cache_quantized(self):
+        """Test that the int8-quantized cache still matches similar queries only."""
+        vectors = {"gdpr fines": [1.0, 0.0], "gdpr penalties": [0.95, 0.31], "tax law": [0.0, 1.0]}
+        cache = SemanticCache(lambda query: vectors[query], threshold=0.9, quantize=True)
+        cache.set("gdpr fines", [Document(page_content="fines")])
+
+        self.assertEqual(cache.get("gdpr penalties")[0].page_content, "fines")
+        self.assertIsNone(cache.get("tax law"))
+
+
+if __name__ == '__main__':
+    unittest.main()
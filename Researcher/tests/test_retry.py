@@ -0,0 +1,121 @@
+"""
+Tests for the retriever retry and concurrency helpers.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import asyncio
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import httpx
+
+from Researcher.retrievers.retry import http_retry, is_retryable_error, retry_after_seconds, ConcurrencyLimiter, _WaitRetryAfter
+from Researcher.utils.cache_metrics import retry_stats, reset_cache_stats
+
+
+def make_status_error(status, headers=None):
+    """Build an httpx status error for the given response status."""
+    request = httpx.Request("POST", "http://service.test/query")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestRetry(unittest.TestCase):
+    """Test cases for the retry helpers."""
+
+    def test_retryable_errors(self):
+        """Test that rate limiting, gateway errors and timeouts are retried, client errors not."""
+        self.assertTrue(is_retryable_error(make_status_error(429)))
+        self.assertTrue(is_retryable_error(make_status_error(503)))
+        self.assertTrue(is_retryable_error(httpx.ReadTimeout("timeout")))
+        self.assertFalse(is_retryable_error(make_status_error(400)))
+        self.assertFalse(is_retryable_error(ValueError("bad")))
+
+    def test_retry_after_header(self):
+        """Test that the Retry-After delay is only read from 429 responses."""
+        self.assertEqual(retry_after_seconds(make_status_error(429, {"Retry-After": "3"})), 3.0)
+        self.assertIsNone(retry_after_seconds(make_status_error(503, {"Retry-After": "3"})))
+        self.assertIsNone(retry_after_seconds(make_status_error(429)))
+
+    def test_retry_after_capped(self):
+        """Test that a long Retry-After delay is capped at max_wait."""
+        wait = _WaitRetryAfter(initial=0.2, max_wait=5)
+        retry_state = MagicMock()
+        retry_state.outcome.exception.return_value = make_status_error(429, {"Retry-After": "3600"})
+        self.assertEqual(wait(retry_state), 5)
+
+        retry_state.outcome.exception.return_value = make_status_error(429, {"Retry-After": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        self.assertEqual(wait(retry_state), 5)
+
+        retry_state.outcome.exception.return_value = make_status_error(429, {"Retry-After": "2"})
+        self.assertEqual(wait(retry_state), 2.0)
+
+    def test_http_retry_retries_async_call(self):
+        """Test that an async call is retried after a 429, honoring Retry-After."""
+        call = MagicMock(side_effect=[make_status_error(429, {"Retry-After": "0"}), "ok"])
+
+        @http_retry("test_retriever")
+        async def send():
+            return call()
+
+        with patch('asyncio.sleep') as sleep:
+            sleep.return_value = None
+            result = asyncio.run(send())
+
+        self.assertEqual(result, "ok")
+        self.assertEqual(call.call_count, 2)
+
+    def test_http_retry_counts_retries(self):
+        """Test that each retry is counted for its retriever."""
+        reset_cache_stats()
+        call = MagicMock(side_effect=[make_status_error(429, {"Retry-After": "0"}), make_status_error(503), "ok"])
+
+        @http_retry("test_retriever")
+        def send():
+            return call()
+
+        with patch('time.sleep'):
+            self.assertEqual(send(), "ok")
+
+        self.assertEqual(retry_stats(), {"test_retriever": 2})
+
+    def test_http_retry_reraises_non_retryable(self):
+        """Test that non-retryable errors are raised immediately."""
+        call = MagicMock(side_effect=make_status_error(404))
+
+        @http_retry("test_retriever")
+        def send():
+            return call()
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            send()
+        call.assert_called_once()
+
+    def test_concurrency_limiter_across_loops(self):
+        """Test that the limiter caps concurrency and can be reused by successive event loops."""
+        limiter = ConcurrencyLimiter(2)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def task():
+            nonlocal in_flight, max_in_flight
+            async with limiter:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        async def run():
+            await asyncio.gather(*(task() for _ in range(5)))
+
+        asyncio.run(run())
+        asyncio.run(run())
+
+        self.assertEqual(max_in_flight, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
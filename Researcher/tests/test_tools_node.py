@@ -0,0 +1,78 @@
+"""
+Tests for the tool execution node.
+"""
+import unittest
+from unittest.mock import MagicMock
+import asyncio
+import time
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from Researcher.graph.nodes.tools import ToolNode, parallel_retrieve
+
+
+class SlowRetriever:
+    """Retriever answering after a fixed delay."""
+
+    def __init__(self, name, content, delay=0.1):
+        self.name = name
+        self.content = content
+        self.delay = delay
+
+    async def aretrieve(self, query):
+        await asyncio.sleep(self.delay)
+        return [Document(page_content=self.content, metadata={"retriever": self.name, "query": query})]
+
+
+class FailingRetriever:
+    """Retriever raising on every query."""
+
+    name = "failing_retriever"
+
+    async def aretrieve(self, query):
+        raise RuntimeError("service unavailable")
+
+
+class TestToolNode(unittest.TestCase):
+    """Test cases for the tool execution node."""
+
+    def test_parallel_retrieve(self):
+        """Test that retrievers run concurrently, skipping failures and duplicates."""
+        requests = [
+            (SlowRetriever("web", "GDPR fines"), "fines"),
+            (SlowRetriever("wikipedia", "GDPR history"), "history"),
+            (SlowRetriever("vectordb", "GDPR fines"), "fines"),
+            (FailingRetriever(), "fines"),
+        ]
+
+        start = time.perf_counter()
+        documents = asyncio.run(parallel_retrieve(requests))
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.2)
+        self.assertEqual([doc.page_content for doc in documents], ["GDPR fines", "GDPR history"])
+
+    def test_tool_calls_dispatched_to_retrievers(self):
+        """Test that the tool calls of the last message are served by their retrievers concurrently."""
+        message = AIMessage(content="", tool_calls=[
+            {"name": "WebSearch", "args": {"__arg1": "GDPR fines"}, "id": "1"},
+            {"name": "WikipediaSearch", "args": {"__arg1": "GDPR"}, "id": "2"},
+        ])
+        retrievers = {"WebSearch": SlowRetriever("web", "web result"), "WikipediaSearch": SlowRetriever("wiki", "wiki result")}
+        tools = [MagicMock(), MagicMock()]
+
+        result = ToolNode({"messages": [message]}, tools, retrievers)
+
+        self.assertEqual([doc.metadata["query"] for doc in result["retrievedDocuments"]], ["GDPR fines", "GDPR"])
+        for tool in tools:
+            tool.invoke.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
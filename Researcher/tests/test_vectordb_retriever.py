@@ -0,0 +1,187 @@
+"""
+Tests for the VectorDBRetriever implementation.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langchain_core.documents import Document
+
+from Researcher.retrievers.vectordb import VectorDBRetriever
+
+
+def make_retriever(vector_store_type="chroma"):
+    """Build a VectorDBRetriever around a mocked vector store, bypassing the backend setup."""
+    retriever = VectorDBRetriever.__new__(VectorDBRetriever)
+    retriever.vectordb_config = {}
+    retriever.vector_store_type = vector_store_type
+    retriever.index_name = "test"
+    retriever.top_k = 5
+    retriever.similarity_threshold = 0
+    retriever.over_fetch = 1
+    retriever.page_size = 2
+    retriever._defaults = {"k": 5, "similarity_threshold": 0, "over_fetch": 1}
+    retriever.embeddings = MagicMock()
+    retriever.vectorstore = MagicMock()
+    return retriever
+
+
+class TestVectorDBRetriever(unittest.TestCase):
+    """Test cases for the vector database retriever."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.cache_patch = patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=None)
+        self.cache_patch.start()
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.cache_patch.stop()
+
+    def test_iter_all_documents_pages_chroma(self):
+        """Test that Chroma documents are read page by page and None contents skipped."""
+        retriever = make_retriever()
+        retriever.vectorstore.get.side_effect = [
+            {"documents": ["doc 1", None], "metadatas": [{"source": "a"}, None]},
+            {"documents": ["doc 3"], "metadatas": [None]},
+            {"documents": [], "metadatas": []},
+        ]
+
+        with patch('Researcher.retrievers.vectordb.logger') as mock_logger:
+            documents = retriever.fetch_all_documents()
+
+        mock_logger.warning.assert_called_once_with("Skipped %d documents with None content", 1)
+        self.assertEqual([doc.page_content for doc in documents], ["doc 1", "doc 3"])
+        self.assertEqual(documents[1].metadata, {})
+        offsets = [call.kwargs["offset"] for call in retriever.vectorstore.get.call_args_list]
+        self.assertEqual(offsets, [0, 2, 3])
+
+    def test_fetch_all_documents_failing_page(self):
+        """Test that a page failing midway yields no documents rather than a truncated corpus."""
+        retriever = make_retriever()
+        retriever.vectorstore.get.side_effect = [
+            {"documents": ["doc 1", "doc 2"], "metadatas": [{}, {}]},
+            RuntimeError("connection reset"),
+        ]
+
+        with self.assertRaises(RuntimeError):
+            list(retriever.iter_all_documents())
+
+        retriever.vectorstore.get.side_effect = [
+            {"documents": ["doc 1", "doc 2"], "metadatas": [{}, {}]},
+            RuntimeError("connection reset"),
+        ]
+        self.assertEqual(retriever.fetch_all_documents(), [])
+
+    def test_iter_all_documents_lists_pinecone(self):
+        """Test that Pinecone vectors are enumerated with list_paginated + fetch."""
+        retriever = make_retriever("pinecone")
+        retriever.text_key = "text"
+        retriever.index = MagicMock()
+        retriever.index.list_paginated.side_effect = [
+            SimpleNamespace(vectors=[SimpleNamespace(id="a"), SimpleNamespace(id="b")],
+                            pagination=SimpleNamespace(next="token")),
+            SimpleNamespace(vectors=[SimpleNamespace(id="c")], pagination=None),
+        ]
+        retriever.index.fetch.side_effect = [
+            SimpleNamespace(vectors={
+                "a": SimpleNamespace(metadata={"text": "doc a", "source": "a.pdf"}),
+                "b": SimpleNamespace(metadata={"source": "b.pdf"}),
+            }),
+            SimpleNamespace(vectors={"c": SimpleNamespace(metadata={"text": "doc c"})}),
+        ]
+
+        documents = retriever.fetch_all_documents()
+
+        self.assertEqual([doc.page_content for doc in documents], ["doc a", "doc c"])
+        self.assertEqual(documents[0].metadata, {"source": "a.pdf"})
+        self.assertEqual(retriever.index.list_paginated.call_args_list[1].kwargs["pagination_token"], "token")
+        retriever.vectorstore.similarity_search_with_relevance_scores.assert_not_called()
+
+    def test_retrieve_applies_threshold(self):
+        """Test that weak matches are dropped on the normalized score and at most k documents returned."""
+        retriever = make_retriever()
+        retriever.vectorstore.similarity_search_with_relevance_scores.return_value = [
+            (Document(page_content=f"match {i}"), 0.9) for i in range(3)
+        ] + [(Document(page_content="weak"), 0.2)]
+
+        documents = retriever.retrieve("test query", k=3, similarity_threshold=0.5)
+
+        retriever.vectorstore.similarity_search_with_relevance_scores.assert_called_once_with("test query", k=3)
+        self.assertEqual([doc.page_content for doc in documents], ["match 0", "match 1", "match 2"])
+        self.assertEqual(documents[0].metadata["vectordb_similarity_score"], 0.9)
+        self.assertEqual(documents[0].metadata["retriever"], "vectordb_retriever")
+
+    def test_retrieve_over_fetch(self):
+        """Test that over-fetching returns k * over_fetch candidates above the threshold."""
+        retriever = make_retriever()
+        retriever.vectorstore.similarity_search_with_relevance_scores.return_value = [
+            (Document(page_content=f"match {i}"), 0.9) for i in range(6)
+        ]
+
+        documents = retriever.retrieve("test query", k=3, similarity_threshold=0.5, over_fetch=2)
+
+        retriever.vectorstore.similarity_search_with_relevance_scores.assert_called_once_with("test query", k=6)
+        self.assertEqual(len(documents), 6)
+
+    def test_retrieve_without_threshold(self):
+        """Test that no candidates are over-fetched when the threshold is disabled."""
+        retriever = make_retriever()
+        retriever.vectorstore.similarity_search_with_relevance_scores.return_value = []
+
+        retriever.retrieve("test query", over_fetch=4)
+
+        retriever.vectorstore.similarity_search_with_relevance_scores.assert_called_once_with("test query", k=5)
+
+    def test_retrieve_with_query_vector_skips_embedding(self):
+        """Test that a precomputed query vector is searched directly and thresholded."""
+        retriever = make_retriever()
+        retriever.vectorstore.similarity_search_by_vector_with_relevance_scores.return_value = [
+            (Document(page_content="close"), 0.2),
+            (Document(page_content="far"), 0.9),
+        ]
+        retriever.vectorstore._select_relevance_score_fn.return_value = lambda distance: 1.0 - distance
+
+        documents = retriever.retrieve("test query", query_vector=[0.1, 0.2], similarity_threshold=0.5)
+
+        retriever.vectorstore.similarity_search_by_vector_with_relevance_scores.assert_called_once_with([0.1, 0.2], k=5)
+        retriever.vectorstore.similarity_search_with_relevance_scores.assert_not_called()
+        retriever.embeddings.embed_query.assert_not_called()
+        self.assertEqual([doc.page_content for doc in documents], ["close"])
+        self.assertAlmostEqual(documents[0].metadata["vectordb_similarity_score"], 0.8)
+
+    def test_query_vector_falls_back_to_query_search(self):
+        """Test that the query search is used when the store exposes no relevance function."""
+        retriever = make_retriever()
+        retriever.vectorstore._select_relevance_score_fn.side_effect = NotImplementedError
+        retriever.vectorstore.similarity_search_with_relevance_scores.return_value = [(Document(page_content="match"), 0.9)]
+
+        documents = retriever.retrieve("test query", query_vector=[0.1, 0.2])
+
+        retriever.vectorstore.similarity_search_by_vector_with_relevance_scores.assert_not_called()
+        retriever.vectorstore.similarity_search_with_relevance_scores.assert_called_once_with("test query", k=5)
+        self.assertEqual([doc.page_content for doc in documents], ["match"])
+
+    def test_iter_retrieve_is_lazy(self):
+        """Test that iter_retrieve yields scored documents one at a time."""
+        retriever = make_retriever()
+        retriever.vectorstore.similarity_search_with_relevance_scores.return_value = [
+            (Document(page_content="first"), 0.9),
+            (Document(page_content="second"), -0.5),
+        ]
+
+        documents = retriever.iter_retrieve("test query")
+        first = next(documents)
+
+        self.assertEqual(first.page_content, "first")
+        self.assertEqual(next(documents).metadata["vectordb_similarity_score"], 0.25)
+        self.assertIsNone(next(documents, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
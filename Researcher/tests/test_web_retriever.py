@@ -0,0 +1,65 @@
+"""
+Tests for the WebRetriever implementation.
+"""
+import unittest
+from unittest.mock import MagicMock, patch, AsyncMock
+import asyncio
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Researcher.retrievers.web import WebRetriever
+
+
+class TestWebRetriever(unittest.TestCase):
+    """Test cases for the web retriever."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.cache_patch = patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=None)
+        self.cache_patch.start()
+
+        with patch.dict(os.environ, {"TAVILY_API_KEY": "test-key"}):
+            self.retriever = WebRetriever()
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.cache_patch.stop()
+
+    def test_retrieve_maps_search_results(self):
+        """Test that Tavily results are converted to Documents, tolerating missing fields."""
+        api_wrapper = MagicMock()
+        api_wrapper.raw_results.return_value = {"results": []}
+        api_wrapper.clean_results.return_value = [
+            {"content": "GDPR text", "url": "https://example.com/gdpr", "title": "GDPR", "score": 0.9},
+            {"content": "No title", "url": "https://example.com/other"},
+        ]
+        self.retriever.search_client = MagicMock(api_wrapper=api_wrapper, search_depth="advanced")
+
+        documents = self.retriever.retrieve("gdpr", max_results=2)
+
+        api_wrapper.raw_results.assert_called_once_with("gdpr", max_results=2, search_depth="advanced")
+        self.assertEqual(documents[0].page_content, "GDPR text")
+        self.assertEqual(documents[0].metadata,
+                         {"source": "https://example.com/gdpr", "title": "GDPR", "retriever": "web_retriever"})
+        self.assertEqual(documents[1].metadata["title"], "")
+
+    def test_aretrieve_uses_shared_client(self):
+        """Test that async retrieval posts to the Tavily API through the shared client."""
+        response = MagicMock()
+        response.json.return_value = {"results": [{"content": "GDPR text", "url": "https://example.com/gdpr", "title": "GDPR", "score": 0.9}]}
+        client = MagicMock()
+        client.post = AsyncMock(return_value=response)
+
+        with patch('Researcher.retrievers.web.get_async_client', return_value=client):
+            documents = asyncio.run(self.retriever.aretrieve("gdpr"))
+
+        self.assertEqual(client.post.call_args.kwargs["json"]["query"], "gdpr")
+        self.assertEqual(client.post.call_args.kwargs["json"]["max_results"], 5)
+        self.assertEqual(documents[0].metadata["source"], "https://example.com/gdpr")
+
+
+if __name__ == '__main__':
+    unittest.main()
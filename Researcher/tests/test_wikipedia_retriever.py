@@ -0,0 +1,131 @@
+"""
+Tests for the WikipediaRetriever implementation.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import requests
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from langchain_core.documents import Document
+
+from Researcher.retrievers.wikipedia import WikipediaRetriever
+
+
+class TestWikipediaRetriever(unittest.TestCase):
+    """Test cases for the Wikipedia retriever."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.cache_patch = patch('Researcher.retrievers.cache.get_retrieval_cache', return_value=None)
+        self.cache_patch.start()
+
+        self.embeddings = MagicMock()
+        self.embeddings.embed_query.side_effect = lambda query: {
+            "GDPR fines": [1.0, 0.0],
+            "GDPR penalties": [0.95, 0.31],
+            "Moroccan tax law": [0.0, 1.0],
+        }[query]
+        self.embedding_patch = patch('Researcher.retrievers.wikipedia.get_embedding_model', return_value=self.embeddings)
+        self.embedding_patch.start()
+
+        self.search = MagicMock(side_effect=lambda query, results: [f"{query} ({i})" for i in range(results)])
+        self.fetch_page = MagicMock(side_effect=lambda title: title)
+        self.langchain_patch = patch('Researcher.retrievers.wikipedia._get_langchain_retriever',
+                                     side_effect=self.make_langchain_retriever)
+        self.langchain_patch.start()
+
+        self.retriever = WikipediaRetriever()
+        self.retriever._semantic_cache_enabled = True
+
+    def make_langchain_retriever(self, top_k_results, *args):
+        """Build a mocked LangChain retriever sharing the search and page mocks."""
+        retriever = MagicMock(top_k_results=top_k_results)
+        retriever.wiki_client.search = self.search
+        retriever._fetch_page = self.fetch_page
+        retriever._page_to_document.side_effect = lambda title, page: Document(page_content=f"Article for {title}")
+        return retriever
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.langchain_patch.stop()
+        self.embedding_patch.stop()
+        self.cache_patch.stop()
+
+    def test_semantic_cache_reuses_similar_query(self):
+        """Test that a paraphrased query is served from the semantic cache."""
+        first = self.retriever.retrieve("GDPR fines")
+        second = self.retriever.retrieve("GDPR penalties")
+        other = self.retriever.retrieve("Moroccan tax law")
+
+        self.assertEqual(self.search.call_count, 2)
+        self.assertEqual(second[0].page_content, first[0].page_content)
+        self.assertEqual(other[0].page_content, "Article for Moroccan tax law (0)")
+        self.assertEqual(second[0].metadata["retriever"], "wikipedia_retriever")
+
+    def test_semantic_cache_scoped_by_document_count(self):
+        """Test that a cached result is not reused for a different number of documents."""
+        self.retriever.retrieve("GDPR fines")
+        self.retriever.retrieve("GDPR fines", load_max_docs=5)
+
+        self.assertEqual(self.search.call_count, 2)
+
+    def test_mediawiki_requests_use_shared_session(self):
+        """Test that the wikipedia package sends its requests through the shared session."""
+        import wikipedia
+
+        WikipediaRetriever()
+
+        self.assertIsInstance(wikipedia.wikipedia.requests, requests.Session)
+        self.assertIn("LegalAIResearcher", wikipedia.wikipedia.USER_AGENT)
+
+    def test_mediawiki_requests_sent_over_https(self):
+        """Test that the package's http API URL is requested over https, through the retrying adapter."""
+        import wikipedia
+
+        WikipediaRetriever()
+        session = wikipedia.wikipedia.requests
+        response = requests.Response()
+        response.status_code = 200
+
+        with patch('requests.adapters.HTTPAdapter.send', return_value=response) as send:
+            session.get("http://fr.wikipedia.org/w/api.php", params={"action": "query"})
+
+        self.assertTrue(send.call_args.args[0].url.startswith("https://fr.wikipedia.org/w/api.php"))
+        self.assertEqual(session.get_adapter("http://fr.wikipedia.org").max_retries.total, 3)
+
+    def test_pages_loaded_concurrently_in_order(self):
+        """Test that every page of the search is fetched through the pool, keeping the search order."""
+        self.retriever._semantic_cache_enabled = False
+        self.fetch_page.side_effect = lambda title: None if title.endswith("(1)") else title
+
+        documents = self.retriever.retrieve("GDPR fines", load_max_docs=3)
+
+        self.assertEqual([doc.page_content for doc in documents],
+                         ["Article for GDPR fines (0)", "Article for GDPR fines (2)"])
+
+    def test_document_count_override_uses_dedicated_retriever(self):
+        """Test that overriding the number of documents never mutates the default retriever."""
+        self.retriever._semantic_cache_enabled = False
+
+        documents = self.retriever.retrieve("GDPR fines", load_max_docs=3)
+
+        self.assertEqual(len(documents), 3)
+        self.assertEqual(self.retriever.retriever.top_k_results, self.retriever.load_max_docs)
+
+    def test_fetched_pages_are_cached(self):
+        """Test that a page returned for several queries is fetched once."""
+        self.retriever._semantic_cache_enabled = False
+        self.search.side_effect = lambda query, results: ["GDPR"]
+
+        self.retriever.retrieve("GDPR fines")
+        self.retriever.retrieve("GDPR penalties")
+
+        self.fetch_page.assert_called_once_with("GDPR")
+
+
+if __name__ == '__main__':
+    unittest.main()